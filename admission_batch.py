@@ -0,0 +1,130 @@
+"""
+Batch Admission Calculator
+
+This module scores many students against many colleges at once. It applies
+the same weighting and chance bands as college_data.get_admission_calculator,
+but as NumPy array operations over the requirement columns of the columnar
+college snapshot: one (students x colleges) score matrix per request instead
+of one Python call per pair.
+
+Example usage:
+    from admission_batch import score_admission_batch
+
+    result = score_admission_batch(
+        [{'id': 'alice', 'gpa': 3.9, 'sat': 1520}],
+        ['Harvard', 'MIT']
+    )
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from college_columns import get_college_columns
+from college_data import (
+    ADMISSION_CHANCE_BANDS, ADMISSION_LOWEST_CHANCE, ADMISSION_WEIGHTS, resolve_college_key
+)
+
+# Upper bound on students x colleges per request
+MAX_BATCH_PAIRS = 200000
+
+# Bands in ascending order, so np.searchsorted maps a score to its band
+CHANCE_THRESHOLDS = np.array([minimum for minimum, _, _ in reversed(ADMISSION_CHANCE_BANDS)], dtype=np.float64)
+CHANCE_BANDS = [ADMISSION_LOWEST_CHANCE] + [(chance, color) for _, chance, color in reversed(ADMISSION_CHANCE_BANDS)]
+
+
+def _student_array(students: Sequence[Dict], field: str) -> np.ndarray:
+    """Collect one numeric field of every student, using 0 for missing values"""
+    return np.array([float(student.get(field) or 0) for student in students], dtype=np.float64)
+
+
+def _component(values: np.ndarray, requirements: np.ndarray, weight: float) -> np.ndarray:
+    """Weighted, capped ratio of student values (rows) to college requirements (columns)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.minimum(values[:, None] / requirements[None, :] * weight, weight)
+
+
+def score_matrix(gpa: np.ndarray, sat: np.ndarray, act: np.ndarray,
+                 gpa_required: np.ndarray, sat_required: np.ndarray, act_required: np.ndarray) -> np.ndarray:
+    """
+    Compute admission calculator scores for every (student, college) pair
+
+    Args:
+        gpa, sat, act: Student stats, one entry per student (0 = not provided)
+        gpa_required, sat_required, act_required: College requirements, one entry per college
+
+    Returns:
+        np.ndarray: Scores with one row per student and one column per college;
+        NaN where a college lacks a requirement the student's stats are scored against
+    """
+    scores = _component(gpa, gpa_required, ADMISSION_WEIGHTS['gpa'])
+    # SAT and ACT only count when the student provided them
+    scores = scores + np.where((sat != 0)[:, None], _component(sat, sat_required, ADMISSION_WEIGHTS['sat']), 0.0)
+    scores = scores + np.where((act != 0)[:, None], _component(act, act_required, ADMISSION_WEIGHTS['act']), 0.0)
+    return scores
+
+
+def chance_band_indexes(scores: np.ndarray) -> np.ndarray:
+    """Map scores to indexes into the chance bands (0 = lowest)"""
+    return np.searchsorted(CHANCE_THRESHOLDS, scores, side='right')
+
+
+def score_admission_batch(students: Sequence[Dict], college_names: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Score a roster of students against a list of colleges
+
+    Args:
+        students: Dicts with 'gpa' (required), optional 'sat', 'act' and 'id'
+        college_names: Colleges to score against (default: every college)
+
+    Returns:
+        Dict: 'results' with one entry per student (the student's id and a
+        score/chance/color per college), and 'unknown_colleges' listing names
+        that did not match any college
+    """
+    columns = get_college_columns()
+
+    unknown = []
+    if college_names is None:
+        rows = np.arange(len(columns))
+    else:
+        selected = []
+        for name in college_names:
+            college_key = resolve_college_key(name)
+            if college_key is None or college_key not in columns.rows:
+                unknown.append(name)
+            else:
+                selected.append(columns.rows[college_key])
+        rows = np.array(selected, dtype=np.int64)
+
+    gpa = _student_array(students, 'gpa')
+    sat = _student_array(students, 'sat')
+    act = _student_array(students, 'act')
+
+    # Non-positive requirements would divide by zero; treat them as missing
+    def requirement(column: np.ndarray) -> np.ndarray:
+        values = column[rows]
+        return np.where(values > 0, values, np.nan)
+
+    scores = score_matrix(gpa, sat, act, requirement(columns.gpa), requirement(columns.sat), requirement(columns.act))
+    bands = chance_band_indexes(scores)
+    scored = ~np.isnan(scores)
+
+    keys = [columns.keys[row] for row in rows]
+    names = [columns.college(row)['name'] for row in rows]
+
+    results: List[Dict] = []
+    for i, student in enumerate(students):
+        colleges = []
+        for j in np.flatnonzero(scored[i]):
+            chance, color = CHANCE_BANDS[bands[i, j]]
+            colleges.append({
+                'college': names[j],
+                'key': keys[j],
+                'score': round(float(scores[i, j]), 1),
+                'chance': chance,
+                'color': color
+            })
+        results.append({'student': student.get('id', i), 'colleges': colleges})
+
+    return {'results': results, 'unknown_colleges': unknown}
@@ -4,10 +4,23 @@ Optional AI Integration Module for Enhanced Chatbot Responses
 This module provides integration with OpenAI's GPT API for more intelligent
 and contextual responses. To use this feature:
 
-1. Install openai: pip install openai
+1. Install aiohttp (pip install aiohttp) or, alternatively, openai (pip install openai)
 2. Set your OpenAI API key: export OPENAI_API_KEY=your-api-key
 3. Import and use the AIResponseGenerator class in app.py
 
+With aiohttp installed, requests go through the pooled async client in
+ai_client (per-call deadline, bounded concurrency); the openai package is
+only used as a fallback. Set OPENAI_BASE_URL to use another compatible API,
+e.g. the local stub in mock_completion_server.py.
+
+Responses to repeated questions are served from response_cache (configured
+with the AI_CACHE_* environment variables). Conversation history is packed
+into a token budget by context_builder, with older messages folded into a
+rolling summary (AI_CONTEXT_* environment variables). Facts about the
+colleges a message asks about are looked up in the catalog by
+college_retrieval and added to the prompt, so the model answers from
+COLLEGES_DATA (AI_RETRIEVAL_TOP_K).
+
 Example usage:
     from ai_integration import AIResponseGenerator
     
@@ -15,16 +28,25 @@ Example usage:
     response = ai_generator.generate_response(user_message, conversation_history)
 """
 
+import asyncio
+import hashlib
 import os
 import json
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from ai_client import AIOHTTP_AVAILABLE, AsyncChatClient
+from college_data import get_catalog_version
+from college_retrieval import create_college_retriever
+from context_builder import create_context_builder
+from response_cache import create_response_cache
 
 try:
     import openai
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
-    print("OpenAI package not installed. Install with: pip install openai")
+    if not AIOHTTP_AVAILABLE:
+        print("AI client not installed. Install with: pip install aiohttp (or: pip install openai)")
 
 class AIResponseGenerator:
     """
@@ -39,15 +61,30 @@ class AIResponseGenerator:
             api_key: OpenAI API key (if not provided, will use environment variable)
             model: OpenAI model to use (default: gpt-3.5-turbo)
         """
-        if not OPENAI_AVAILABLE:
-            raise ImportError("OpenAI package is required. Install with: pip install openai")
+        if not (AIOHTTP_AVAILABLE or OPENAI_AVAILABLE):
+            raise ImportError("aiohttp or the OpenAI package is required. Install with: pip install aiohttp")
         
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter")
         
         self.model = model
-        openai.api_key = self.api_key
+        if AIOHTTP_AVAILABLE:
+            self.client = AsyncChatClient(self.api_key)
+        else:
+            self.client = None
+            openai.api_key = self.api_key
+            if os.getenv('OPENAI_BASE_URL'):
+                openai.api_base = os.getenv('OPENAI_BASE_URL')
+        
+        # Cache of responses to repeated questions (None if disabled)
+        self.cache = create_response_cache()
+        
+        # Fits conversation history into the prompt's token budget
+        self.context_builder = create_context_builder(model)
+        
+        # Finds catalog facts relevant to a message (None if disabled)
+        self.retriever = create_college_retriever()
         
         # System prompt to define the chatbot's personality and capabilities
         self.system_prompt = """You are a helpful, friendly, and intelligent AI assistant. You can help users with:
@@ -57,39 +94,130 @@ class AIResponseGenerator:
 - Problem-solving and advice
 - Creative writing and brainstorming
 - Educational topics
+- College admissions: requirements, costs, programs and comparisons
 
+When college facts from our catalog are provided, answer from them rather than from memory.
 Be conversational, helpful, and engaging. Keep responses concise but informative. If you don't know something, admit it and offer to help in other ways."""
 
-    def generate_response(self, user_message: str, conversation_history: List[Dict] = None) -> str:
+    def _complete(self, messages: List[Dict], **params) -> str:
+        """Request a completion, through the async client when available"""
+        if self.client is not None:
+            return self.client.complete_sync(messages, self.model, **params)
+        
+        timeout = float(os.getenv('AI_TIMEOUT_SECONDS', '15'))
+        response = openai.ChatCompletion.create(model=self.model, messages=messages, request_timeout=timeout, **params)
+        return response.choices[0].message.content.strip()
+
+    def _grounded_prompt(self, user_message: str) -> str:
+        """System prompt with the catalog facts relevant to the message"""
+        if self.retriever is None:
+            return self.system_prompt
+        chunks = self.retriever.search(user_message)
+        if not chunks:
+            return self.system_prompt
+        facts = '\n'.join(f"- {chunk['text']}" for chunk in chunks)
+        return f"{self.system_prompt}\n\nCollege facts from our catalog:\n{facts}"
+
+    def _context_messages(self, user_message: str, context: Dict = None, conversation_history: List[Dict] = None,
+                          conversation_id: Optional[str] = None) -> List[Dict]:
+        """Build the messages for generate_response_with_context"""
+        # Add catalog facts and context to system prompt
+        system_prompt = self._grounded_prompt(user_message)
+        if context:
+            context_info = []
+            if 'current_time' in context:
+                context_info.append(f"Current time: {context['current_time']}")
+            if 'current_date' in context:
+                context_info.append(f"Current date: {context['current_date']}")
+            if 'user_name' in context:
+                context_info.append(f"User's name: {context['user_name']}")
+            
+            if context_info:
+                system_prompt += f"\n\nAdditional context: {', '.join(context_info)}"
+        
+        return self.context_builder.build(system_prompt, user_message, conversation_history, conversation_id)
+
+    def _cache_context(self, context: Dict = None, messages: List[Dict] = None) -> Dict:
+        """
+        Everything besides the message that a cached response depends on
+
+        Args:
+            context: Additional context passed with the message
+            messages: The packed messages sent to the model (see _context_messages)
+        """
+        cache_context = {'model': self.model, 'system_prompt': self.system_prompt, **(context or {})}
+        if self.retriever is not None:
+            # Answers built from catalog facts go stale when the catalog changes
+            cache_context['catalog_version'] = get_catalog_version()
+        # The history as the model sees it (the summary of older messages and
+        # the newest messages verbatim, without timestamps), so a later message
+        # hits when another conversation reached it through the same exchange
+        history = (messages or [])[1:-1]
+        if history:
+            digest = hashlib.sha1()
+            for msg in history:
+                digest.update(f"{msg['role']}\0{msg['content']}\0".encode('utf-8'))
+            cache_context['history'] = digest.hexdigest()
+        return cache_context
+
+    def prepare_request(self, user_message: str, context: Dict = None, conversation_history: List[Dict] = None,
+                        conversation_id: Optional[str] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Build the messages for the model and the context they are cached under
+        
+        Retrieval, history packing and summarization run here, once per
+        message: pass the result to cached_response and then to the
+        generate or stream call.
+        
+        Args:
+            user_message: The user's message
+            context: Additional context (e.g., current time, user preferences)
+            conversation_history: Previous conversation messages (optional)
+            conversation_id: Conversation whose history summary can be reused (optional)
+            
+        Returns:
+            Tuple[List[Dict], Dict]: The messages and the cache context
+        """
+        messages = self._context_messages(user_message, context, conversation_history, conversation_id)
+        return messages, self._cache_context(context, messages)
+
+    def cached_response(self, user_message: str, prepared: Tuple[List[Dict], Dict]) -> Optional[str]:
+        """
+        Look up the cached response to a message without calling the model
+        
+        Args:
+            user_message: The user's message
+            prepared: Result of prepare_request for the message
+            
+        Returns:
+            The cached response, or None (also when the cache is disabled)
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(user_message, prepared[1])
+
+    def generate_response(self, user_message: str, conversation_history: List[Dict] = None,
+                          conversation_id: Optional[str] = None) -> str:
         """
         Generate an AI-powered response to user input
         
         Args:
             user_message: The user's message
             conversation_history: Previous conversation messages (optional)
+            conversation_id: Conversation whose history summary can be reused (optional)
             
         Returns:
             AI-generated response string
         """
         try:
-            # Prepare messages for the API
-            messages = [{"role": "system", "content": self.system_prompt}]
-            
-            # Add conversation history if provided
-            if conversation_history:
-                for msg in conversation_history[-10:]:  # Limit to last 10 messages for context
-                    messages.append({
-                        "role": msg.get('role', 'user'),
-                        "content": msg.get('message', '')
-                    })
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+            # Prepare messages for the API: as much recent history as fits the
+            # token budget, older messages summarized
+            messages = self.context_builder.build(self._grounded_prompt(user_message), user_message,
+                                                  conversation_history, conversation_id)
             
             # Call OpenAI API
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=messages,
+            return self._complete(
+                messages,
                 max_tokens=150,
                 temperature=0.7,
                 top_p=1,
@@ -97,57 +225,186 @@ Be conversational, helpful, and engaging. Keep responses concise but informative
                 presence_penalty=0
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             print(f"Error generating AI response: {e}")
             # Fallback to a simple response
             return "I'm having trouble processing your request right now. Please try again in a moment."
 
-    def generate_response_with_context(self, user_message: str, context: Dict = None) -> str:
+    def generate_response_with_context(self, user_message: str, context: Dict = None,
+                                       conversation_history: List[Dict] = None,
+                                       conversation_id: Optional[str] = None, raise_errors: bool = False,
+                                       prepared: Optional[Tuple[List[Dict], Dict]] = None) -> str:
         """
         Generate response with additional context
         
         Args:
             user_message: The user's message
             context: Additional context (e.g., current time, user preferences)
+            conversation_history: Previous conversation messages (optional)
+            conversation_id: Conversation whose history summary can be reused (optional)
+            raise_errors: Raise failures instead of returning an apology
+                (e.g. so a circuit breaker can see them)
+            prepared: Result of prepare_request when the caller already looked
+                up the cache with it (see cached_response): the messages are
+                not built again and the cache is not read again (the response
+                is cached either way)
             
         Returns:
             AI-generated response string
         """
         try:
-            # Add context to system prompt
-            system_prompt = self.system_prompt
-            if context:
-                context_info = []
-                if 'current_time' in context:
-                    context_info.append(f"Current time: {context['current_time']}")
-                if 'current_date' in context:
-                    context_info.append(f"Current date: {context['current_date']}")
-                if 'user_name' in context:
-                    context_info.append(f"User's name: {context['user_name']}")
-                
-                if context_info:
-                    system_prompt += f"\n\nAdditional context: {', '.join(context_info)}"
-            
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-            
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=150,
-                temperature=0.7
-            )
+            messages, cache_context = prepared or self.prepare_request(user_message, context, conversation_history,
+                                                                       conversation_id)
+            if self.cache is not None and prepared is None:
+                cached = self.cache.get(user_message, cache_context)
+                if cached is not None:
+                    return cached
+            
+            response = self._complete(messages, max_tokens=150, temperature=0.7)
+            
+            if self.cache is not None:
+                self.cache.put(user_message, cache_context, response)
+            return response
+            
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error generating AI response with context: {e}")
+            return "I'm having trouble processing your request right now. Please try again in a moment."
+
+    def stream_response_with_context(self, user_message: str, context: Dict = None,
+                                     conversation_history: List[Dict] = None,
+                                     conversation_id: Optional[str] = None, raise_errors: bool = False,
+                                     prepared: Optional[Tuple[List[Dict], Dict]] = None) -> Iterator[str]:
+        """
+        Generate a response with context, yielding it piece by piece as it arrives
+        
+        Args:
+            user_message: The user's message
+            context: Additional context (e.g., current time, user preferences)
+            conversation_history: Previous conversation messages (optional)
+            conversation_id: Conversation whose history summary can be reused (optional)
+            raise_errors: Raise failures instead of ending with an apology
+            prepared: Result of prepare_request (see generate_response_with_context)
+            
+        Yields:
+            Pieces of the AI-generated response
+        """
+        messages, cache_context = prepared or self.prepare_request(user_message, context, conversation_history,
+                                                                   conversation_id)
+        if self.cache is not None and prepared is None:
+            cached = self.cache.get(user_message, cache_context)
+            if cached is not None:
+                yield cached
+                return
+        
+        pieces = []
+        try:
+            if self.client is not None:
+                for delta in self.client.stream_sync(messages, self.model, max_tokens=150, temperature=0.7):
+                    pieces.append(delta)
+                    yield delta
+            else:
+                pieces.append(self._complete(messages, max_tokens=150, temperature=0.7))
+                yield pieces[-1]
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error streaming AI response with context: {e}")
+            if not pieces:
+                yield "I'm having trouble processing your request right now. Please try again in a moment."
+            return
+        
+        if self.cache is not None:
+            self.cache.put(user_message, cache_context, ''.join(pieces).strip())
+
+    async def agenerate_response_with_context(self, user_message: str, context: Dict = None,
+                                              conversation_history: List[Dict] = None,
+                                              conversation_id: Optional[str] = None, raise_errors: bool = False,
+                                              prepared: Optional[Tuple[List[Dict], Dict]] = None) -> str:
+        """
+        Async version of generate_response_with_context for event-loop callers
+        
+        Args:
+            user_message: The user's message
+            context: Additional context (e.g., current time, user preferences)
+            conversation_history: Previous conversation messages (optional)
+            conversation_id: Conversation whose history summary can be reused (optional)
+            raise_errors: Raise failures instead of returning an apology
+            prepared: Result of prepare_request (see generate_response_with_context)
             
-            return response.choices[0].message.content.strip()
+        Returns:
+            AI-generated response string
+        """
+        try:
+            messages, cache_context = prepared or self.prepare_request(user_message, context, conversation_history,
+                                                                       conversation_id)
+            if self.cache is not None and prepared is None:
+                cached = self.cache.get(user_message, cache_context)
+                if cached is not None:
+                    return cached
+            
+            if self.client is not None:
+                response = await self.client.complete_async(messages, self.model, max_tokens=150, temperature=0.7)
+            else:
+                response = await asyncio.to_thread(self._complete, messages, max_tokens=150, temperature=0.7)
+            
+            if self.cache is not None:
+                self.cache.put(user_message, cache_context, response)
+            return response
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error generating AI response with context: {e}")
             return "I'm having trouble processing your request right now. Please try again in a moment."
 
+    async def astream_response_with_context(self, user_message: str, context: Dict = None,
+                                            conversation_history: List[Dict] = None,
+                                            conversation_id: Optional[str] = None, raise_errors: bool = False,
+                                            prepared: Optional[Tuple[List[Dict], Dict]] = None) -> AsyncIterator[str]:
+        """
+        Async version of stream_response_with_context for event-loop callers
+        
+        Args:
+            user_message: The user's message
+            context: Additional context (e.g., current time, user preferences)
+            conversation_history: Previous conversation messages (optional)
+            conversation_id: Conversation whose history summary can be reused (optional)
+            raise_errors: Raise failures instead of ending with an apology
+            prepared: Result of prepare_request (see generate_response_with_context)
+            
+        Yields:
+            Pieces of the AI-generated response
+        """
+        messages, cache_context = prepared or self.prepare_request(user_message, context, conversation_history,
+                                                                   conversation_id)
+        if self.cache is not None and prepared is None:
+            cached = self.cache.get(user_message, cache_context)
+            if cached is not None:
+                yield cached
+                return
+        
+        pieces = []
+        try:
+            if self.client is not None:
+                async for delta in self.client.stream_async(messages, self.model, max_tokens=150, temperature=0.7):
+                    pieces.append(delta)
+                    yield delta
+            else:
+                pieces.append(await asyncio.to_thread(self._complete, messages, max_tokens=150, temperature=0.7))
+                yield pieces[-1]
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error streaming AI response with context: {e}")
+            if not pieces:
+                yield "I'm having trouble processing your request right now. Please try again in a moment."
+            return
+        
+        if self.cache is not None:
+            self.cache.put(user_message, cache_context, ''.join(pieces).strip())
+
     def is_available(self) -> bool:
         """
         Check if AI integration is available
@@ -155,7 +412,23 @@ Be conversational, helpful, and engaging. Keep responses concise but informative
         Returns:
             True if OpenAI is properly configured, False otherwise
         """
-        return OPENAI_AVAILABLE and bool(self.api_key)
+        return (AIOHTTP_AVAILABLE or OPENAI_AVAILABLE) and bool(self.api_key)
+
+    def stats(self) -> Dict:
+        """Get client counters (empty when using the openai package)"""
+        return self.client.stats() if self.client is not None else {}
+
+    def cache_stats(self) -> Dict:
+        """Get response cache counters (empty when the cache is disabled)"""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def retrieval_stats(self) -> Dict:
+        """Get catalog fact index counters (empty when retrieval is disabled)"""
+        return self.retriever.stats() if self.retriever is not None else {}
+
+    def context_stats(self) -> Dict:
+        """Get token budget settings and history summary counters"""
+        return self.context_builder.stats()
 
 # Example usage and testing
 if __name__ == "__main__":
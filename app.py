@@ -1,21 +1,38 @@
 from flask import Flask, request, jsonify, render_template, session
 from flask_cors import CORS
+import io
 import json
 import os
 from datetime import datetime
 import random
 from college_data import (
     get_college_by_name, get_all_colleges, search_colleges_by_program,
-    search_colleges_by_location, compare_colleges, get_admission_calculator
+    search_colleges_by_location, compare_colleges, get_admission_calculator,
+    find_college_candidates, add_catalog_listener, resolve_college_key,
+    get_catalog_version, build_catalog_indexes, COLLEGES_DATA
 )
-from college_admin import add_college_to_database, validate_college_data, get_college_statistics
+from college_admin import (
+    add_college_to_database, validate_college_data, get_college_statistics, list_all_colleges,
+    restore_colleges_from_file, refresh_colleges_from_file, colleges_file_changed, detect_import_format,
+    import_colleges, iter_college_records
+)
+from admission_batch import MAX_BATCH_PAIRS, score_admission_batch
+from card_cache import CardCache
+from college_index import get_undergraduate_tuition
+from conversation_store import create_conversation_store
+from pagination import get_page_size, ndjson_response, page_response, wants_stream
+from intent_classifier import IntentClassifier
+from message_parser import MESSAGE_PARSER, parse_message
+from payload_cache import PayloadCache, payload_response
+from recommender import DEFAULT_RECOMMENDATIONS, MAX_RECOMMENDATIONS, get_recommender, recommend_colleges
+from streaming import split_chunks, sse_response, stream_chat_reply, wants_event_stream
 
 app = Flask(__name__)
 CORS(app)
 app.secret_key = 'your-secret-key-change-this-in-production'
 
-# In-memory storage for conversation history (use database in production)
-conversations = {}
+# Conversation history storage (bounded; see conversation_store for configuration)
+conversations = create_conversation_store()
 
 # Enhanced response patterns for college information chatbot
 RESPONSE_PATTERNS = {
@@ -59,6 +76,27 @@ RESPONSE_PATTERNS = {
     ]
 }
 
+# Intent keywords in priority order; the first intent with a match wins
+INTENT_KEYWORDS = [
+    ('greetings', ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']),
+    ('goodbye', ['bye', 'goodbye', 'see you', 'farewell', 'later']),
+    ('help', ['help', 'what can you do', 'assist', 'support']),
+    ('recommend', ['recommend', 'suggest', 'best match', 'best fit', 'which college should', 'where should i apply']),
+    ('college_list', ['colleges', 'universities', 'list', 'show me colleges', 'what colleges']),
+    ('college', []),  # matched when the message parser finds a college
+    ('program', ['program', 'major', 'study', 'degree', 'course']),
+    ('comparison', ['compare', 'comparison', 'vs', 'versus', 'difference']),
+    ('admission', ['admission', 'requirements', 'gpa', 'sat', 'act', 'acceptance']),
+    ('financial', ['tuition', 'cost', 'price', 'fee', 'financial', 'money']),
+    ('location', ['location', 'where', 'city', 'state', 'address']),
+    ('time', ['time', 'what time', 'clock']),
+    ('date', ['date', 'today', 'what day']),
+    ('question', ['?'])
+]
+
+# Compiled once at import; classifies a message in a single pass
+INTENT_CLASSIFIER = IntentClassifier(INTENT_KEYWORDS)
+
 def get_conversation_id():
     """Generate or retrieve conversation ID for session"""
     if 'conversation_id' not in session:
@@ -67,88 +105,58 @@ def get_conversation_id():
 
 def save_message(conversation_id, role, message):
     """Save message to conversation history"""
-    if conversation_id not in conversations:
-        conversations[conversation_id] = []
-    
-    conversations[conversation_id].append({
-        'role': role,
-        'message': message,
-        'timestamp': datetime.now().isoformat()
-    })
+    conversations.append(conversation_id, role, message)
 
 def get_bot_response(user_message):
     """Generate intelligent bot response based on user input"""
-    message_lower = user_message.lower().strip()
-    
-    # Greeting patterns
-    if any(word in message_lower for word in ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']):
-        return random.choice(RESPONSE_PATTERNS['greetings'])
-    
-    # Goodbye patterns
-    elif any(word in message_lower for word in ['bye', 'goodbye', 'see you', 'farewell', 'later']):
-        return random.choice(RESPONSE_PATTERNS['goodbye'])
-    
-    # Help patterns
-    elif any(word in message_lower for word in ['help', 'what can you do', 'assist', 'support']):
-        return random.choice(RESPONSE_PATTERNS['help'])
-    
-    # College list patterns
-    elif any(word in message_lower for word in ['colleges', 'universities', 'list', 'show me colleges', 'what colleges']):
-        return random.choice(RESPONSE_PATTERNS['college_list'])
-    
-    # Specific college queries
-    elif any(college in message_lower for college in ['harvard', 'mit', 'stanford', 'berkeley', 'yale', 'princeton', 'caltech', 'columbia', 'upenn', 'penn', 'duke', 'northwestern', 'jhu', 'johns', 'cornell', 'rice', 'vanderbilt']):
-        return handle_college_query(user_message)
-    
-    # Program search queries
-    elif any(word in message_lower for word in ['program', 'major', 'study', 'degree', 'course']):
-        return handle_program_query(user_message)
-    
-    # Comparison queries
-    elif any(word in message_lower for word in ['compare', 'comparison', 'vs', 'versus', 'difference']):
-        return handle_comparison_query(user_message)
-    
-    # Admission queries
-    elif any(word in message_lower for word in ['admission', 'requirements', 'gpa', 'sat', 'act', 'acceptance']):
-        return handle_admission_query(user_message)
+    parsed = parse_message(user_message)
+    intent = INTENT_CLASSIFIER.classify(user_message, ['college'] if parsed['colleges'] else [])
     
-    # Tuition/financial queries
-    elif any(word in message_lower for word in ['tuition', 'cost', 'price', 'fee', 'financial', 'money']):
-        return handle_financial_query(user_message)
-    
-    # Location queries
-    elif any(word in message_lower for word in ['location', 'where', 'city', 'state', 'address']):
-        return handle_location_query(user_message)
-    
-    # Time patterns
-    elif any(word in message_lower for word in ['time', 'what time', 'clock']):
-        return random.choice(RESPONSE_PATTERNS['time'])
-    
-    # Date patterns
-    elif any(word in message_lower for word in ['date', 'today', 'what day']):
-        return random.choice(RESPONSE_PATTERNS['date'])
+    if intent in INTENT_HANDLERS:
+        return INTENT_HANDLERS[intent](user_message, parsed)
     
     # Question patterns
-    elif '?' in user_message:
+    elif intent == 'question':
         return "That's a great question! I'd be happy to help you with college information. What specific college or topic are you interested in?"
     
+    # Canned responses (greetings, goodbye, help, college list, time, date)
+    elif intent:
+        return random.choice(RESPONSE_PATTERNS[intent])
+    
     # Default response
     else:
         return random.choice(RESPONSE_PATTERNS['default'])
 
-def handle_college_query(user_message):
-    """Handle queries about specific colleges"""
-    message_lower = user_message.lower().strip()
-    
-    # Extract college name
-    college = None
-    for college_name in ['harvard', 'mit', 'stanford', 'berkeley', 'yale', 'princeton', 'caltech', 'columbia', 'upenn', 'penn', 'duke', 'northwestern', 'jhu', 'johns', 'cornell', 'rice', 'vanderbilt']:
-        if college_name in message_lower:
-            college = get_college_by_name(college_name)
-            break
-    
-    if not college:
-        return "I couldn't identify which college you're asking about. Please specify: Harvard, MIT, Stanford, Berkeley, Yale, Princeton, or Caltech."
+def stream_bot_response(user_message):
+    """Yield the bot response in chunks of a few lines (college cards are long)"""
+    yield from split_chunks(get_bot_response(user_message))
+
+# Shown for details a college record does not have (e.g. imported with only
+# the required fields)
+NOT_AVAILABLE = 'not available'
+
+def college_field(college, *path):
+    """Get a nested field of a college record, or None if the record does not have it"""
+    value = college
+    for key in path:
+        if not isinstance(value, dict) or value.get(key) is None:
+            return None
+        value = value[key]
+    return value
+
+def format_amount(value, prefix='', suffix=''):
+    """Format a number with thousands separators, or 'not available'"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return NOT_AVAILABLE
+    return f"{prefix}{value:,}{suffix}"
+
+def format_detail(value, suffix=''):
+    """Format a detail as is, or 'not available'"""
+    return NOT_AVAILABLE if value is None else f"{value}{suffix}"
+
+def render_college_card(college):
+    """Render the overview card for a college"""
+    tuition = college_field(college, 'tuition') or {}
     
     # Format college information
     info = f"🏛️ **{college['name']}**\n"
@@ -159,34 +167,38 @@ def handle_college_query(user_message):
     info += f"📊 Acceptance Rate: {college['acceptance_rate']}%\n\n"
     
     info += f"💰 **Tuition (2023-2024):**\n"
-    if 'undergraduate_in_state' in college['tuition']:
-        info += f"• In-state: ${college['tuition']['undergraduate_in_state']:,}\n"
-        info += f"• Out-of-state: ${college['tuition']['undergraduate_out_state']:,}\n"
+    if 'undergraduate_in_state' in tuition:
+        info += f"• In-state: {format_amount(tuition.get('undergraduate_in_state'), '$')}\n"
+        info += f"• Out-of-state: {format_amount(tuition.get('undergraduate_out_state'), '$')}\n"
     else:
-        info += f"• Undergraduate: ${college['tuition']['undergraduate']:,}\n"
-    info += f"• Room & Board: ${college['tuition']['room_board']:,}\n\n"
+        info += f"• Undergraduate: {format_amount(tuition.get('undergraduate'), '$')}\n"
+    info += f"• Room & Board: {format_amount(tuition.get('room_board'), '$')}\n\n"
     
     info += f"🎓 **Popular Programs:**\n"
-    for program in college['programs']['undergraduate'][:5]:
+    programs = college_field(college, 'programs', 'undergraduate') or []
+    for program in programs[:5]:
         info += f"• {program}\n"
+    if not programs:
+        info += f"• {NOT_AVAILABLE}\n"
     
-    info += f"\n📞 Contact: {college['contact']['phone']}\n"
-    info += f"🌐 Website: {college['website']}"
+    info += f"\n📞 Contact: {format_detail(college_field(college, 'contact', 'phone'))}\n"
+    info += f"🌐 Website: {format_detail(college.get('website'))}"
     
     return info
 
-def handle_program_query(user_message):
-    """Handle queries about academic programs"""
-    message_lower = user_message.lower().strip()
+def handle_college_query(user_message, parsed=None):
+    """Handle queries about specific colleges"""
+    parsed = parsed or parse_message(user_message)
     
-    # Extract program name
-    program_keywords = ['computer science', 'engineering', 'business', 'medicine', 'law', 'art', 'music', 'biology', 'chemistry', 'physics', 'mathematics', 'economics', 'psychology', 'history', 'english']
+    if not parsed['colleges']:
+        return "I couldn't identify which college you're asking about. Please specify: Harvard, MIT, Stanford, Berkeley, Yale, Princeton, or Caltech."
     
-    program = None
-    for keyword in program_keywords:
-        if keyword in message_lower:
-            program = keyword
-            break
+    return CARD_CACHE.get(parsed['colleges'][0], 'college')
+
+def handle_program_query(user_message, parsed=None):
+    """Handle queries about academic programs"""
+    parsed = parsed or parse_message(user_message)
+    program = parsed['programs'][0] if parsed['programs'] else None
     
     if not program:
         return "What program are you interested in? I can help you find colleges that offer programs in Computer Science, Engineering, Business, Medicine, Law, and many more!"
@@ -206,15 +218,37 @@ def handle_program_query(user_message):
     
     return info
 
-def handle_comparison_query(user_message):
-    """Handle college comparison queries"""
-    message_lower = user_message.lower().strip()
+def handle_recommendation_query(user_message, parsed=None):
+    """Handle requests for college recommendations based on the student's profile"""
+    parsed = parsed or parse_message(user_message)
+    
+    matches = recommend_colleges(
+        gpa=parsed['gpa'], sat=parsed['sat'], act=parsed['act'], budget=parsed['budget'],
+        locations=parsed['locations'], programs=parsed['programs']
+    )
+    if not matches:
+        return "I don't have any colleges to recommend yet."
+    
+    info = "⭐ **Recommended colleges for you:**\n\n"
+    for college in matches:
+        info += f"🏛️ **{college['name']}** (match {college['match_score']}%)\n"
+        info += f"📍 {college['location']}\n"
+        info += f"🏆 Ranking: #{college['ranking']}\n"
+        if college['chance']:
+            info += f"📊 Admission Chance: {college['chance']}\n"
+        if college['cost'] is not None:
+            info += f"💰 Yearly Cost: ${college['cost']:,}\n"
+        info += "\n"
     
-    # Extract college names
-    college_names = []
-    for college_name in ['harvard', 'mit', 'stanford', 'berkeley', 'yale', 'princeton', 'caltech', 'columbia', 'upenn', 'penn', 'duke', 'northwestern', 'jhu', 'johns', 'cornell', 'rice', 'vanderbilt']:
-        if college_name in message_lower:
-            college_names.append(college_name)
+    if not parsed['gpa']:
+        info += "💡 Tell me your GPA, SAT/ACT scores, budget, preferred states and intended major for better matches!"
+    
+    return info
+
+def handle_comparison_query(user_message, parsed=None):
+    """Handle college comparison queries"""
+    parsed = parsed or parse_message(user_message)
+    college_names = parsed['colleges']
     
     if len(college_names) < 2:
         return "Please specify which colleges you'd like to compare. For example: 'Compare Harvard and MIT' or 'Harvard vs Stanford'"
@@ -231,91 +265,77 @@ def handle_comparison_query(user_message):
         info += f"📍 {college['location']}\n"
         info += f"🏆 Ranking: #{college['ranking']}\n"
         info += f"📊 Acceptance Rate: {college['acceptance_rate']}%\n"
-        info += f"👥 Student Population: {college['campus_life']['student_population']:,}\n"
-        info += f"💰 Tuition: ${college['tuition']['undergraduate']:,}\n\n"
+        info += f"👥 Student Population: {format_amount(college_field(college, 'campus_life', 'student_population'))}\n"
+        info += f"💰 Tuition: {format_amount(get_undergraduate_tuition(college), '$')}\n\n"
     
     return info
 
-def handle_admission_query(user_message):
-    """Handle admission requirements queries"""
-    message_lower = user_message.lower().strip()
-    
-    # Extract college name
-    college = None
-    for college_name in ['harvard', 'mit', 'stanford', 'berkeley', 'yale', 'princeton', 'caltech', 'columbia', 'upenn', 'penn', 'duke', 'northwestern', 'jhu', 'johns', 'cornell', 'rice', 'vanderbilt']:
-        if college_name in message_lower:
-            college = get_college_by_name(college_name)
-            break
-    
-    if not college:
-        return "Which college's admission requirements would you like to know about? I have information about Harvard, MIT, Stanford, Berkeley, Yale, Princeton, and Caltech."
-    
-    req = college['admission_requirements']
+def render_admission_card(college):
+    """Render the admission requirements card for a college"""
+    req = college_field(college, 'admission_requirements') or {}
     info = f"📋 **{college['name']} Admission Requirements:**\n\n"
     info += f"📊 **Academic Requirements:**\n"
-    info += f"• GPA: {req['gpa']}+ (recommended)\n"
-    info += f"• SAT Score: {req['sat_score']}+ (recommended)\n"
-    info += f"• ACT Score: {req['act_score']}+ (recommended)\n"
-    info += f"• TOEFL: {req['toefl']}+ (international students)\n"
-    info += f"• IELTS: {req['ielts']}+ (international students)\n\n"
+    info += f"• GPA: {format_detail(req.get('gpa'), '+ (recommended)')}\n"
+    info += f"• SAT Score: {format_detail(req.get('sat_score'), '+ (recommended)')}\n"
+    info += f"• ACT Score: {format_detail(req.get('act_score'), '+ (recommended)')}\n"
+    info += f"• TOEFL: {format_detail(req.get('toefl'), '+ (international students)')}\n"
+    info += f"• IELTS: {format_detail(req.get('ielts'), '+ (international students)')}\n\n"
     
     info += f"📝 **Application Requirements:**\n"
-    info += f"• Essays: {req['essays']}\n"
-    info += f"• Recommendations: {req['recommendations']}\n"
-    info += f"• Application Deadline: {req['deadline']}\n\n"
+    info += f"• Essays: {format_detail(req.get('essays'))}\n"
+    info += f"• Recommendations: {format_detail(req.get('recommendations'))}\n"
+    info += f"• Application Deadline: {format_detail(req.get('deadline'))}\n\n"
     
     info += f"📊 **Current Statistics:**\n"
     info += f"• Acceptance Rate: {college['acceptance_rate']}%\n"
-    info += f"• Student-Faculty Ratio: {college['campus_life']['student_faculty_ratio']}:1\n"
+    info += f"• Student-Faculty Ratio: {format_detail(college_field(college, 'campus_life', 'student_faculty_ratio'), ':1')}\n"
     
     return info
 
-def handle_financial_query(user_message):
-    """Handle tuition and financial queries"""
-    message_lower = user_message.lower().strip()
-    
-    # Extract college name
-    college = None
-    for college_name in ['harvard', 'mit', 'stanford', 'berkeley', 'yale', 'princeton', 'caltech', 'columbia', 'upenn', 'penn', 'duke', 'northwestern', 'jhu', 'johns', 'cornell', 'rice', 'vanderbilt']:
-        if college_name in message_lower:
-            college = get_college_by_name(college_name)
-            break
+def handle_admission_query(user_message, parsed=None):
+    """Handle admission requirements queries"""
+    parsed = parsed or parse_message(user_message)
     
-    if not college:
-        return "Which college's tuition information would you like to know about? I have details about Harvard, MIT, Stanford, Berkeley, Yale, Princeton, and Caltech."
+    if not parsed['colleges']:
+        return "Which college's admission requirements would you like to know about? I have information about Harvard, MIT, Stanford, Berkeley, Yale, Princeton, and Caltech."
     
-    tuition = college['tuition']
+    return CARD_CACHE.get(parsed['colleges'][0], 'admission')
+
+def render_financial_card(college):
+    """Render the tuition and financial card for a college"""
+    tuition = college_field(college, 'tuition') or {}
     info = f"💰 **{college['name']} Financial Information (2023-2024):**\n\n"
     
     if 'undergraduate_in_state' in tuition:
         info += f"📚 **Undergraduate Tuition:**\n"
-        info += f"• In-state: ${tuition['undergraduate_in_state']:,}\n"
-        info += f"• Out-of-state: ${tuition['undergraduate_out_state']:,}\n"
+        info += f"• In-state: {format_amount(tuition.get('undergraduate_in_state'), '$')}\n"
+        info += f"• Out-of-state: {format_amount(tuition.get('undergraduate_out_state'), '$')}\n"
     else:
-        info += f"📚 **Undergraduate Tuition:** ${tuition['undergraduate']:,}\n"
+        info += f"📚 **Undergraduate Tuition:** {format_amount(tuition.get('undergraduate'), '$')}\n"
     
-    info += f"🏠 **Room & Board:** ${tuition['room_board']:,}\n"
+    info += f"🏠 **Room & Board:** {format_amount(tuition.get('room_board'), '$')}\n"
     
     if 'graduate' in tuition:
-        info += f"🎓 **Graduate Tuition:** ${tuition['graduate']:,}\n"
+        info += f"🎓 **Graduate Tuition:** {format_amount(tuition['graduate'], '$')}\n"
     
     info += f"\n📊 **Acceptance Rate:** {college['acceptance_rate']}%\n"
     info += f"🏆 **Ranking:** #{college['ranking']}\n"
     
     return info
 
-def handle_location_query(user_message):
-    """Handle location-based queries"""
-    message_lower = user_message.lower().strip()
+def handle_financial_query(user_message, parsed=None):
+    """Handle tuition and financial queries"""
+    parsed = parsed or parse_message(user_message)
     
-    # Extract location
-    locations = ['california', 'massachusetts', 'connecticut', 'new jersey', 'pasadena', 'cambridge', 'stanford', 'berkeley', 'new haven', 'princeton']
+    if not parsed['colleges']:
+        return "Which college's tuition information would you like to know about? I have details about Harvard, MIT, Stanford, Berkeley, Yale, Princeton, and Caltech."
     
-    location = None
-    for loc in locations:
-        if loc in message_lower:
-            location = loc
-            break
+    return CARD_CACHE.get(parsed['colleges'][0], 'financial')
+
+def handle_location_query(user_message, parsed=None):
+    """Handle location-based queries"""
+    parsed = parsed or parse_message(user_message)
+    location = parsed['locations'][0] if parsed['locations'] else None
     
     if not location:
         return "What location are you interested in? I have colleges in California, Massachusetts, Connecticut, and New Jersey."
@@ -334,6 +354,50 @@ def handle_location_query(user_message):
     
     return info
 
+# Bring back colleges added by administrators in earlier runs
+restore_colleges_from_file()
+
+# Pre-encoded JSON bodies for the catalog endpoints, keyed by catalog version
+PAYLOADS = PayloadCache()
+
+# Rendered cards per college, invalidated when the catalog changes
+CARD_CACHE = CardCache({
+    'college': render_college_card,
+    'admission': render_admission_card,
+    'financial': render_financial_card
+})
+add_catalog_listener(CARD_CACHE.invalidate)
+
+# Number of most requested (top-ranked) colleges whose cards warm_caches pre-renders
+CARD_CACHE_WARM_COUNT = int(os.getenv('CARD_CACHE_WARM_COUNT', '20'))
+
+def warm_caches():
+    """Build the lazily built catalog snapshots now (run.py calls this before forking workers)"""
+    build_catalog_indexes()
+    MESSAGE_PARSER.build()
+    get_recommender()
+    CARD_CACHE.warm(college['key'] for college in list_all_colleges()[:CARD_CACHE_WARM_COUNT])
+
+def on_worker_start():
+    """Catch up with colleges journaled by other workers since the app was preloaded"""
+    restore_colleges_from_file()
+
+@app.before_request
+def catch_up_with_other_workers():
+    """Pick up colleges added or imported through another worker before serving the request"""
+    refresh_colleges_from_file()
+
+# Intents answered by a query handler rather than a canned response
+INTENT_HANDLERS = {
+    'recommend': handle_recommendation_query,
+    'college': handle_college_query,
+    'program': handle_program_query,
+    'comparison': handle_comparison_query,
+    'admission': handle_admission_query,
+    'financial': handle_financial_query,
+    'location': handle_location_query
+}
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -352,6 +416,14 @@ def chat():
         # Save user message
         save_message(conversation_id, 'user', user_message)
         
+        # Streamed reply: send the response a few lines at a time
+        if wants_event_stream(data):
+            return sse_response(stream_chat_reply(
+                conversation_id,
+                stream_bot_response(user_message),
+                lambda reply: save_message(conversation_id, 'bot', reply)
+            ))
+        
         # Generate bot response
         bot_response = get_bot_response(user_message)
         
@@ -368,45 +440,120 @@ def chat():
 
 @app.route('/conversation/<conversation_id>', methods=['GET'])
 def get_conversation(conversation_id):
-    """Get conversation history"""
-    if conversation_id in conversations:
-        return jsonify(conversations[conversation_id])
-    return jsonify([])
+    """Get conversation history (paginated, or streamed with ?format=ndjson)"""
+    if wants_stream():
+        return ndjson_response(conversations.iter_messages(conversation_id, get_page_size()))
+    
+    cursor = request.args.get('cursor')
+    try:
+        cursor = int(cursor) if cursor is not None else None
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    messages, next_cursor = conversations.page_messages(conversation_id, cursor, get_page_size())
+    return page_response(messages, next_cursor)
 
 @app.route('/conversation/<conversation_id>', methods=['DELETE'])
 def clear_conversation(conversation_id):
     """Clear conversation history"""
-    if conversation_id in conversations:
-        del conversations[conversation_id]
+    if conversations.delete(conversation_id):
         return jsonify({'message': 'Conversation cleared successfully'})
     return jsonify({'error': 'Conversation not found'}), 404
 
 @app.route('/conversations', methods=['GET'])
 def list_conversations():
-    """List all conversations"""
-    return jsonify(list(conversations.keys()))
+    """List conversations (paginated, or streamed with ?format=ndjson)"""
+    if wants_stream():
+        return ndjson_response(conversations.iter_ids(get_page_size()))
+    
+    ids, next_cursor = conversations.page_ids(request.args.get('cursor'), get_page_size())
+    return page_response(ids, next_cursor)
+
+def get_health():
+    """Health check details (shared with the ASGI app)"""
+    return {
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'active_conversations': len(conversations),
+        'conversation_store': conversations.stats(),
+        'card_cache': CARD_CACHE.stats(),
+        'payload_cache': PAYLOADS.stats()
+    }
+
+def parse_recommendation_request(data):
+    """
+    Validate a /colleges/recommend body
+    
+    Returns:
+        Tuple: (profile for recommend_colleges, None) or (None, error message)
+    """
+    profile = {}
+    for field in ('gpa', 'sat', 'act', 'budget'):
+        value = data.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                  or not 0 < value < float('inf')):
+            return None, f'{field} must be a positive number'
+        profile[field] = value
+    for field in ('locations', 'programs'):
+        values = data.get(field) or []
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return None, f'{field} must be a list of strings'
+        profile[field] = values
+    
+    limit = data.get('limit', DEFAULT_RECOMMENDATIONS)
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        return None, 'limit must be a positive integer'
+    profile['limit'] = min(limit, MAX_RECOMMENDATIONS)
+    return profile, None
+
+def is_number(value):
+    """Check for an int or float (JSON true/false arrive as bools, which are ints in Python)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def check_admission_batch_request(data):
+    """Validate a /admission/calculator/batch body (returns an error message or None)"""
+    students = data.get('students')
+    college_names = data.get('colleges')
+    
+    if not isinstance(students, list) or not students:
+        return 'A non-empty list of students is required'
+    for i, student in enumerate(students):
+        if not isinstance(student, dict) or not is_number(student.get('gpa')) or not student['gpa']:
+            return f'Student {i}: GPA is required'
+        for field in ('sat', 'act'):
+            if student.get(field) is not None and not is_number(student[field]):
+                return f'Student {i}: {field.upper()} must be a number'
+    if college_names is not None and not isinstance(college_names, list):
+        return 'colleges must be a list of college names'
+    
+    college_count = len(college_names) if college_names is not None else len(COLLEGES_DATA)
+    if len(students) * college_count > MAX_BATCH_PAIRS:
+        return f'At most {MAX_BATCH_PAIRS} student/college pairs per request'
+    return None
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'active_conversations': len(conversations)
-    })
+    return jsonify(get_health())
 
 @app.route('/colleges', methods=['GET'])
 def get_colleges():
-    """Get all colleges"""
-    return jsonify(get_all_colleges())
+    """Get all colleges (cached encoded payload with ETag support)"""
+    payload = PAYLOADS.get('colleges', get_catalog_version(), get_all_colleges)
+    return payload_response(payload)
 
 @app.route('/colleges/<college_name>', methods=['GET'])
 def get_college(college_name):
-    """Get specific college information"""
-    college = get_college_by_name(college_name)
-    if college:
-        return jsonify(college)
-    return jsonify({'error': 'College not found'}), 404
+    """Get specific college information (cached encoded payload with ETag support)"""
+    college_key = resolve_college_key(college_name)
+    if college_key:
+        payload = PAYLOADS.get(('college', college_key), get_catalog_version(),
+                               lambda: COLLEGES_DATA[college_key])
+        return payload_response(payload)
+    return jsonify({
+        'error': 'College not found',
+        'suggestions': find_college_candidates(college_name)
+    }), 404
 
 @app.route('/colleges/search/program', methods=['GET'])
 def search_by_program():
@@ -440,6 +587,23 @@ def compare_colleges_endpoint():
     comparison = compare_colleges(college_names)
     return jsonify(comparison)
 
+@app.route('/colleges/recommend', methods=['POST'])
+def recommend():
+    """
+    Recommend colleges for a student profile
+    
+    Body: {"gpa": 3.8, "sat": 1450, "act": 32, "budget": 60000,
+           "locations": ["California"], "programs": ["Computer Science"], "limit": 5}
+    (every field is optional)
+    """
+    data = request.get_json(silent=True) or {}
+    
+    profile, error = parse_recommendation_request(data)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    return jsonify(recommend_colleges(**profile))
+
 @app.route('/admission/calculator', methods=['POST'])
 def admission_calculator():
     """Calculate admission chances"""
@@ -455,6 +619,22 @@ def admission_calculator():
     result = get_admission_calculator(college_name, gpa, sat, act)
     return jsonify(result)
 
+@app.route('/admission/calculator/batch', methods=['POST'])
+def admission_calculator_batch():
+    """
+    Calculate admission chances for many students and colleges at once
+    
+    Body: {"students": [{"id": ..., "gpa": 3.8, "sat": 1450, "act": 32}, ...],
+           "colleges": ["Harvard", "MIT"]}  (omit "colleges" to score every college)
+    """
+    data = request.get_json(silent=True) or {}
+    
+    error = check_admission_batch_request(data)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    return jsonify(score_admission_batch(data['students'], data.get('colleges')))
+
 # Admin routes
 @app.route('/admin')
 def admin_interface():
@@ -492,6 +672,37 @@ def admin_add_college():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/admin/import-colleges', methods=['POST'])
+def admin_import_colleges():
+    """
+    Add colleges in bulk from an NDJSON, CSV or JSON array body
+    
+    The format comes from ?format=, the uploaded file name (multipart field
+    'file') or the Content-Type. The body is parsed as a stream.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            stream = upload.stream
+            file_format = request.args.get('format') or detect_import_format(upload.filename or '', upload.mimetype or '')
+        else:
+            stream = request.stream
+            file_format = request.args.get('format') or detect_import_format(content_type=request.content_type or '')
+        
+        if file_format not in ('ndjson', 'csv', 'json'):
+            return jsonify({'success': False, 'error': 'Unknown import format; use ndjson, csv or json'}), 400
+        
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        report = import_colleges(
+            iter_college_records(text, file_format),
+            replace_existing=request.args.get('replace', '').lower() in ('1', 'true', 'yes')
+        )
+        report['success'] = report['rejected'] == 0
+        return jsonify(report)
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 if __name__ == '__main__':
     print("=" * 60)
     print("COLLEGE INFORMATION CHATBOT STARTING...")
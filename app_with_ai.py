@@ -2,7 +2,7 @@
 Enhanced Flask Chatbot with Optional AI Integration
 
 This is an enhanced version of the main app.py that includes optional AI integration.
-To use AI features, install openai and set your API key.
+To use AI features, install aiohttp (or openai) and set your API key.
 
 Usage:
     python app_with_ai.py
@@ -10,22 +10,39 @@ Usage:
 Environment Variables:
     OPENAI_API_KEY: Your OpenAI API key (optional)
     USE_AI: Set to 'true' to enable AI responses (optional)
+    OPENAI_BASE_URL: Compatible API to use instead of OpenAI, e.g. mock_completion_server.py (optional)
+    AI_TIMEOUT_SECONDS: Deadline for each AI response (optional, default: 15)
+    AI_MAX_CONCURRENCY: Maximum AI requests in flight (optional, default: 16)
+    AI_BATCH_WINDOW_MS, AI_MAX_QUEUE: AI request queue (see ai_client.py)
+    AI_CACHE_MAX_ENTRIES, AI_CACHE_TTL_SECONDS, AI_CACHE_SIMILARITY: AI response cache (see response_cache.py)
+    AI_CONTEXT_MAX_TOKENS, AI_CONTEXT_SUMMARY_TOKENS: History token budget (see context_builder.py)
+    AI_RETRIEVAL_TOP_K: College catalog facts added to each AI prompt (optional, default: 4, 0 disables)
+    AI_BREAKER_*: Circuit breaker around the AI backend (see circuit_breaker.py)
+    AI_HEDGE_SECONDS: Answer from the pattern engine if the AI takes longer (optional)
 """
 
 from flask import Flask, request, jsonify, render_template, session
 from flask_cors import CORS
+import concurrent.futures
 import json
 import os
+import time
 from datetime import datetime
 import random
+from circuit_breaker import create_circuit_breaker
+from conversation_store import create_conversation_store
+from pagination import get_page_size, ndjson_response, page_response, wants_stream
+from streaming import sse_response, stream_chat_reply, wants_event_stream
+from intent_classifier import IntentClassifier
 
 # Try to import AI integration
 try:
+    from ai_client import AIOverloadedError
     from ai_integration import AIResponseGenerator
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
-    print("AI integration not available. Install openai package to enable AI features.")
+    print("AI integration not available. Install aiohttp or openai to enable AI features.")
 
 app = Flask(__name__)
 CORS(app)
@@ -44,8 +61,20 @@ if AI_AVAILABLE and USE_AI:
         print(f"Failed to initialize AI: {e}")
         AI_GENERATOR = None
 
-# In-memory storage for conversation history (use database in production)
-conversations = {}
+# Stop calling the AI backend for a while when it keeps failing or is too
+# slow (see circuit_breaker for configuration)
+AI_BREAKER = create_circuit_breaker()
+
+# Hedged mode: answer from the pattern engine when the AI takes longer than
+# this many seconds (unset: always wait for the AI, up to AI_TIMEOUT_SECONDS)
+AI_HEDGE_SECONDS = float(os.getenv('AI_HEDGE_SECONDS')) if os.getenv('AI_HEDGE_SECONDS') else None
+AI_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(os.getenv('AI_MAX_CONCURRENCY', '16')), thread_name_prefix='ai-hedge'
+)
+AI_STATS = {'hedged': 0}
+
+# Conversation history storage (bounded; see conversation_store for configuration)
+conversations = create_conversation_store()
 
 # Enhanced response patterns (fallback when AI is not available)
 RESPONSE_PATTERNS = {
@@ -99,6 +128,26 @@ RESPONSE_PATTERNS = {
     ]
 }
 
+# Fallback intent keywords in priority order; the first intent with a match wins
+INTENT_KEYWORDS = [
+    ('greetings', ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']),
+    ('goodbye', ['bye', 'goodbye', 'see you', 'farewell', 'later']),
+    ('help', ['help', 'what can you do', 'assist', 'support']),
+    ('ai_features', ['ai', 'artificial intelligence', 'smart', 'intelligent']),
+    ('weather', ['weather', 'temperature', 'rain', 'sunny', 'cloudy']),
+    ('time', ['time', 'what time', 'clock']),
+    ('date', ['date', 'today', 'what day']),
+    ('question', ['?'])
+]
+
+# Compiled once at import; classifies a message in a single pass
+INTENT_CLASSIFIER = IntentClassifier(INTENT_KEYWORDS)
+
+def warm_caches():
+    """Build the AI's catalog fact index now (run.py calls this before forking workers)"""
+    if AI_GENERATOR is not None and AI_GENERATOR.retriever is not None:
+        AI_GENERATOR.retriever.build()
+
 def get_conversation_id():
     """Generate or retrieve conversation ID for session"""
     if 'conversation_id' not in session:
@@ -107,74 +156,134 @@ def get_conversation_id():
 
 def save_message(conversation_id, role, message):
     """Save message to conversation history"""
-    if conversation_id not in conversations:
-        conversations[conversation_id] = []
-    
-    conversations[conversation_id].append({
-        'role': role,
-        'message': message,
-        'timestamp': datetime.now().isoformat()
-    })
+    conversations.append(conversation_id, role, message)
 
-def get_bot_response(user_message, conversation_id=None):
-    """Generate intelligent bot response based on user input"""
-    # Try AI response first if available
-    if AI_GENERATOR and AI_GENERATOR.is_available():
-        try:
-            # Get conversation history for context
-            conversation_history = conversations.get(conversation_id, []) if conversation_id else []
-            
-            # Add context
-            context = {
-                'current_time': datetime.now().strftime('%H:%M:%S'),
-                'current_date': datetime.now().strftime('%B %d, %Y')
-            }
-            
-            # Generate AI response
-            ai_response = AI_GENERATOR.generate_response_with_context(user_message, context)
-            return ai_response
-        except Exception as e:
-            print(f"AI response failed, falling back to pattern matching: {e}")
-    
-    # Fallback to pattern matching
-    message_lower = user_message.lower().strip()
-    
-    # Greeting patterns
-    if any(word in message_lower for word in ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']):
-        return random.choice(RESPONSE_PATTERNS['greetings'])
-    
-    # Goodbye patterns
-    elif any(word in message_lower for word in ['bye', 'goodbye', 'see you', 'farewell', 'later']):
-        return random.choice(RESPONSE_PATTERNS['goodbye'])
-    
-    # Help patterns
-    elif any(word in message_lower for word in ['help', 'what can you do', 'assist', 'support']):
-        return random.choice(RESPONSE_PATTERNS['help'])
-    
-    # AI features patterns
-    elif any(word in message_lower for word in ['ai', 'artificial intelligence', 'smart', 'intelligent']):
-        return random.choice(RESPONSE_PATTERNS['ai_features'])
-    
-    # Weather patterns
-    elif any(word in message_lower for word in ['weather', 'temperature', 'rain', 'sunny', 'cloudy']):
-        return random.choice(RESPONSE_PATTERNS['weather'])
-    
-    # Time patterns
-    elif any(word in message_lower for word in ['time', 'what time', 'clock']):
-        return random.choice(RESPONSE_PATTERNS['time'])
-    
-    # Date patterns
-    elif any(word in message_lower for word in ['date', 'today', 'what day']):
-        return random.choice(RESPONSE_PATTERNS['date'])
+def get_ai_context():
+    """Context passed to the AI with every message"""
+    return {
+        'current_time': datetime.now().strftime('%H:%M:%S'),
+        'current_date': datetime.now().strftime('%B %d, %Y')
+    }
+
+def get_ai_history(conversation_id, user_message):
+    """Earlier messages of the conversation, without the message being answered"""
+    history = conversations.get(conversation_id) if conversation_id else []
+    if history and history[-1]['role'] == 'user' and history[-1]['message'] == user_message:
+        history = history[:-1]
+    return history
+
+def ai_enabled():
+    """Check whether AI responses are configured"""
+    return AI_GENERATOR is not None and AI_GENERATOR.is_available()
+
+def get_ai_response(user_message, prepared):
+    """
+    Get an AI response from the backend (the caller prepared the request and
+    checked the cache and the circuit breaker), recording the outcome with the
+    breaker (raises on failure)
+    """
+    started = time.monotonic()
+    try:
+        response = AI_GENERATOR.generate_response_with_context(user_message, raise_errors=True, prepared=prepared)
+    except AIOverloadedError:
+        # Rejected by our own queue limit: says nothing about the backend
+        AI_BREAKER.release()
+        raise
+    except Exception:
+        AI_BREAKER.record_failure(time.monotonic() - started)
+        raise
+    AI_BREAKER.record_success(time.monotonic() - started)
+    return response
+
+def get_pattern_response(user_message):
+    """Generate a response by pattern matching (used when AI is unavailable)"""
+    intent = INTENT_CLASSIFIER.classify(user_message)
     
     # Question patterns
-    elif '?' in user_message:
+    if intent == 'question':
         return "That's a great question! While I don't have access to real-time data, I'd be happy to discuss general topics or help in other ways."
     
+    # Canned responses (greetings, goodbye, help, AI features, weather, time, date)
+    elif intent:
+        return random.choice(RESPONSE_PATTERNS[intent])
+    
     # Default response
     else:
         return random.choice(RESPONSE_PATTERNS['default'])
 
+def get_bot_response(user_message, conversation_id=None):
+    """Generate intelligent bot response based on user input"""
+    # Try AI response first if available: a cached answer, otherwise the AI
+    # backend if it is healthy (only backend calls count for the breaker)
+    if ai_enabled():
+        history = get_ai_history(conversation_id, user_message)
+        prepared = AI_GENERATOR.prepare_request(user_message, get_ai_context(), history, conversation_id)
+        cached = AI_GENERATOR.cached_response(user_message, prepared)
+        if cached is not None:
+            return cached
+    
+    if ai_enabled() and AI_BREAKER.allow_request():
+        if AI_HEDGE_SECONDS is None:
+            try:
+                return get_ai_response(user_message, prepared)
+            except Exception as e:
+                print(f"AI response failed, falling back to pattern matching: {e}")
+        else:
+            # Hedged: prepare the pattern answer while the AI call runs and
+            # use it if the AI misses the hedge deadline (the AI call still
+            # finishes in the background and fills the response cache)
+            ai_future = AI_EXECUTOR.submit(get_ai_response, user_message, prepared)
+            pattern_response = get_pattern_response(user_message)
+            try:
+                return ai_future.result(timeout=AI_HEDGE_SECONDS)
+            except concurrent.futures.TimeoutError:
+                AI_STATS['hedged'] += 1
+                return pattern_response
+            except Exception as e:
+                print(f"AI response failed, falling back to pattern matching: {e}")
+                return pattern_response
+    
+    # Fallback to pattern matching
+    return get_pattern_response(user_message)
+
+def stream_bot_response(user_message, conversation_id=None):
+    """Yield the bot response as it is generated (AI output arrives in pieces)"""
+    if ai_enabled():
+        history = get_ai_history(conversation_id, user_message)
+        prepared = AI_GENERATOR.prepare_request(user_message, get_ai_context(), history, conversation_id)
+        cached = AI_GENERATOR.cached_response(user_message, prepared)
+        if cached is not None:
+            yield cached
+            return
+    
+    if ai_enabled() and AI_BREAKER.allow_request():
+        started = time.monotonic()
+        first_piece = True
+        try:
+            pieces = AI_GENERATOR.stream_response_with_context(user_message, raise_errors=True, prepared=prepared)
+            for piece in pieces:
+                if first_piece:
+                    # Judge the backend's latency by the time to the first piece
+                    AI_BREAKER.record_success(time.monotonic() - started)
+                    first_piece = False
+                yield piece
+            if first_piece:
+                AI_BREAKER.record_success(time.monotonic() - started)
+            return
+        except AIOverloadedError as e:
+            AI_BREAKER.release()
+            print(f"AI response failed, falling back to pattern matching: {e}")
+        except Exception as e:
+            if not first_piece:
+                # Part of the reply was sent: let the caller end the stream
+                # with an error event (the partial reply is not saved)
+                print(f"AI response stream failed: {e}")
+                raise
+            AI_BREAKER.record_failure(time.monotonic() - started)
+            print(f"AI response failed, falling back to pattern matching: {e}")
+    
+    yield get_pattern_response(user_message)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -193,6 +302,15 @@ def chat():
         # Save user message
         save_message(conversation_id, 'user', user_message)
         
+        # Streamed reply: forward the AI output as it arrives
+        if wants_event_stream(data):
+            return sse_response(stream_chat_reply(
+                conversation_id,
+                stream_bot_response(user_message, conversation_id),
+                lambda reply: save_message(conversation_id, 'bot', reply),
+                {'ai_enabled': ai_enabled()}
+            ))
+        
         # Generate bot response
         bot_response = get_bot_response(user_message, conversation_id)
         
@@ -202,7 +320,7 @@ def chat():
         return jsonify({
             'response': bot_response,
             'conversation_id': conversation_id,
-            'ai_enabled': AI_GENERATOR is not None and AI_GENERATOR.is_available()
+            'ai_enabled': ai_enabled()
         })
         
     except Exception as e:
@@ -210,43 +328,72 @@ def chat():
 
 @app.route('/conversation/<conversation_id>', methods=['GET'])
 def get_conversation(conversation_id):
-    """Get conversation history"""
-    if conversation_id in conversations:
-        return jsonify(conversations[conversation_id])
-    return jsonify([])
+    """Get conversation history (paginated, or streamed with ?format=ndjson)"""
+    if wants_stream():
+        return ndjson_response(conversations.iter_messages(conversation_id, get_page_size()))
+    
+    cursor = request.args.get('cursor')
+    try:
+        cursor = int(cursor) if cursor is not None else None
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    messages, next_cursor = conversations.page_messages(conversation_id, cursor, get_page_size())
+    return page_response(messages, next_cursor)
 
 @app.route('/conversation/<conversation_id>', methods=['DELETE'])
 def clear_conversation(conversation_id):
     """Clear conversation history"""
-    if conversation_id in conversations:
-        del conversations[conversation_id]
+    if AI_GENERATOR is not None:
+        AI_GENERATOR.context_builder.forget(conversation_id)
+    if conversations.delete(conversation_id):
         return jsonify({'message': 'Conversation cleared successfully'})
     return jsonify({'error': 'Conversation not found'}), 404
 
 @app.route('/conversations', methods=['GET'])
 def list_conversations():
-    """List all conversations"""
-    return jsonify(list(conversations.keys()))
+    """List conversations (paginated, or streamed with ?format=ndjson)"""
+    if wants_stream():
+        return ndjson_response(conversations.iter_ids(get_page_size()))
+    
+    ids, next_cursor = conversations.page_ids(request.args.get('cursor'), get_page_size())
+    return page_response(ids, next_cursor)
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
+def get_health():
+    """Health check details (shared with the ASGI app)"""
+    return {
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'active_conversations': len(conversations),
-        'ai_enabled': AI_GENERATOR is not None and AI_GENERATOR.is_available(),
+        'conversation_store': conversations.stats(),
+        'ai_enabled': ai_enabled(),
         'ai_available': AI_AVAILABLE
-    })
+    }
+
+def get_ai_status():
+    """AI integration status details (shared with the ASGI app)"""
+    return {
+        'ai_available': AI_AVAILABLE,
+        'ai_enabled': ai_enabled(),
+        'use_ai': USE_AI,
+        'client': AI_GENERATOR.stats() if AI_GENERATOR is not None else {},
+        'cache': AI_GENERATOR.cache_stats() if AI_GENERATOR is not None else {},
+        'context': AI_GENERATOR.context_stats() if AI_GENERATOR is not None else {},
+        'retrieval': AI_GENERATOR.retrieval_stats() if AI_GENERATOR is not None else {},
+        'circuit_breaker': AI_BREAKER.stats(),
+        'hedge_seconds': AI_HEDGE_SECONDS,
+        'hedged_responses': AI_STATS['hedged']
+    }
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return jsonify(get_health())
 
 @app.route('/ai/status', methods=['GET'])
 def ai_status():
     """Get AI integration status"""
-    return jsonify({
-        'ai_available': AI_AVAILABLE,
-        'ai_enabled': AI_GENERATOR is not None and AI_GENERATOR.is_available(),
-        'use_ai': USE_AI
-    })
+    return jsonify(get_ai_status())
 
 @app.route('/ai/toggle', methods=['POST'])
 def toggle_ai():
@@ -263,7 +410,7 @@ if __name__ == '__main__':
     print("🤖 AI Chatbot Server Starting...")
     print("=" * 50)
     print(f"AI Integration Available: {AI_AVAILABLE}")
-    print(f"AI Integration Enabled: {AI_GENERATOR is not None and AI_GENERATOR.is_available()}")
+    print(f"AI Integration Enabled: {ai_enabled()}")
     print(f"Server URL: http://localhost:5000")
     print("=" * 50)
     
@@ -0,0 +1,287 @@
+"""
+Compiled College Catalog
+
+This module reads the college catalog from a precompiled record file instead
+of a Python literal. The file is memory-mapped and records are decoded lazily
+on access, so a worker only pays for the colleges it actually touches and
+forked workers share the mapped pages through the OS page cache.
+
+File layout (all integers little-endian):
+    header   magic b'CLG1', codec (4 bytes: b'json' or b'mpk '), record count (u32),
+             index offset (u64)
+    records  encoded college records, back to back
+    index    per record: key length (u16), key (UTF-8), offset (u64), length (u32)
+
+Records are encoded with msgpack when it is installed, JSON otherwise.
+Decoded records are kept in a small LRU cache for repeated lookups; full
+scans (scan_catalog) decode without going through it, so a scan does not
+evict the records the request path keeps using.
+
+Build a catalog from the built-in colleges, any additional sources (JSON
+mappings of college key to record, or earlier catalog files) and the runtime
+changes journaled in COLLEGE_DATA_DIR (see catalog_journal), later ones
+taking precedence:
+    python catalog_store.py build colleges.catalog [more_colleges.json ...]
+
+Then point the application at it:
+    export COLLEGE_CATALOG=colleges.catalog
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+MAGIC = b'CLG1'
+HEADER = struct.Struct('<4s4sIQ')
+INDEX_ENTRY = struct.Struct('<QI')
+KEY_LENGTH = struct.Struct('<H')
+
+CODEC_JSON = b'json'
+CODEC_MSGPACK = b'mpk '
+
+
+def _encoder(codec: bytes):
+    if codec == CODEC_MSGPACK:
+        return lambda record: msgpack.packb(record, use_bin_type=True)
+    return lambda record: json.dumps(record, separators=(',', ':')).encode('utf-8')
+
+
+def _decoder(codec: bytes):
+    if codec == CODEC_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("This catalog is msgpack-encoded. Install with: pip install msgpack")
+        return lambda data: msgpack.unpackb(data, raw=False)
+    return lambda data: json.loads(data)
+
+
+def write_catalog(colleges: Mapping[str, Dict], path: str, codec: Optional[bytes] = None) -> int:
+    """
+    Write colleges to a catalog file (atomically replacing any existing file)
+
+    Args:
+        colleges: Mapping of college key to college record
+        path: Output file
+        codec: CODEC_MSGPACK or CODEC_JSON (default: msgpack if installed)
+
+    Returns:
+        int: Number of records written
+    """
+    codec = codec or (CODEC_MSGPACK if MSGPACK_AVAILABLE else CODEC_JSON)
+    encode = _encoder(codec)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.catalog-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, codec, 0, 0))
+            index = []
+            for key, record in colleges.items():
+                data = encode(record)
+                index.append((key, f.tell(), len(data)))
+                f.write(data)
+
+            index_offset = f.tell()
+            for key, offset, length in index:
+                encoded_key = key.encode('utf-8')
+                f.write(KEY_LENGTH.pack(len(encoded_key)))
+                f.write(encoded_key)
+                f.write(INDEX_ENTRY.pack(offset, length))
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, codec, len(index), index_offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return len(index)
+
+
+class LazyCatalog(MutableMapping):
+    """
+    Dict-like view of a catalog file that decodes records on access
+
+    Changes made at runtime (e.g. colleges added by an administrator) are kept
+    in an in-memory overlay on top of the read-only file.
+    """
+
+    def __init__(self, path: str, cache_size: int = 1024):
+        """
+        Open a catalog file
+
+        Args:
+            path: Catalog file written by write_catalog
+            cache_size: Number of decoded records kept in memory
+        """
+        self.path = path
+        self.cache_size = cache_size
+
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, codec, count, index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a college catalog file")
+        self._decode = _decoder(codec)
+
+        self._offsets: Dict[str, tuple] = {}
+        position = index_offset
+        for _ in range(count):
+            (key_length,) = KEY_LENGTH.unpack_from(self._map, position)
+            position += KEY_LENGTH.size
+            key = self._map[position:position + key_length].decode('utf-8')
+            position += key_length
+            self._offsets[key] = INDEX_ENTRY.unpack_from(self._map, position)
+            position += INDEX_ENTRY.size
+
+        self._overlay: Dict[str, Dict] = {}
+        self._deleted: Set[str] = set()
+        self._cache: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, key: str) -> Dict:
+        """Decode a record from the file, through the LRU cache"""
+        with self._lock:
+            record = self._cache.get(key)
+            if record is not None:
+                self._cache.move_to_end(key)
+                return record
+
+        offset, length = self._offsets[key]
+        record = self._decode(self._map[offset:offset + length])
+
+        with self._lock:
+            self._cache[key] = record
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def __getitem__(self, key: str) -> Dict:
+        if key in self._overlay:
+            return self._overlay[key]
+        if key in self._deleted or key not in self._offsets:
+            raise KeyError(key)
+        return self._load(key)
+
+    def __setitem__(self, key: str, record: Dict) -> None:
+        self._overlay[key] = record
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        if key in self._offsets:
+            self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._overlay or (key in self._offsets and key not in self._deleted)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._offsets:
+            if key not in self._deleted:
+                yield key
+        for key in self._overlay:
+            if key not in self._offsets:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._offsets) - len(self._deleted) + sum(1 for key in self._overlay if key not in self._offsets)
+
+    def scan(self) -> Iterator[Tuple[str, Dict]]:
+        """Yield every (key, record) pair, decoding records that are not cached without caching them"""
+        for key in self:
+            record = self._overlay.get(key)
+            if record is None:
+                with self._lock:
+                    record = self._cache.get(key)
+            if record is None:
+                offset, length = self._offsets[key]
+                record = self._decode(self._map[offset:offset + length])
+            yield key, record
+
+
+def open_catalog(path: str) -> LazyCatalog:
+    """Open a catalog file written by write_catalog"""
+    return LazyCatalog(path)
+
+
+def scan_catalog(colleges: Mapping[str, Dict]) -> Iterator[Tuple[str, Dict]]:
+    """
+    Iterate over every (key, record) pair of a catalog, for full scans
+
+    A LazyCatalog is read without filling its record cache; any other
+    mapping is iterated as is.
+    """
+    if isinstance(colleges, LazyCatalog):
+        return colleges.scan()
+    return iter(colleges.items())
+
+
+def load_source(path: str) -> Mapping[str, Dict]:
+    """Read colleges from a catalog file or a JSON mapping of college key to record"""
+    with open(path, 'rb') as f:
+        is_catalog = f.read(len(MAGIC)) == MAGIC
+    if is_catalog:
+        return open_catalog(path)
+    with open(path, 'r') as f:
+        colleges = json.load(f)
+    if not isinstance(colleges, dict):
+        raise ValueError(f"{path} does not map college keys to records")
+    return colleges
+
+
+def build_catalog(catalog_path: str, sources: Sequence[str] = ()) -> int:
+    """
+    Build a catalog file holding the complete college catalog
+
+    The built-in colleges come first, then each source in order, then the
+    runtime changes journaled in COLLEGE_DATA_DIR; later records replace
+    earlier ones with the same key.
+
+    Args:
+        catalog_path: Output catalog file
+        sources: Catalog files or JSON mappings of college key to record
+
+    Returns:
+        int: Number of colleges written
+    """
+    from builtin_colleges import BUILTIN_COLLEGES
+    from catalog_journal import create_catalog_journal
+
+    colleges: Dict[str, Dict] = dict(BUILTIN_COLLEGES)
+    for source in sources:
+        colleges.update(load_source(source))
+    colleges.update(create_catalog_journal().load())
+    return write_catalog(colleges, catalog_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != 'build':
+        print("Usage: python catalog_store.py build <output.catalog> [<colleges.json or .catalog> ...]")
+        sys.exit(2)
+
+    try:
+        count = build_catalog(sys.argv[2], sys.argv[3:])
+    except (OSError, ValueError) as e:
+        print(f"Error building catalog: {e}")
+        sys.exit(1)
+
+    codec = 'msgpack' if MSGPACK_AVAILABLE else 'json'
+    print(f"Wrote {count} colleges to {sys.argv[2]} ({codec} records)")
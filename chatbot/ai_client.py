@@ -0,0 +1,582 @@
+"""
+Async Chat Completions Client
+
+This module talks to an OpenAI-compatible chat completions API with aiohttp
+instead of blocking the request thread on the openai SDK:
+
+- One pooled HTTP session (keep-alive connections) shared by all requests
+- A deadline on every call
+- A semaphore bounding the number of upstream calls in flight
+- Cancellation: a caller that gives up cancels the upstream request
+- Streaming: ``stream``/``stream_sync`` yield the reply as it is generated
+- Micro-batching (``CompletionBatcher``): completions requested within a
+  short window are dispatched together with bounded parallelism, identical
+  requests already in flight share one upstream call, and requests are
+  rejected at once when too many are waiting. Streams take their upstream
+  slot from the same batcher (and are rejected the same way), but are not
+  de-duplicated: each stream's pieces go to a single caller
+
+The client runs on its own event loop in a background thread, so upstream
+calls from every request share one loop and one connection pool. Async code
+(e.g. an ASGI app) awaits ``complete_async``; Flask views call
+``complete_sync``, which submits the call to the loop and waits at most for
+the deadline.
+
+Configuration (environment variables):
+    OPENAI_BASE_URL: API base URL (default: https://api.openai.com/v1)
+    AI_TIMEOUT_SECONDS: Deadline per completion (default: 15)
+    AI_MAX_CONCURRENCY: Maximum upstream calls in flight (default: 16)
+    AI_BATCH_WINDOW_MS: Time requests are gathered before dispatch (default: 0,
+                        i.e. whatever arrived in the same event loop pass)
+    AI_MAX_QUEUE: Requests allowed to wait for a slot before new ones are
+                  rejected (default: 256)
+
+To test without an API key, run the stub server and point the client at it:
+    python mock_completion_server.py --port 8001
+    export OPENAI_API_KEY=test OPENAI_BASE_URL=http://127.0.0.1:8001/v1
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import queue
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+DEFAULT_BASE_URL = 'https://api.openai.com/v1'
+
+
+class AIBackendError(Exception):
+    """The completions API failed, timed out or returned an unusable response"""
+
+
+class AIOverloadedError(AIBackendError):
+    """Too many completions are waiting; the request was rejected without calling the API"""
+
+
+class CompletionBatcher:
+    """
+    Queue in front of the completions API (runs on the client's event loop)
+
+    The chat completions API takes one conversation per call, so a batch is
+    not sent as one request: the requests gathered during the window are
+    de-duplicated and started together, at most ``max_parallel`` at a time,
+    over the client's pooled connections.
+    """
+
+    def __init__(self, complete: Callable[..., Awaitable[str]], window: float = 0.0, max_parallel: int = 16,
+                 max_queue: int = 256, max_batch: int = 64):
+        """
+        Initialize the batcher
+
+        Args:
+            complete: Coroutine function making one upstream call
+                (messages, model, timeout, **params) -> str
+            window: Seconds to gather requests before dispatching them
+            max_parallel: Maximum upstream calls in flight
+            max_queue: Maximum requests waiting for dispatch or a free slot
+            max_batch: Maximum requests dispatched per window
+        """
+        self._complete = complete
+        self.window = window
+        self.max_parallel = max_parallel
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+
+        self._queue: List[tuple] = []
+        self._calls: Dict[str, asyncio.Future] = {}  # request key -> shared result
+        self._waiters: Dict[str, int] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiting = 0  # queued or waiting for a slot
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.streams = 0
+        self.rejected = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    @staticmethod
+    def request_key(messages: List[Dict], model: str, params: Dict) -> str:
+        """Identify a completion request (the deadline is not part of it)"""
+        raw = json.dumps({'model': model, 'messages': messages, 'params': params}, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _start(self) -> None:
+        """Start the dispatcher (again, after close) if needed"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_parallel)
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    def _check_queue(self) -> None:
+        """Reject a new request when max_queue requests are already waiting"""
+        if self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise AIOverloadedError(f"Too many AI requests waiting ({self._waiting}); try again shortly")
+
+    async def submit(self, messages: List[Dict], model: str, timeout: Optional[float] = None, **params) -> str:
+        """
+        Request a completion through the queue
+
+        Raises:
+            AIOverloadedError: When max_queue requests are already waiting
+            AIBackendError: When the upstream call fails
+        """
+        self._start()
+        self.submitted += 1
+        key = self.request_key(messages, model, params)
+        future = self._calls.get(key)
+        if future is not None:
+            # The same request is already queued or in flight: share its result
+            self.deduplicated += 1
+        else:
+            self._check_queue()
+            future = asyncio.get_running_loop().create_future()
+            # Failures nobody waits for any more must not be reported as unhandled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._calls[key] = future
+            self._waiters[key] = 0
+            self._queue.append((key, messages, model, timeout, params, future))
+            self._waiting += 1
+            self._wakeup.set()
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Cancel the upstream call once every caller has given up
+            if self._calls.get(key) is future and self._waiters[key] == 1 and not future.done():
+                future.cancel()
+                task = self._tasks.get(key)
+                if task is not None:
+                    task.cancel()
+            raise
+        finally:
+            if self._calls.get(key) is future:
+                self._waiters[key] -= 1
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None):
+        """
+        Hold an upstream slot for a call made outside the queue (a stream)
+
+        While waiting for the slot the caller counts as a waiting request, so
+        streams and completions share max_parallel and max_queue. Streams are
+        not de-duplicated.
+
+        Raises:
+            AIOverloadedError: When max_queue requests are already waiting
+            asyncio.TimeoutError: When no slot frees up within timeout
+        """
+        self._start()
+        slots = self._slots
+        if slots.locked():
+            self._check_queue()
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), timeout)
+            finally:
+                self._waiting -= 1
+        else:
+            await slots.acquire()
+        self.streams += 1
+        try:
+            yield
+        finally:
+            slots.release()
+
+    async def _dispatch(self) -> None:
+        """Start the queued requests, one window at a time"""
+        while True:
+            await self._wakeup.wait()
+            if self.window:
+                await asyncio.sleep(self.window)
+            else:
+                # Gather everything submitted in the same event loop pass
+                await asyncio.sleep(0)
+
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            if not self._queue:
+                self._wakeup.clear()
+            if not batch:
+                continue
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for item in batch:
+                self._tasks[item[0]] = asyncio.ensure_future(self._run(*item))
+
+    async def _run(self, key: str, messages: List[Dict], model: str, timeout: Optional[float], params: Dict,
+                   future: asyncio.Future) -> None:
+        """Make one upstream call and share its result"""
+        waiting = True
+        try:
+            async with self._slots:
+                self._waiting -= 1
+                waiting = False
+                if future.done():
+                    return
+                result = await self._complete(messages, model, timeout, **params)
+            if not future.done():
+                future.set_result(result)
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            if waiting:
+                self._waiting -= 1
+            self._calls.pop(key, None)
+            self._waiters.pop(key, None)
+            self._tasks.pop(key, None)
+
+    async def close(self) -> None:
+        """Stop dispatching and cancel the queued and running calls"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        for task in list(self._tasks.values()):
+            task.cancel()
+        for *_, future in self._queue:
+            future.cancel()
+        self._queue = []
+
+    def stats(self) -> Dict:
+        """Get queue depth and batching counters"""
+        return {
+            'window_ms': round(self.window * 1000, 1),
+            'max_queue': self.max_queue,
+            'waiting': self._waiting,
+            'submitted': self.submitted,
+            'deduplicated': self.deduplicated,
+            'streams': self.streams,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'largest_batch': self.largest_batch
+        }
+
+
+class AsyncChatClient:
+    """
+    Pooled, deadline-bounded chat completions client
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, batch_window: Optional[float] = None,
+                 max_queue: Optional[int] = None):
+        """
+        Initialize the client (the event loop and session start on first use)
+
+        Args:
+            api_key: API key sent as a bearer token
+            base_url: API base URL (default: OPENAI_BASE_URL or the OpenAI API)
+            timeout: Deadline per completion in seconds (default: AI_TIMEOUT_SECONDS or 15)
+            max_concurrency: Maximum upstream calls in flight (default: AI_MAX_CONCURRENCY or 16)
+            batch_window: Seconds to gather requests before dispatch (default: AI_BATCH_WINDOW_MS or 0)
+            max_queue: Requests allowed to wait before new ones are rejected (default: AI_MAX_QUEUE or 256)
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for the async AI client. Install with: pip install aiohttp")
+
+        self.api_key = api_key
+        self.base_url = (base_url or os.getenv('OPENAI_BASE_URL', DEFAULT_BASE_URL)).rstrip('/')
+        self.timeout = timeout if timeout is not None else float(os.getenv('AI_TIMEOUT_SECONDS', '15'))
+        self.max_concurrency = max_concurrency or int(os.getenv('AI_MAX_CONCURRENCY', '16'))
+        self.batch_window = (batch_window if batch_window is not None
+                             else float(os.getenv('AI_BATCH_WINDOW_MS', '0')) / 1000.0)
+        self.max_queue = max_queue or int(os.getenv('AI_MAX_QUEUE', '256'))
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_pid: Optional[int] = None
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[CompletionBatcher] = None
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The client's event loop, started (again, in a forked worker) on first use"""
+        with self._lock:
+            if self._loop is None or self._loop_pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='ai-client-loop', daemon=True)
+                thread.start()
+                self._loop = loop
+                self._loop_pid = os.getpid()
+                self._session = None
+                self._semaphore = None
+                self._batcher = CompletionBatcher(self.complete, self.batch_window, self.max_concurrency,
+                                                  self.max_queue)
+            return self._loop
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Get the pooled session (must run on the client's loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Authorization': f'Bearer {self.api_key}'}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _post(self, session: 'aiohttp.ClientSession', payload: Dict) -> Dict:
+        """POST one completion request once a concurrency slot is free"""
+        async with self._semaphore:
+            async with session.post(f'{self.base_url}/chat/completions', json=payload) as response:
+                if response.status != 200:
+                    detail = (await response.text())[:200]
+                    raise AIBackendError(f"Completions API returned HTTP {response.status}: {detail}")
+                return await response.json()
+
+    async def complete(self, messages: List[Dict], model: str, timeout: Optional[float] = None, **params) -> str:
+        """
+        Request a chat completion (must run on the client's loop)
+
+        Args:
+            messages: Chat messages ({'role', 'content'} dicts)
+            model: Model name
+            timeout: Deadline in seconds, including time spent waiting for a slot
+            **params: Extra request fields (max_tokens, temperature, ...)
+
+        Returns:
+            str: The completion text
+
+        Raises:
+            AIBackendError: On HTTP errors, timeouts or malformed responses
+        """
+        session = self._get_session()
+        deadline = timeout if timeout is not None else self.timeout
+        payload = {'model': model, 'messages': messages, **params}
+
+        self.in_flight += 1
+        try:
+            data = await asyncio.wait_for(self._post(session, payload), deadline)
+            content = data['choices'][0]['message']['content']
+            self.completed += 1
+            return content.strip()
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failed += 1
+            raise AIBackendError(f"Completions API did not answer within {deadline:g}s")
+        except (aiohttp.ClientError, KeyError, IndexError, TypeError, ValueError) as e:
+            self.failed += 1
+            raise AIBackendError(f"Completions API request failed: {e}")
+        except AIBackendError:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def complete_async(self, messages: List[Dict], model: str, timeout: Optional[float] = None, **params) -> str:
+        """Await a completion from any event loop (the call itself runs on the client's loop)"""
+        loop = self.loop
+        future = asyncio.run_coroutine_threadsafe(self._batcher.submit(messages, model, timeout, **params), loop)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def complete_sync(self, messages: List[Dict], model: str, timeout: Optional[float] = None, **params) -> str:
+        """
+        Request a completion from synchronous code (e.g. a Flask view)
+
+        The calling thread waits at most for the deadline; the upstream request
+        is cancelled if it has not finished by then.
+        """
+        deadline = timeout if timeout is not None else self.timeout
+        loop = self.loop
+        future = asyncio.run_coroutine_threadsafe(self._batcher.submit(messages, model, deadline, **params), loop)
+        try:
+            # The coroutine enforces the deadline; the margin covers scheduling
+            return future.result(deadline + 1.0)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.timeouts += 1
+            raise AIBackendError(f"Completions API did not answer within {deadline:g}s")
+
+    async def stream(self, messages: List[Dict], model: str, timeout: Optional[float] = None,
+                     **params) -> AsyncIterator[str]:
+        """
+        Request a streamed chat completion (must run on the client's loop)
+
+        The stream takes its upstream slot from the batcher, so it is limited
+        by AI_MAX_CONCURRENCY and AI_MAX_QUEUE like any completion. The
+        deadline applies to waiting for a slot, to the first chunk and to the
+        gap between chunks, so a long answer that keeps flowing is not cut off.
+
+        Yields:
+            str: Pieces of the completion text as they arrive
+
+        Raises:
+            AIOverloadedError: When too many requests are already waiting
+            AIBackendError: On HTTP errors, timeouts or malformed chunks
+        """
+        session = self._get_session()
+        deadline = timeout if timeout is not None else self.timeout
+        payload = {'model': model, 'messages': messages, 'stream': True, **params}
+
+        self.in_flight += 1
+        try:
+            async with self._batcher.slot(deadline):
+                response = await asyncio.wait_for(
+                    session.post(f'{self.base_url}/chat/completions', json=payload), deadline
+                )
+                async with response:
+                    if response.status != 200:
+                        detail = (await response.text())[:200]
+                        raise AIBackendError(f"Completions API returned HTTP {response.status}: {detail}")
+
+                    while True:
+                        line = await asyncio.wait_for(response.content.readline(), deadline)
+                        if not line:
+                            break
+                        line = line.strip()
+                        if not line.startswith(b'data:'):
+                            continue
+                        data = line[5:].strip()
+                        if data == b'[DONE]':
+                            break
+                        delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                        if delta:
+                            yield delta
+            self.completed += 1
+        except AIOverloadedError:
+            # Rejected before calling the API (counted by the batcher)
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failed += 1
+            raise AIBackendError(f"Completions API stalled for more than {deadline:g}s")
+        except (aiohttp.ClientError, KeyError, IndexError, TypeError, ValueError) as e:
+            self.failed += 1
+            raise AIBackendError(f"Completions API request failed: {e}")
+        except AIBackendError:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def stream_sync(self, messages: List[Dict], model: str, timeout: Optional[float] = None,
+                    **params) -> Iterator[str]:
+        """
+        Iterate over a streamed completion from synchronous code
+
+        Closing the iterator early (e.g. the browser went away) cancels the
+        upstream request.
+        """
+        deadline = timeout if timeout is not None else self.timeout
+        chunks: 'queue.Queue' = queue.Queue()
+
+        async def pump():
+            try:
+                async for delta in self.stream(messages, model, deadline, **params):
+                    chunks.put(('delta', delta))
+                chunks.put(('done', None))
+            except AIBackendError as e:
+                chunks.put(('error', e))
+            except Exception as e:
+                chunks.put(('error', AIBackendError(f"Completions API request failed: {e}")))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                try:
+                    kind, value = chunks.get(timeout=deadline + 1.0)
+                except queue.Empty:
+                    self.timeouts += 1
+                    raise AIBackendError(f"Completions API stalled for more than {deadline:g}s")
+                if kind == 'delta':
+                    yield value
+                elif kind == 'done':
+                    return
+                else:
+                    raise value
+        finally:
+            future.cancel()
+
+    async def stream_async(self, messages: List[Dict], model: str, timeout: Optional[float] = None,
+                           **params) -> AsyncIterator[str]:
+        """
+        Iterate over a streamed completion from any event loop (e.g. an ASGI app)
+
+        The upstream stream runs on the client's loop and hands pieces over
+        without tying up a thread; closing the iterator early cancels it.
+        """
+        deadline = timeout if timeout is not None else self.timeout
+        caller_loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+
+        def put(item):
+            caller_loop.call_soon_threadsafe(chunks.put_nowait, item)
+
+        async def pump():
+            try:
+                async for delta in self.stream(messages, model, deadline, **params):
+                    put(('delta', delta))
+                put(('done', None))
+            except AIBackendError as e:
+                put(('error', e))
+            except Exception as e:
+                put(('error', AIBackendError(f"Completions API request failed: {e}")))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                try:
+                    kind, value = await asyncio.wait_for(chunks.get(), deadline + 1.0)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    raise AIBackendError(f"Completions API stalled for more than {deadline:g}s")
+                if kind == 'delta':
+                    yield value
+                elif kind == 'done':
+                    return
+                else:
+                    raise value
+        finally:
+            future.cancel()
+
+    def close(self) -> None:
+        """Close the session and stop the event loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._batcher is not None:
+            asyncio.run_coroutine_threadsafe(self._batcher.close(), loop).result(5)
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+
+    def stats(self) -> Dict:
+        """Get request counters"""
+        return {
+            'base_url': self.base_url,
+            'timeout_seconds': self.timeout,
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'queue': self._batcher.stats() if self._batcher is not None else {}
+        }
@@ -0,0 +1,633 @@
+"""
+ASGI Chat API
+
+This module serves the chatbot from an ASGI app (Starlette) with async
+handlers, so a request waiting on the AI backend no longer holds a thread:
+one process can keep thousands of chats in flight. It exposes the same
+routes as the Flask apps and reuses their logic and state:
+
+- basic mode (app.py): /chat, /colleges*, /admission/calculator*, /admin*,
+  /conversation*, /health
+- AI mode (app_with_ai.py, USE_AI=true): /chat, /conversation*, /health, /ai/*
+
+The pattern engine answers inline on the event loop (it is quick and does no
+I/O); catalog computations, imports and store reads run in the thread pool;
+AI completions are awaited on the pooled async client (see ai_client), with
+the same circuit breaker and hedged fallback as the Flask AI app. Raise
+AI_MAX_QUEUE to let more AI requests wait instead of falling back at once.
+
+Usage:
+    pip install starlette uvicorn
+    uvicorn asgi_app:app --port 5000                      # basic bot
+    USE_AI=true uvicorn asgi_app:app --port 5000          # AI bot
+    python run.py --server uvicorn [--mode ai] [--workers 4]
+"""
+
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, Optional
+
+try:
+    from starlette.applications import Starlette
+    from starlette.concurrency import run_in_threadpool
+    from starlette.middleware import Middleware
+    from starlette.middleware.sessions import SessionMiddleware
+    from starlette.requests import Request
+    from starlette.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+    from starlette.routing import Mount, Route
+    from starlette.staticfiles import StaticFiles
+    STARLETTE_AVAILABLE = True
+except ImportError:
+    STARLETTE_AVAILABLE = False
+    print("Starlette not installed. Install with: pip install starlette uvicorn")
+
+from college_data import get_catalog_version
+from pagination import page_size_from, stream_requested
+from payload_cache import payload_parts
+from streaming import sse_event
+
+CHATBOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bodies of uploads larger than this are spooled to a temporary file
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+class CatalogRefreshMiddleware:
+    """
+    Pick up colleges added or imported through another worker before each request
+
+    The check is two stat calls; the journal is only read (in the thread pool)
+    when another process has changed it.
+    """
+
+    def __init__(self, app, bot):
+        self.app = app
+        self.bot = bot
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and self.bot.colleges_file_changed():
+            await run_in_threadpool(self.bot.refresh_colleges_from_file)
+        await self.app(scope, receive, send)
+
+
+def error_response(message: str, status: int = 400, **extra) -> 'JSONResponse':
+    """JSON error body in the Flask apps' format"""
+    return JSONResponse({'error': message, **extra}, status_code=status)
+
+
+async def read_json(request: 'Request') -> Optional[Dict]:
+    """Parse the request body as a JSON object (None if it is not one)"""
+    try:
+        data = await request.json()
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def get_conversation_id(request: 'Request') -> str:
+    """Generate or retrieve conversation ID for session"""
+    if 'conversation_id' not in request.session:
+        request.session['conversation_id'] = (
+            f"conv_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000, 9999)}"
+        )
+    return request.session['conversation_id']
+
+
+def wants_event_stream(request: 'Request', data: Optional[Dict]) -> bool:
+    """Check whether the client asked for a streamed reply"""
+    if data and data.get('stream'):
+        return True
+    return 'text/event-stream' in request.headers.get('accept', '')
+
+
+async def iterate(pieces: Iterable[str]) -> AsyncIterator[str]:
+    """Async iterator over an already computed reply"""
+    for piece in pieces:
+        yield piece
+
+
+async def chat_events(conversation_id: str, pieces: AsyncIterator[str], on_complete: Callable[[str], None],
+                      done: Optional[Dict] = None) -> AsyncIterator[str]:
+    """
+    Produce the events of a streamed chat reply (see streaming.stream_chat_reply)
+
+    on_complete (e.g. saving the reply) is blocking and runs in the thread pool.
+    """
+    yield sse_event({'conversation_id': conversation_id}, 'start')
+
+    reply = []
+    try:
+        async for piece in pieces:
+            reply.append(piece)
+            yield sse_event({'delta': piece})
+    except Exception as e:
+        print(f"Error streaming reply: {e}")
+        yield sse_event({'error': 'An error occurred processing your message'}, 'error')
+        return
+
+    await run_in_threadpool(on_complete, ''.join(reply))
+    yield sse_event({'conversation_id': conversation_id, **(done or {})}, 'done')
+
+
+def sse_response(events: AsyncIterator[str]) -> 'StreamingResponse':
+    """Stream preformatted events, with buffering disabled along the way"""
+    return StreamingResponse(events, media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def ndjson_response(items: Iterable) -> 'StreamingResponse':
+    """Stream items as newline-delimited JSON (the generator runs in the thread pool)"""
+    return StreamingResponse((json.dumps(item) + '\n' for item in items), media_type='application/x-ndjson')
+
+
+def page_response(items, next_cursor) -> 'JSONResponse':
+    """JSON list response, advertising the next page cursor if there is one"""
+    headers = {'X-Next-Cursor': str(next_cursor)} if next_cursor is not None else None
+    return JSONResponse(items, headers=headers)
+
+
+# Rendered pages, keyed by (Flask app name, template)
+_PAGES: Dict[tuple, str] = {}
+
+
+def _render_template(flask_app, template: str) -> str:
+    from flask import render_template
+    with flask_app.test_request_context('/'):
+        return render_template(template)
+
+
+async def render_page(flask_app, template: str) -> str:
+    """Render one of the Flask app's (static) pages on first request (in the thread pool) and reuse it"""
+    key = (flask_app.name, template)
+    html = _PAGES.get(key)
+    if html is None:
+        html = await run_in_threadpool(_render_template, flask_app, template)
+        _PAGES[key] = html
+    return html
+
+
+def conversation_routes(bot) -> list:
+    """History routes shared by both modes (bot: the Flask app module)"""
+
+    async def get_conversation(request: 'Request'):
+        """Get conversation history (paginated, or streamed with ?format=ndjson)"""
+        conversation_id = request.path_params['conversation_id']
+        limit = page_size_from(request.query_params)
+        if stream_requested(request.query_params):
+            return ndjson_response(bot.conversations.iter_messages(conversation_id, limit))
+
+        cursor = request.query_params.get('cursor')
+        try:
+            cursor = int(cursor) if cursor is not None else None
+        except ValueError:
+            return error_response('Invalid cursor')
+
+        messages, next_cursor = await run_in_threadpool(bot.conversations.page_messages, conversation_id, cursor, limit)
+        return page_response(messages, next_cursor)
+
+    async def clear_conversation(request: 'Request'):
+        """Clear conversation history"""
+        conversation_id = request.path_params['conversation_id']
+        generator = getattr(bot, 'AI_GENERATOR', None)
+        if generator is not None:
+            generator.context_builder.forget(conversation_id)
+        if await run_in_threadpool(bot.conversations.delete, conversation_id):
+            return JSONResponse({'message': 'Conversation cleared successfully'})
+        return error_response('Conversation not found', 404)
+
+    async def list_conversations(request: 'Request'):
+        """List conversations (paginated, or streamed with ?format=ndjson)"""
+        limit = page_size_from(request.query_params)
+        if stream_requested(request.query_params):
+            return ndjson_response(bot.conversations.iter_ids(limit))
+
+        ids, next_cursor = await run_in_threadpool(bot.conversations.page_ids, request.query_params.get('cursor'), limit)
+        return page_response(ids, next_cursor)
+
+    async def health_check(request: 'Request'):
+        """Health check endpoint (the conversation counts may query the sqlite store)"""
+        return JSONResponse(await run_in_threadpool(bot.get_health))
+
+    return [
+        Route('/conversation/{conversation_id}', get_conversation, methods=['GET']),
+        Route('/conversation/{conversation_id}', clear_conversation, methods=['DELETE']),
+        Route('/conversations', list_conversations, methods=['GET']),
+        Route('/health', health_check, methods=['GET']),
+    ]
+
+
+def college_routes(bot) -> list:
+    """Routes of the college bot (bot: the app module)"""
+
+    async def index(request: 'Request'):
+        return HTMLResponse(await render_page(bot.app, 'index.html'))
+
+    async def chat(request: 'Request'):
+        try:
+            data = await read_json(request)
+            if data is None:
+                return error_response('Invalid JSON body')
+            user_message = str(data.get('message', '')).strip()
+
+            if not user_message:
+                return error_response('Message cannot be empty')
+
+            conversation_id = get_conversation_id(request)
+
+            # Save user message
+            await run_in_threadpool(bot.save_message, conversation_id, 'user', user_message)
+
+            # Streamed reply: send the response a few lines at a time
+            if wants_event_stream(request, data):
+                return sse_response(chat_events(
+                    conversation_id,
+                    iterate(bot.stream_bot_response(user_message)),
+                    lambda reply: bot.save_message(conversation_id, 'bot', reply)
+                ))
+
+            # Generate bot response (pattern engine, inline)
+            bot_response = bot.get_bot_response(user_message)
+
+            # Save bot response
+            await run_in_threadpool(bot.save_message, conversation_id, 'bot', bot_response)
+
+            return JSONResponse({
+                'response': bot_response,
+                'conversation_id': conversation_id
+            })
+
+        except Exception as e:
+            print(f"Error processing message: {e}")
+            return error_response('An error occurred processing your message', 500)
+
+    def build_payload(name, build):
+        # Reuse the Flask app's payload cache and JSON encoding (runs in the thread pool)
+        with bot.app.app_context():
+            return bot.PAYLOADS.get(name, get_catalog_version(), build)
+
+    def payload_response(request: 'Request', payload) -> 'Response':
+        status, body, headers = payload_parts(payload, request.headers.get('accept-encoding', ''),
+                                              request.headers.get('if-none-match'))
+        return Response(body, status_code=status, headers=headers,
+                        media_type='application/json' if body else None)
+
+    async def get_colleges(request: 'Request'):
+        """Get all colleges (cached encoded payload with ETag support)"""
+        payload = await run_in_threadpool(build_payload, 'colleges', bot.get_all_colleges)
+        return payload_response(request, payload)
+
+    async def get_college(request: 'Request'):
+        """Get specific college information (cached encoded payload with ETag support)"""
+        college_name = request.path_params['college_name']
+        college_key = bot.resolve_college_key(college_name)
+        if college_key:
+            payload = await run_in_threadpool(build_payload, ('college', college_key),
+                                              lambda: bot.COLLEGES_DATA[college_key])
+            return payload_response(request, payload)
+        suggestions = await run_in_threadpool(bot.find_college_candidates, college_name)
+        return error_response('College not found', 404, suggestions=suggestions)
+
+    async def search_by_program(request: 'Request'):
+        """Search colleges by program"""
+        program = request.query_params.get('program', '')
+        if not program:
+            return error_response('Program parameter required')
+        return JSONResponse(await run_in_threadpool(bot.search_colleges_by_program, program))
+
+    async def search_by_location(request: 'Request'):
+        """Search colleges by location"""
+        location = request.query_params.get('location', '')
+        if not location:
+            return error_response('Location parameter required')
+        return JSONResponse(await run_in_threadpool(bot.search_colleges_by_location, location))
+
+    async def compare(request: 'Request'):
+        """Compare multiple colleges"""
+        data = await read_json(request) or {}
+        college_names = data.get('colleges', [])
+
+        if not isinstance(college_names, list) or len(college_names) < 2:
+            return error_response('At least 2 colleges required for comparison')
+        return JSONResponse(await run_in_threadpool(bot.compare_colleges, college_names))
+
+    async def recommend(request: 'Request'):
+        """Recommend colleges for a student profile (see app.recommend)"""
+        profile, error = bot.parse_recommendation_request(await read_json(request) or {})
+        if error:
+            return error_response(error)
+        return JSONResponse(await run_in_threadpool(lambda: bot.recommend_colleges(**profile)))
+
+    async def admission_calculator(request: 'Request'):
+        """Calculate admission chances"""
+        data = await read_json(request) or {}
+        college_name = data.get('college', '')
+        gpa = data.get('gpa', 0)
+
+        if not college_name or not gpa:
+            return error_response('College name and GPA are required')
+        result = await run_in_threadpool(bot.get_admission_calculator, college_name, gpa,
+                                         data.get('sat', 0), data.get('act', 0))
+        return JSONResponse(result)
+
+    async def admission_calculator_batch(request: 'Request'):
+        """Calculate admission chances for many students and colleges at once"""
+        data = await read_json(request) or {}
+        error = bot.check_admission_batch_request(data)
+        if error:
+            return error_response(error)
+        return JSONResponse(await run_in_threadpool(bot.score_admission_batch, data['students'], data.get('colleges')))
+
+    async def admin_interface(request: 'Request'):
+        """Admin interface for managing colleges"""
+        return HTMLResponse(await render_page(bot.app, 'admin_interface.html'))
+
+    async def admin_statistics(request: 'Request'):
+        """Get college database statistics"""
+        try:
+            return JSONResponse(await run_in_threadpool(bot.get_college_statistics))
+        except Exception as e:
+            return error_response(str(e), 500)
+
+    async def admin_add_college(request: 'Request'):
+        """Add a new college to the database"""
+        try:
+            data = await read_json(request)
+            if data is None:
+                return JSONResponse({'success': False, 'error': 'Invalid JSON body'}, status_code=400)
+
+            # Validate the data
+            errors = bot.validate_college_data(data)
+            if errors:
+                return JSONResponse({'success': False, 'error': 'Validation failed: ' + '; '.join(errors)},
+                                    status_code=400)
+
+            # Add the college
+            if await run_in_threadpool(bot.add_college_to_database, data):
+                return JSONResponse({'success': True, 'message': 'College added successfully'})
+            return JSONResponse({'success': False, 'error': 'Failed to add college'}, status_code=500)
+
+        except Exception as e:
+            return JSONResponse({'success': False, 'error': str(e)}, status_code=500)
+
+    async def admin_import_colleges(request: 'Request'):
+        """Add colleges in bulk from an NDJSON, CSV or JSON array body (see app.admin_import_colleges)"""
+        try:
+            content_type = request.headers.get('content-type', '')
+            if content_type.startswith('multipart/form-data'):
+                try:
+                    form = await request.form()
+                except AssertionError:
+                    # Starlette parses forms with the optional python-multipart package
+                    return JSONResponse({'success': False, 'error': 'Multipart uploads need python-multipart; '
+                                         'send the file as the request body instead'}, status_code=400)
+                upload = form.get('file')
+                if upload is None or isinstance(upload, str):
+                    return JSONResponse({'success': False, 'error': "Missing 'file' field"}, status_code=400)
+                body = upload.file
+                file_format = request.query_params.get('format') or bot.detect_import_format(
+                    upload.filename or '', upload.content_type or '')
+            else:
+                # Spool the body while it arrives, then parse it in the thread pool
+                body = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES)
+                async for chunk in request.stream():
+                    body.write(chunk)
+                body.seek(0)
+                file_format = request.query_params.get('format') or bot.detect_import_format(content_type=content_type)
+
+            if file_format not in ('ndjson', 'csv', 'json'):
+                return JSONResponse({'success': False, 'error': 'Unknown import format; use ndjson, csv or json'},
+                                    status_code=400)
+
+            replace_existing = request.query_params.get('replace', '').lower() in ('1', 'true', 'yes')
+
+            def run_import():
+                text = io.TextIOWrapper(body, encoding='utf-8-sig', newline='')
+                return bot.import_colleges(bot.iter_college_records(text, file_format),
+                                           replace_existing=replace_existing)
+
+            report = await run_in_threadpool(run_import)
+            report['success'] = report['rejected'] == 0
+            return JSONResponse(report)
+
+        except Exception as e:
+            return JSONResponse({'success': False, 'error': str(e)}, status_code=500)
+
+    return [
+        Route('/', index),
+        Route('/chat', chat, methods=['POST']),
+        Route('/colleges', get_colleges, methods=['GET']),
+        Route('/colleges/search/program', search_by_program, methods=['GET']),
+        Route('/colleges/search/location', search_by_location, methods=['GET']),
+        Route('/colleges/compare', compare, methods=['POST']),
+        Route('/colleges/recommend', recommend, methods=['POST']),
+        Route('/colleges/{college_name}', get_college, methods=['GET']),
+        Route('/admission/calculator', admission_calculator, methods=['POST']),
+        Route('/admission/calculator/batch', admission_calculator_batch, methods=['POST']),
+        Route('/admin', admin_interface),
+        Route('/admin/statistics', admin_statistics, methods=['GET']),
+        Route('/admin/add-college', admin_add_college, methods=['POST']),
+        Route('/admin/import-colleges', admin_import_colleges, methods=['POST']),
+    ] + conversation_routes(bot)
+
+
+def ai_routes(bot) -> list:
+    """Routes of the AI bot (bot: the app_with_ai module)"""
+    def prepare_ai_request(user_message, conversation_id):
+        """
+        Load the history, build the AI request and look up its cached response
+        (retrieval, summarization and the store and cache reads block: run in the threadpool)
+
+        Returns:
+            Tuple: (prepared request, cached response or None)
+        """
+        history = bot.get_ai_history(conversation_id, user_message)
+        prepared = bot.AI_GENERATOR.prepare_request(user_message, bot.get_ai_context(), history, conversation_id)
+        return prepared, bot.AI_GENERATOR.cached_response(user_message, prepared)
+
+    async def ai_response(user_message, prepared):
+        """Await a backend AI response, recording the outcome with the circuit breaker (raises on failure)"""
+        started = time.monotonic()
+        try:
+            response = await bot.AI_GENERATOR.agenerate_response_with_context(
+                user_message, raise_errors=True, prepared=prepared
+            )
+        except bot.AIOverloadedError:
+            # Rejected by our own queue limit: says nothing about the backend
+            bot.AI_BREAKER.release()
+            raise
+        except Exception:
+            bot.AI_BREAKER.record_failure(time.monotonic() - started)
+            raise
+        bot.AI_BREAKER.record_success(time.monotonic() - started)
+        return response
+
+    async def get_bot_response(user_message, conversation_id):
+        """Async version of app_with_ai.get_bot_response"""
+        if bot.ai_enabled():
+            prepared, cached = await run_in_threadpool(prepare_ai_request, user_message, conversation_id)
+            if cached is not None:
+                return cached
+
+        if bot.ai_enabled() and bot.AI_BREAKER.allow_request():
+            ai_call = asyncio.ensure_future(ai_response(user_message, prepared))
+
+            if bot.AI_HEDGE_SECONDS is None:
+                try:
+                    return await ai_call
+                except Exception as e:
+                    print(f"AI response failed, falling back to pattern matching: {e}")
+            else:
+                # Hedged: answer from the pattern engine if the AI misses the
+                # deadline; the AI call finishes anyway and fills the cache
+                ai_call.add_done_callback(lambda f: f.cancelled() or f.exception())
+                pattern_response = bot.get_pattern_response(user_message)
+                try:
+                    return await asyncio.wait_for(asyncio.shield(ai_call), bot.AI_HEDGE_SECONDS)
+                except asyncio.TimeoutError:
+                    bot.AI_STATS['hedged'] += 1
+                    return pattern_response
+                except Exception as e:
+                    print(f"AI response failed, falling back to pattern matching: {e}")
+                    return pattern_response
+
+        # Fallback to pattern matching
+        return bot.get_pattern_response(user_message)
+
+    async def stream_bot_response(user_message, conversation_id):
+        """Async version of app_with_ai.stream_bot_response"""
+        if bot.ai_enabled():
+            prepared, cached = await run_in_threadpool(prepare_ai_request, user_message, conversation_id)
+            if cached is not None:
+                yield cached
+                return
+
+        if bot.ai_enabled() and bot.AI_BREAKER.allow_request():
+            started = time.monotonic()
+            first_piece = True
+            try:
+                pieces = bot.AI_GENERATOR.astream_response_with_context(
+                    user_message, raise_errors=True, prepared=prepared
+                )
+                async for piece in pieces:
+                    if first_piece:
+                        # Judge the backend's latency by the time to the first piece
+                        bot.AI_BREAKER.record_success(time.monotonic() - started)
+                        first_piece = False
+                    yield piece
+                if first_piece:
+                    bot.AI_BREAKER.record_success(time.monotonic() - started)
+                return
+            except bot.AIOverloadedError as e:
+                bot.AI_BREAKER.release()
+                print(f"AI response failed, falling back to pattern matching: {e}")
+            except Exception as e:
+                if not first_piece:
+                    # Part of the reply was sent: chat_events ends the stream
+                    # with an error event and does not save the partial reply
+                    print(f"AI response stream failed: {e}")
+                    raise
+                bot.AI_BREAKER.record_failure(time.monotonic() - started)
+                print(f"AI response failed, falling back to pattern matching: {e}")
+
+        yield bot.get_pattern_response(user_message)
+
+    async def index(request: 'Request'):
+        return HTMLResponse(await render_page(bot.app, 'index.html'))
+
+    async def chat(request: 'Request'):
+        try:
+            data = await read_json(request)
+            if data is None:
+                return error_response('Invalid JSON body')
+            user_message = str(data.get('message', '')).strip()
+
+            if not user_message:
+                return error_response('Message cannot be empty')
+
+            conversation_id = get_conversation_id(request)
+
+            # Save user message
+            await run_in_threadpool(bot.save_message, conversation_id, 'user', user_message)
+
+            # Streamed reply: forward the AI output as it arrives
+            if wants_event_stream(request, data):
+                return sse_response(chat_events(
+                    conversation_id,
+                    stream_bot_response(user_message, conversation_id),
+                    lambda reply: bot.save_message(conversation_id, 'bot', reply),
+                    {'ai_enabled': bot.ai_enabled()}
+                ))
+
+            # Generate bot response
+            bot_response = await get_bot_response(user_message, conversation_id)
+
+            # Save bot response
+            await run_in_threadpool(bot.save_message, conversation_id, 'bot', bot_response)
+
+            return JSONResponse({
+                'response': bot_response,
+                'conversation_id': conversation_id,
+                'ai_enabled': bot.ai_enabled()
+            })
+
+        except Exception as e:
+            print(f"Error processing message: {e}")
+            return error_response('An error occurred processing your message', 500)
+
+    async def ai_status(request: 'Request'):
+        """Get AI integration status"""
+        return JSONResponse(bot.get_ai_status())
+
+    async def toggle_ai(request: 'Request'):
+        """Toggle AI integration (requires restart)"""
+        bot.USE_AI = not bot.USE_AI
+        return JSONResponse({
+            'ai_enabled': bot.USE_AI,
+            'message': 'AI setting updated. Restart the application to apply changes.'
+        })
+
+    return [
+        Route('/', index),
+        Route('/chat', chat, methods=['POST']),
+        Route('/ai/status', ai_status, methods=['GET']),
+        Route('/ai/toggle', toggle_ai, methods=['POST']),
+    ] + conversation_routes(bot)
+
+
+def create_app(mode: str = 'basic') -> 'Starlette':
+    """
+    Create the ASGI app
+
+    Args:
+        mode: 'basic' for the college bot (app.py) or 'ai' for the AI bot (app_with_ai.py)
+
+    Returns:
+        Starlette: The ASGI app
+    """
+    if not STARLETTE_AVAILABLE:
+        raise ImportError("Starlette is required for the ASGI app. Install with: pip install starlette uvicorn")
+
+    if mode == 'ai':
+        import app_with_ai as bot
+        routes = ai_routes(bot)
+        middleware = []
+    else:
+        import app as bot
+        routes = college_routes(bot)
+        middleware = [Middleware(CatalogRefreshMiddleware, bot=bot)]
+
+    # check_dir=False: importable from a copy without the static folder (static files then 404)
+    routes.append(Mount('/static', StaticFiles(directory=os.path.join(CHATBOT_DIR, 'static'), check_dir=False),
+                        name='static'))
+    middleware.append(Middleware(SessionMiddleware, secret_key=bot.app.secret_key))
+    return Starlette(routes=routes, middleware=middleware)
+
+
+# Entry point for ASGI servers (uvicorn asgi_app:app); USE_AI selects the bot
+app = create_app('ai' if os.getenv('USE_AI', 'false').lower() == 'true' else 'basic') if STARLETTE_AVAILABLE else None
@@ -0,0 +1,125 @@
+"""
+Rendered Card Cache
+
+This module caches the markdown "cards" the chatbot renders for a college
+(overview, admission requirements, tuition) so the same text is not rebuilt
+from dozens of f-string concatenations on every request.
+
+Entries are keyed by (college key, card type, data version). The data version
+of a college is bumped whenever the catalog reports a change to it, so stale
+cards are never served after an admin edit.
+
+Example usage:
+    from card_cache import CardCache
+
+    cache = CardCache({'college': render_college_card})
+    add_catalog_listener(cache.invalidate)
+    text = cache.get('harvard', 'college')
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from college_data import COLLEGES_DATA
+
+
+class CardCache:
+    """
+    LRU cache of rendered college cards
+    """
+
+    def __init__(self, renderers: Dict[str, Callable[[Dict], str]], max_entries: int = 1000):
+        """
+        Initialize the cache
+
+        Args:
+            renderers: Mapping of card type to a function rendering a college record
+            max_entries: Maximum number of cached cards
+        """
+        self.renderers = renderers
+        self.max_entries = max_entries
+        self._cards: 'OrderedDict[tuple, str]' = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, college_key: str, card_type: str) -> Optional[str]:
+        """
+        Get a rendered card, rendering and caching it on a miss
+
+        Args:
+            college_key: Key of the college in COLLEGES_DATA
+            card_type: One of the configured card types
+
+        Returns:
+            The rendered card, or None if the college does not exist
+        """
+        # The version is read before the record: a card rendered from a record
+        # replaced meanwhile is stored under the version it replaced, which
+        # is never looked up again
+        cache_key = (college_key, card_type, self._versions.get(college_key, 0))
+        college = COLLEGES_DATA.get(college_key)
+        if college is None:
+            return None
+
+        with self._lock:
+            card = self._cards.get(cache_key)
+            if card is not None:
+                self._cards.move_to_end(cache_key)
+                self.hits += 1
+                return card
+            self.misses += 1
+
+        card = self.renderers[card_type](college)
+
+        with self._lock:
+            self._cards[cache_key] = card
+            while len(self._cards) > self.max_entries:
+                self._cards.popitem(last=False)
+        return card
+
+    def invalidate(self, college_key: str, old: Optional[Dict] = None, new: Optional[Dict] = None) -> None:
+        """
+        Drop cached cards for a college (usable as a catalog listener)
+
+        Args:
+            college_key: Key of the changed college
+            old: Previous college record (unused)
+            new: New college record (unused)
+        """
+        with self._lock:
+            self._versions[college_key] = self._versions.get(college_key, 0) + 1
+            for cache_key in [k for k in self._cards if k[0] == college_key]:
+                del self._cards[cache_key]
+
+    def warm(self, college_keys: Iterable[str]) -> int:
+        """
+        Pre-render every card type for the given colleges
+
+        Args:
+            college_keys: Keys of the colleges to warm
+
+        Returns:
+            int: Number of cards rendered
+        """
+        rendered = 0
+        for college_key in college_keys:
+            for card_type in self.renderers:
+                try:
+                    if self.get(college_key, card_type) is not None:
+                        rendered += 1
+                except (KeyError, TypeError) as e:
+                    # Incomplete records (e.g. imported with only the required
+                    # fields) are rendered, and fail, on request instead
+                    print(f"Error pre-rendering {card_type} card for {college_key}: missing {e}")
+        return rendered
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        return {
+            'entries': len(self._cards),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,276 @@
+"""
+College Catalog Persistence
+
+This module persists catalog changes made at runtime (e.g. colleges added
+through the admin interface) without rewriting the whole catalog on every
+change:
+
+- Each change is appended to a change log (one JSON object per line) by a
+  background writer thread, off the request path.
+- Every ``compact_every`` changes, and on demand, the snapshot and the log
+  are read back from disk and folded into a new snapshot, written to a
+  temporary file and atomically renamed over the previous one, after which
+  the log is truncated. The snapshot therefore only holds colleges changed
+  at runtime, never the built-in or catalog-file records.
+- On boot, ``load`` reads the snapshot and replays the log on top of it.
+
+Several processes (e.g. gunicorn workers) may share the files: appends and
+compactions hold an exclusive lock on a lock file next to them, so a
+compaction never drops entries another process has logged. The lock uses
+fcntl and is skipped where fcntl is unavailable (Windows), which is safe
+with a single process.
+
+Configuration (environment variables):
+    COLLEGE_DATA_DIR: Directory for the snapshot and log (default: this module's directory)
+    COLLEGE_COMPACT_EVERY: Logged changes between automatic compactions (default: 500)
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+SNAPSHOT_FILE = 'colleges_backup.json'
+LOG_FILE = 'colleges_changes.log'
+LOCK_FILE = 'colleges_changes.lock'
+
+
+def atomic_write_json(path: str, data: object) -> None:
+    """Write JSON to a temporary file and atomically rename it over path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.colleges-', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class CatalogJournal:
+    """
+    Append-only change log with periodic atomic snapshots
+    """
+
+    # Seconds the writer waits before retrying a failed log write
+    RETRY_SECONDS = 0.5
+
+    def __init__(self, directory: str, compact_every: int = 500):
+        """
+        Initialize the journal
+
+        Args:
+            directory: Directory holding the snapshot and change log
+            compact_every: Logged changes between automatic compactions
+        """
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.lock_path = os.path.join(directory, LOCK_FILE)
+        self.compact_every = compact_every
+
+        self._pending: List[Dict] = []
+        self._logged_since_compaction = 0
+        # Signature of the files when this process last knew all of their
+        # content (after a load, or its own append or compaction on top of one)
+        self._known_signature: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+
+        atexit.register(self.flush)
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread (again, in a forked worker) if needed (caller holds the lock)"""
+        if self._writer is not None and self._writer_pid == os.getpid() and self._writer.is_alive():
+            return
+        self._writer_pid = os.getpid()
+        self._writer = threading.Thread(target=self._write_loop, name='catalog-journal', daemon=True)
+        self._writer.start()
+
+    def record(self, college_key: str, college: Optional[Dict]) -> None:
+        """
+        Queue a catalog change for the log (returns immediately)
+
+        Args:
+            college_key: Key of the changed college
+            college: New college record, or None if the college was removed
+        """
+        self.record_many([(college_key, college)])
+
+    def record_many(self, changes) -> None:
+        """Queue several catalog changes as one log write"""
+        entries = [
+            {'op': 'put', 'key': key, 'college': college} if college is not None else {'op': 'delete', 'key': key}
+            for key, college in changes
+        ]
+        with self._lock:
+            self._ensure_writer()
+            self._pending.extend(entries)
+            self._wakeup.notify()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the lock shared with other processes using the same files"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self.lock_path, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _write_loop(self) -> None:
+        """Append queued changes to the log until the process exits"""
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+            if not self.flush():
+                # The changes are queued again; retry once the disk may have recovered
+                time.sleep(self.RETRY_SECONDS)
+
+    def flush(self) -> bool:
+        """
+        Write every queued change to the log now, compacting if due
+
+        Returns:
+            bool: False if the log could not be written (the changes stay queued)
+        """
+        with self._write_lock:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if entries:
+                try:
+                    with self._file_lock():
+                        known = self.signature() == self._known_signature
+                        with open(self.log_path, 'a') as f:
+                            f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+                            f.flush()
+                            os.fsync(f.fileno())
+                        if known:
+                            # Our own entries: nothing new to load
+                            self._known_signature = self.signature()
+                    self._logged_since_compaction += len(entries)
+                except OSError as e:
+                    print(f"Error writing college change log: {e}")
+                    with self._lock:
+                        self._pending[:0] = entries
+                    return False
+
+            if self._logged_since_compaction >= self.compact_every:
+                self._compact_locked()
+        return True
+
+    def compact(self) -> None:
+        """Fold the change log into the snapshot atomically and truncate the log"""
+        with self._write_lock:
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        """Compact (caller holds the write lock)"""
+        try:
+            # Read back what every process has logged, not this process's
+            # catalog, so nothing logged elsewhere is lost with the old log
+            with self._file_lock():
+                known = self.signature() == self._known_signature
+                colleges, _ = self._read()
+                atomic_write_json(self.snapshot_path, colleges)
+                with open(self.log_path, 'w') as f:
+                    f.flush()
+                    os.fsync(f.fileno())
+                if known:
+                    self._known_signature = self.signature()
+            self._logged_since_compaction = 0
+        except (OSError, ValueError) as e:
+            print(f"Error compacting college data: {e}")
+
+    def signature(self) -> Tuple:
+        """
+        Return the size and modification time of the snapshot and the log
+
+        The signature changes whenever any process appends or compacts, so it
+        tells cheaply (two stat calls) whether the files changed.
+        """
+        stats = []
+        for path in (self.snapshot_path, self.log_path):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                stats.append(None)
+        return tuple(stats)
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Read the snapshot and replay the change log on top of it
+
+        Returns:
+            Dict[str, Dict]: The persisted catalog changes (empty if nothing was saved)
+        """
+        with self._file_lock():
+            signature = self.signature()
+            colleges, logged = self._read()
+            self._known_signature = signature
+            # Entries already in the log count toward the next compaction
+            self._logged_since_compaction = logged
+            return colleges
+
+    def changed_elsewhere(self) -> bool:
+        """
+        Tell whether another process changed the files since this one last loaded them
+
+        This process's own appends and compactions do not count, unless
+        another process wrote in between (two stat calls).
+        """
+        return self.signature() != self._known_signature
+
+    def _read(self) -> Tuple[Dict[str, Dict], int]:
+        """Read the snapshot plus the change log and count the log entries (caller holds the file lock)"""
+        colleges: Dict[str, Dict] = {}
+        logged = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                colleges = json.load(f)
+
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append
+                        break
+                    if entry.get('op') == 'put':
+                        colleges[entry['key']] = entry['college']
+                    elif entry.get('op') == 'delete':
+                        colleges.pop(entry['key'], None)
+                    logged += 1
+
+        return colleges, logged
+
+
+def create_catalog_journal() -> CatalogJournal:
+    """Create the journal configured by environment variables"""
+    return CatalogJournal(
+        directory=os.getenv('COLLEGE_DATA_DIR', os.path.dirname(os.path.abspath(__file__))),
+        compact_every=int(os.getenv('COLLEGE_COMPACT_EVERY', '500'))
+    )
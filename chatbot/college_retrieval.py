@@ -0,0 +1,294 @@
+"""
+College Fact Retrieval
+
+This module finds the catalog facts relevant to a chat message so the AI can
+answer from COLLEGES_DATA instead of from its own memory. Every college
+record is split into short chunks (overview, costs, programs, admission
+requirements, campus life, contact) and indexed with BM25; the top-k chunks
+for a message are added to the AI prompt.
+
+The tokenized chunks and the inverted index are built once, on the first
+search, and then kept in sync with catalog changes through
+``college_data.add_catalog_listener``, so only changed colleges are
+re-encoded. A search takes the postings of its terms as NumPy arrays under
+the index lock and scores them with array arithmetic after releasing it.
+
+Configuration (environment variables):
+    AI_RETRIEVAL_TOP_K: Chunks added to each AI prompt (default: 4, 0 disables retrieval)
+
+Example usage:
+    from college_retrieval import create_college_retriever
+
+    retriever = create_college_retriever()
+    for chunk in retriever.search("What SAT score does MIT require?"):
+        print(chunk['text'])
+"""
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from catalog_store import scan_catalog
+from college_data import COLLEGE_NAME_ALIASES, COLLEGES_DATA, add_catalog_listener
+from college_index import get_undergraduate_tuition
+
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset("""
+a about an and any are as at be can do does for from get how i in is it me my of on or
+please tell than that the their there this to was what when where which who why will with you
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a text without stopwords (plural 's' removed)"""
+    tokens = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _join(values) -> str:
+    return ', '.join(str(value) for value in values or [])
+
+
+def college_chunks(college: Dict) -> List[Tuple[str, str]]:
+    """
+    Split a college record into short, self-contained fact chunks
+
+    Every chunk starts with the college name, so a question naming the
+    college matches all of its chunks.
+
+    Returns:
+        List[Tuple[str, str]]: (section, text) pairs
+    """
+    name = college.get('name', '')
+    chunks = []
+
+    overview = [f"{name}: {college.get('type', 'college')} in {college.get('location', 'unknown location')}"]
+    if college.get('founded'):
+        overview.append(f"founded {college['founded']}")
+    if college.get('ranking'):
+        overview.append(f"ranked #{college['ranking']}")
+    if college.get('acceptance_rate') is not None:
+        overview.append(f"acceptance rate {college['acceptance_rate']}%")
+    chunks.append(('overview', ', '.join(overview) + '.'))
+
+    tuition = college.get('tuition') or {}
+    if tuition:
+        costs = [f"{field.replace('_', ' ')} ${value:,}" for field, value in tuition.items()
+                 if isinstance(value, (int, float))]
+        cost = get_undergraduate_tuition(college)
+        chunks.append(('costs', f"{name} tuition and costs per year: {', '.join(costs)}."
+                       + (f" Undergraduate sticker price ${cost:,}." if cost else '')))
+
+    programs = college.get('programs') or {}
+    if programs.get('undergraduate'):
+        chunks.append(('programs', f"{name} undergraduate programs (majors): {_join(programs['undergraduate'])}."))
+    if programs.get('graduate'):
+        chunks.append(('graduate_programs', f"{name} graduate programs: {_join(programs['graduate'])}."))
+
+    requirements = college.get('admission_requirements') or {}
+    if requirements:
+        labels = {'gpa': 'GPA', 'sat_score': 'SAT score', 'act_score': 'ACT score', 'toefl': 'TOEFL',
+                  'ielts': 'IELTS', 'essays': 'essays', 'recommendations': 'recommendations',
+                  'deadline': 'application deadline'}
+        facts = [f"{labels.get(field, field.replace('_', ' '))} {value}" for field, value in requirements.items()]
+        chunks.append(('admission', f"{name} admission requirements: {', '.join(facts)}."))
+
+    campus = college.get('campus_life') or {}
+    if campus:
+        facts = [f"{field.replace('_', ' ')} {value}" for field, value in campus.items()]
+        chunks.append(('campus_life', f"{name} campus life and students: {', '.join(facts)}."))
+
+    if college.get('notable_features'):
+        chunks.append(('features', f"{name} notable features: {_join(college['notable_features'])}."))
+
+    contact = college.get('contact') or {}
+    if contact:
+        chunks.append(('contact', f"{name} contact: {', '.join(f'{k} {v}' for k, v in contact.items())}."))
+
+    return chunks
+
+
+class CollegeRetriever:
+    """
+    BM25 index over college fact chunks
+    """
+
+    def __init__(self, colleges: Optional[Dict[str, Dict]] = None, top_k: int = 4, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize the retriever (the index is built on the first search)
+
+        Args:
+            colleges: Mapping of college key to college record (default: COLLEGES_DATA)
+            top_k: Default number of chunks returned by search
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.colleges = colleges if colleges is not None else COLLEGES_DATA
+        self.top_k = top_k
+        self.k1 = k1
+        self.b = b
+
+        self._built = False
+        self._lock = threading.Lock()
+        self._chunks: Dict[int, Tuple[str, str, str]] = {}  # id -> (college key, section, text)
+        self._lengths = np.zeros(1024, dtype=np.float64)  # chunk id -> length in terms
+        self._postings: Dict[str, Dict[int, int]] = {}  # term -> {chunk id: term frequency}
+        # term -> (chunk ids, term frequencies), built from _postings on first search
+        self._posting_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._chunk_ids: Dict[str, List[int]] = {}  # college key -> chunk ids
+        self._total_length = 0
+        self._next_id = 0
+
+        # Short names that do not appear in the records ("mit", "penn") match
+        # every chunk of their college
+        self._key_terms: Dict[str, List[str]] = {}
+        for alias, college_key in COLLEGE_NAME_ALIASES.items():
+            self._key_terms.setdefault(college_key, []).extend(tokenize(alias))
+
+    def _terms(self, college_key: str, text: str) -> List[str]:
+        return tokenize(text) + tokenize(college_key) + self._key_terms.get(college_key, [])
+
+    def _add(self, college_key: str, college: Dict) -> None:
+        """Encode and index the chunks of a college (caller holds the lock)"""
+        ids = []
+        for section, text in college_chunks(college):
+            chunk_id = self._next_id
+            self._next_id += 1
+            terms = Counter(self._terms(college_key, text))
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[chunk_id] = frequency
+                self._posting_arrays.pop(term, None)
+            length = sum(terms.values())
+            self._chunks[chunk_id] = (college_key, section, text)
+            if chunk_id >= len(self._lengths):
+                # A new array: searches scoring with the old one keep it intact
+                self._lengths = np.concatenate([self._lengths, np.zeros(len(self._lengths))])
+            self._lengths[chunk_id] = length
+            self._total_length += length
+            ids.append(chunk_id)
+        self._chunk_ids[college_key] = ids
+
+    def _remove(self, college_key: str) -> None:
+        """Drop the chunks of a college (caller holds the lock)"""
+        for chunk_id in self._chunk_ids.pop(college_key, []):
+            _, _, text = self._chunks.pop(chunk_id)
+            for term in set(self._terms(college_key, text)):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    self._posting_arrays.pop(term, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_length -= int(self._lengths[chunk_id])
+
+    def build(self) -> None:
+        """Build the index now instead of on the first search (no-op once built)"""
+        with self._lock:
+            if self._built:
+                return
+            for college_key, college in scan_catalog(self.colleges):
+                self._add(college_key, college)
+            self._built = True
+
+    def update(self, college_key: str, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """
+        Apply a catalog change (a ``college_data`` catalog listener)
+
+        Args:
+            college_key: Key of the changed college
+            old: Previous college record, or None when the college is new
+            new: New college record, or None when the college was removed
+        """
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(college_key)
+            if new is not None:
+                self._add(college_key, new)
+
+    def _term_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Chunk ids and frequencies of a term as arrays (caller holds the lock)"""
+        arrays = self._posting_arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            arrays = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                      np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+            self._posting_arrays[term] = arrays
+        return arrays
+
+    def search(self, query: str, top_k: Optional[int] = None, min_score: float = 1.0) -> List[Dict]:
+        """
+        Find the chunks most relevant to a message
+
+        Args:
+            query: The user's message
+            top_k: Maximum number of chunks (default: the retriever's top_k)
+            min_score: Minimum BM25 score (keeps small talk from pulling in facts)
+
+        Returns:
+            List[Dict]: Chunks ({'college', 'section', 'text', 'score'}), best first
+        """
+        top_k = self.top_k if top_k is None else top_k
+        terms = set(tokenize(query))
+        if not terms or top_k <= 0:
+            return []
+        self.build()
+
+        with self._lock:
+            count = len(self._chunks)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            lengths = self._lengths
+            postings = [self._term_postings(term) for term in terms if term in self._postings]
+        if not postings:
+            return []
+
+        # BM25 over the postings arrays, without holding the lock
+        contributions = []
+        for chunk_ids, frequencies in postings:
+            idf = math.log(1.0 + (count - len(chunk_ids) + 0.5) / (len(chunk_ids) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * lengths[chunk_ids] / average_length)
+            contributions.append(idf * frequencies * (self.k1 + 1.0) / (frequencies + norm))
+        chunk_ids, rows = np.unique(np.concatenate([ids for ids, _ in postings]), return_inverse=True)
+        scores = np.bincount(rows, weights=np.concatenate(contributions))
+        best = np.argsort(-scores, kind='stable')[:top_k]
+
+        with self._lock:
+            # Chunks removed since the postings were taken are skipped
+            chunks = [(self._chunks.get(int(chunk_ids[row])), float(scores[row])) for row in best]
+        return [
+            {'college': chunk[0], 'section': chunk[1], 'text': chunk[2], 'score': round(score, 3)}
+            for chunk, score in chunks if chunk is not None and score >= min_score
+        ]
+
+    def stats(self) -> Dict:
+        """Get index size"""
+        return {
+            'top_k': self.top_k,
+            'built': self._built,
+            'colleges': len(self._chunk_ids),
+            'chunks': len(self._chunks),
+            'terms': len(self._postings)
+        }
+
+
+def create_college_retriever() -> Optional[CollegeRetriever]:
+    """Create a retriever over COLLEGES_DATA that follows catalog changes (None if disabled)"""
+    top_k = int(os.getenv('AI_RETRIEVAL_TOP_K', '4'))
+    if top_k <= 0:
+        return None
+    retriever = CollegeRetriever(top_k=top_k)
+    add_catalog_listener(retriever.update)
+    return retriever
@@ -0,0 +1,302 @@
+"""
+AI Context Builder
+
+This module decides how much of a conversation is sent to the AI with each
+message. Prompt size drives both the latency and the cost of a completion,
+and a long counseling session can run to hundreds of messages, so instead of
+sending a fixed number of recent messages the builder packs history into a
+token budget:
+
+- Tokens are estimated locally (with tiktoken when it is installed, otherwise
+  about four characters per token), without calling the API.
+- The most recent messages are kept verbatim, newest first, until the budget
+  is used up.
+- Older messages are folded into a short extractive summary (the sentences
+  carrying the most information, such as scores, budgets and college names)
+  sent as one system message.
+- The summary is rolling: it is cached per conversation and only the messages
+  that dropped out of the verbatim window since the last turn are folded into
+  it, so it is not recomputed on every message.
+
+Configuration (environment variables):
+    AI_CONTEXT_MAX_TOKENS: Token budget of the prompt, excluding the reply (default: 2000)
+    AI_CONTEXT_SUMMARY_TOKENS: Token budget of the summary (default: 300)
+"""
+
+import hashlib
+import math
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Tokens added by the chat format around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Conversation roles as stored by the apps, mapped to chat API roles
+ROLE_NAMES = {'user': 'user', 'bot': 'assistant', 'assistant': 'assistant', 'system': 'system'}
+
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\n+')
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9'.]*")
+_STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could did do does
+for from get had has have he her here him his how i if in into is it its just know like me
+more my no not now of on or our out please she so some than that the their them then there
+these they this to too up us very was we were what when where which who why will with would
+you your yes ok okay thanks thank hi hello
+""".split())
+
+
+class TokenCounter:
+    """
+    Local token count estimate
+    """
+
+    def __init__(self, model: str = 'gpt-3.5-turbo'):
+        self._encoding = None
+        self.name = 'estimate'
+        if TIKTOKEN_AVAILABLE:
+            self.name = 'tiktoken'
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding('cl100k_base')
+
+    def count(self, text: str) -> int:
+        """Estimate the number of tokens in a text"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return math.ceil(len(text) / 4)
+
+    def count_message(self, message: Dict) -> int:
+        """Estimate the tokens a chat message takes up in the prompt"""
+        return self.count(message.get('content', '')) + MESSAGE_OVERHEAD_TOKENS
+
+
+def message_fingerprint(message: Dict) -> str:
+    """Identify a stored conversation message"""
+    raw = f"{message.get('role')}\0{message.get('timestamp', '')}\0{message.get('message', '')}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class _Summary:
+    """Rolling summary state of one conversation"""
+    __slots__ = ('last_fingerprint', 'word_counts', 'sentences', 'next_order', 'text')
+
+    def __init__(self):
+        self.last_fingerprint: Optional[str] = None
+        self.word_counts: Counter = Counter()
+        self.sentences: List[Tuple[int, str, str]] = []  # (order, role, sentence)
+        self.next_order = 0
+        self.text = ''
+
+    def copy(self) -> '_Summary':
+        other = _Summary()
+        other.last_fingerprint = self.last_fingerprint
+        other.word_counts = Counter(self.word_counts)
+        other.sentences = list(self.sentences)
+        other.next_order = self.next_order
+        other.text = self.text
+        return other
+
+
+class ContextBuilder:
+    """
+    Packs conversation history into a token budget with a rolling summary
+    """
+
+    def __init__(self, max_tokens: int = 2000, summary_tokens: int = 300, model: str = 'gpt-3.5-turbo',
+                 max_conversations: int = 1024):
+        """
+        Initialize the builder
+
+        Args:
+            max_tokens: Token budget of the prompt (system prompt, summary,
+                history and the new message; the reply is not included)
+            summary_tokens: Token budget of the summary of older messages
+            model: Model whose tokenizer is used for estimates
+            max_conversations: Conversations whose summary is cached
+        """
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.max_conversations = max_conversations
+        self.tokens = TokenCounter(model)
+
+        self._summaries: 'OrderedDict[str, _Summary]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.summaries_built = 0
+        self.summaries_extended = 0
+        self.summaries_reused = 0
+        self.messages_folded = 0
+
+    def build(self, system_prompt: str, user_message: str, history: Optional[List[Dict]] = None,
+              conversation_id: Optional[str] = None) -> List[Dict]:
+        """
+        Build the chat messages for a completion
+
+        Args:
+            system_prompt: The system prompt
+            user_message: The new user message
+            history: Earlier messages of the conversation ({'role', 'message'}
+                dicts as stored by the apps, oldest first, without the new message)
+            conversation_id: Conversation the summary is cached under (None: not cached)
+
+        Returns:
+            List[Dict]: Chat messages ({'role', 'content'} dicts)
+        """
+        system = {'role': 'system', 'content': system_prompt}
+        user = {'role': 'user', 'content': user_message}
+        if not history:
+            return [system, user]
+
+        budget = self.max_tokens - self.tokens.count_message(system) - self.tokens.count_message(user)
+        messages = [
+            {'role': ROLE_NAMES.get(m.get('role'), 'user'), 'content': m.get('message', '')}
+            for m in history
+        ]
+
+        # Keep the newest messages verbatim; leave room for the summary only
+        # when some messages will not fit
+        total = sum(self.tokens.count_message(m) for m in messages)
+        if total > budget:
+            budget -= self.summary_tokens + MESSAGE_OVERHEAD_TOKENS
+        start = len(messages)
+        while start > 0:
+            cost = self.tokens.count_message(messages[start - 1])
+            if cost > budget:
+                break
+            budget -= cost
+            start -= 1
+
+        packed = [system]
+        if start > 0:
+            summary, start = self._summarize(history, start, conversation_id)
+            if summary:
+                packed.append({'role': 'system', 'content': summary})
+        packed.extend(messages[start:])
+        packed.append(user)
+        return packed
+
+    def _summarize(self, history: List[Dict], start: int, conversation_id: Optional[str]) -> Tuple[str, int]:
+        """
+        Summary of the messages before ``start``, reusing the cached summary
+
+        Returns:
+            Tuple[str, int]: The summary and the index of the first message it
+            does not cover (at least ``start``)
+        """
+        with self._lock:
+            state = self._summaries.get(conversation_id) if conversation_id is not None else None
+            if state is not None:
+                self._summaries.move_to_end(conversation_id)
+
+        # Find where the cached summary stopped; if the history was trimmed
+        # past that point (or cleared), start over
+        covered = None
+        if state is not None:
+            for index in range(len(history) - 1, -1, -1):
+                if message_fingerprint(history[index]) == state.last_fingerprint:
+                    covered = index + 1
+                    break
+
+        if covered is None:
+            state = _Summary()
+            self._fold(state, history[:start])
+            self.summaries_built += 1
+        elif covered >= start:
+            # Nothing new dropped out of the window (messages the summary
+            # already covers are not repeated verbatim)
+            self.summaries_reused += 1
+            return state.text, covered
+        else:
+            # Extend a copy, so concurrent requests never see a half-folded summary
+            state = state.copy()
+            self._fold(state, history[covered:start])
+            self.summaries_extended += 1
+
+        if conversation_id is not None:
+            with self._lock:
+                self._summaries[conversation_id] = state
+                self._summaries.move_to_end(conversation_id)
+                while len(self._summaries) > self.max_conversations:
+                    self._summaries.popitem(last=False)
+        return state.text, start
+
+    def _fold(self, state: _Summary, new_messages: List[Dict]) -> None:
+        """Add messages to a summary and re-select its sentences"""
+        # A repeated sentence replaces its earlier copy
+        candidates = {sentence.lower(): (order, role, sentence) for order, role, sentence in state.sentences}
+        for message in new_messages:
+            role = ROLE_NAMES.get(message.get('role'), 'user')
+            for sentence in _SENTENCE_BREAK.split(message.get('message', '')):
+                sentence = sentence.strip()
+                words = [w for w in _WORD_PATTERN.findall(sentence.lower()) if w not in _STOPWORDS]
+                if not words:
+                    continue
+                state.word_counts.update(words)
+                candidates[sentence.lower()] = (state.next_order, role, sentence)
+                state.next_order += 1
+        state.last_fingerprint = message_fingerprint(new_messages[-1])
+        self.messages_folded += len(new_messages)
+
+        # Score sentences by how often their words come up in the conversation;
+        # numbers (GPA, scores, budgets) and the user's own words weigh more,
+        # and newer sentences win ties
+        def score(candidate: Tuple[int, str, str]) -> Tuple[float, int]:
+            words = [w for w in _WORD_PATTERN.findall(candidate[2].lower()) if w not in _STOPWORDS]
+            value = sum(state.word_counts[w] for w in words) / math.sqrt(len(words))
+            value += 2.0 * sum(w[0].isdigit() for w in words)
+            return value * (1.5 if candidate[1] == 'user' else 1.0), candidate[0]
+
+        budget = self.summary_tokens - self.tokens.count(SUMMARY_HEADER)
+        selected = []
+        for candidate in sorted(candidates.values(), key=score, reverse=True):
+            cost = self.tokens.count(candidate[2]) + 3
+            if cost <= budget:
+                selected.append(candidate)
+                budget -= cost
+
+        selected.sort()
+        state.sentences = selected
+        lines = [SUMMARY_HEADER]
+        lines.extend(f"- {'User' if role == 'user' else 'Assistant'}: {sentence}" for _, role, sentence in selected)
+        state.text = '\n'.join(lines) if selected else ''
+
+    def forget(self, conversation_id: str) -> None:
+        """Drop the cached summary of a conversation"""
+        with self._lock:
+            self._summaries.pop(conversation_id, None)
+
+    def stats(self) -> Dict:
+        """Get budget settings and summary counters"""
+        return {
+            'max_tokens': self.max_tokens,
+            'summary_tokens': self.summary_tokens,
+            'tokenizer': self.tokens.name,
+            'cached_summaries': len(self._summaries),
+            'summaries_built': self.summaries_built,
+            'summaries_extended': self.summaries_extended,
+            'summaries_reused': self.summaries_reused,
+            'messages_folded': self.messages_folded
+        }
+
+
+def create_context_builder(model: str = 'gpt-3.5-turbo') -> ContextBuilder:
+    """Create a context builder configured by the AI_CONTEXT_* environment variables"""
+    return ContextBuilder(
+        max_tokens=int(os.getenv('AI_CONTEXT_MAX_TOKENS', '2000')),
+        summary_tokens=int(os.getenv('AI_CONTEXT_SUMMARY_TOKENS', '300')),
+        model=model
+    )
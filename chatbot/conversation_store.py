@@ -0,0 +1,685 @@
+"""
+Conversation Storage
+
+This module provides the storage used for chat conversation history. The
+in-memory store bounds memory use with a per-conversation message cap, idle
+expiry and a global memory budget with least-recently-used eviction. The
+SQLite store keeps history on disk so it survives restarts and is shared by
+every worker on the machine.
+
+Configuration (environment variables):
+    CONVERSATION_STORE: Storage backend, 'memory' (default) or 'sqlite'
+    CONVERSATION_MAX_MESSAGES: Messages kept per conversation (default: 200)
+    CONVERSATION_TTL_SECONDS: Idle time before a conversation expires (default: 3600)
+    CONVERSATION_MEMORY_MB: Approximate memory budget for all conversations (default: 64)
+    CONVERSATION_DB: SQLite database path (default: conversations.db)
+    CONVERSATION_BATCH_SIZE: Maximum operations per SQLite commit (default: 256)
+    CONVERSATION_FLUSH_MS: How long the SQLite writer gathers a batch (default: 20)
+    CONVERSATION_MAX_PENDING: SQLite writes allowed to wait in the queue (default: 10000)
+
+Example usage:
+    from conversation_store import create_conversation_store
+
+    conversations = create_conversation_store()
+    conversations.append(conversation_id, 'user', "Hello")
+    history = conversations.get(conversation_id)
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from bisect import bisect_right, insort
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class ConversationStore:
+    """
+    Interface for conversation history storage backends
+    """
+
+    def append(self, conversation_id: str, role: str, message: str) -> None:
+        """Append a message to a conversation, creating it if needed"""
+        raise NotImplementedError
+
+    def get(self, conversation_id: str) -> List[Dict]:
+        """Get the messages of a conversation (empty list if unknown)"""
+        raise NotImplementedError
+
+    def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation; returns False if it did not exist"""
+        raise NotImplementedError
+
+    def ids(self) -> List[str]:
+        """Get the ids of all stored conversations"""
+        raise NotImplementedError
+
+    def page_ids(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[str], Optional[str]]:
+        """
+        Get one page of conversation ids in id order
+
+        Args:
+            cursor: Return ids after this one (None for the first page)
+            limit: Maximum number of ids
+
+        Returns:
+            Tuple[List[str], Optional[str]]: The ids and the cursor of the next
+            page (None on the last page)
+        """
+        raise NotImplementedError
+
+    def page_messages(self, conversation_id: str, cursor: Optional[int] = None,
+                      limit: int = 100) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Get one page of a conversation's messages, oldest first
+
+        Args:
+            conversation_id: Conversation to read
+            cursor: Return messages after this cursor (None for the first page)
+            limit: Maximum number of messages
+
+        Returns:
+            Tuple[List[Dict], Optional[int]]: The messages and the cursor of
+            the next page (None on the last page)
+        """
+        raise NotImplementedError
+
+    def iter_ids(self, page_size: int = 500) -> Iterator[str]:
+        """Iterate over every conversation id, one page at a time"""
+        cursor = None
+        while True:
+            ids, cursor = self.page_ids(cursor, page_size)
+            yield from ids
+            if cursor is None:
+                return
+
+    def iter_messages(self, conversation_id: str, page_size: int = 500) -> Iterator[Dict]:
+        """Iterate over a conversation's messages, one page at a time"""
+        cursor = None
+        while True:
+            messages, cursor = self.page_messages(conversation_id, cursor, page_size)
+            yield from messages
+            if cursor is None:
+                return
+
+    def stats(self) -> Dict:
+        """Get backend counters for monitoring"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, conversation_id: str) -> bool:
+        raise NotImplementedError
+
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    Bounded in-process conversation store
+
+    Conversations are kept in least-recently-used order. Idle conversations
+    expire after ``ttl_seconds``, each conversation keeps at most
+    ``max_messages`` messages, and the least recently used conversations are
+    evicted once the estimated size exceeds ``max_bytes``.
+    """
+
+    # Rough per-message cost of the dict, timestamp and role strings
+    MESSAGE_OVERHEAD = 320
+
+    def __init__(self, max_messages: int = 200, ttl_seconds: float = 3600, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the store
+
+        Args:
+            max_messages: Messages kept per conversation (oldest are dropped)
+            ttl_seconds: Idle time after which a conversation expires
+            max_bytes: Approximate memory budget for all conversations
+        """
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._conversations: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._sorted_ids: List[str] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.counters = {
+            'messages_appended': 0,
+            'messages_trimmed': 0,
+            'conversations_expired': 0,
+            'conversations_evicted': 0
+        }
+
+    @classmethod
+    def _message_size(cls, message: Dict) -> int:
+        """Estimate the memory held by a stored message"""
+        return len(message['message']) + cls.MESSAGE_OVERHEAD
+
+    def _expire(self, now: float) -> None:
+        """Drop conversations idle for longer than the TTL (caller holds the lock)"""
+        if self.ttl_seconds is None:
+            return
+        deadline = now - self.ttl_seconds
+        while self._conversations:
+            conversation_id, entry = next(iter(self._conversations.items()))
+            if entry['last_access'] >= deadline:
+                break
+            self._drop(conversation_id)
+            self.counters['conversations_expired'] += 1
+
+    def _drop(self, conversation_id: str) -> None:
+        """Remove a conversation and release its bytes (caller holds the lock)"""
+        entry = self._conversations.pop(conversation_id)
+        self._bytes -= entry['bytes']
+        index = bisect_right(self._sorted_ids, conversation_id) - 1
+        if index >= 0 and self._sorted_ids[index] == conversation_id:
+            del self._sorted_ids[index]
+
+    def append(self, conversation_id: str, role: str, message: str) -> None:
+        """Append a message to a conversation, creating it if needed"""
+        record = {
+            'role': role,
+            'message': message,
+            'timestamp': datetime.now().isoformat()
+        }
+        size = self._message_size(record)
+        now = time.monotonic()
+
+        with self._lock:
+            self._expire(now)
+
+            entry = self._conversations.get(conversation_id)
+            if entry is None:
+                # first_seq is the position of the oldest kept message, so
+                # message cursors stay valid while old messages are trimmed
+                entry = {'messages': deque(), 'first_seq': 0, 'bytes': 0, 'last_access': now}
+                self._conversations[conversation_id] = entry
+                insort(self._sorted_ids, conversation_id)
+            else:
+                self._conversations.move_to_end(conversation_id)
+
+            entry['messages'].append(record)
+            entry['bytes'] += size
+            entry['last_access'] = now
+            self._bytes += size
+            self.counters['messages_appended'] += 1
+
+            while len(entry['messages']) > self.max_messages:
+                dropped = self._message_size(entry['messages'].popleft())
+                entry['first_seq'] += 1
+                entry['bytes'] -= dropped
+                self._bytes -= dropped
+                self.counters['messages_trimmed'] += 1
+
+            while self._bytes > self.max_bytes and len(self._conversations) > 1:
+                oldest = next(iter(self._conversations))
+                if oldest == conversation_id:
+                    break
+                self._drop(oldest)
+                self.counters['conversations_evicted'] += 1
+
+    def get(self, conversation_id: str) -> List[Dict]:
+        """Get the messages of a conversation (empty list if unknown)"""
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._conversations.get(conversation_id)
+            if entry is None:
+                return []
+            self._conversations.move_to_end(conversation_id)
+            entry['last_access'] = time.monotonic()
+            return list(entry['messages'])
+
+    def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation; returns False if it did not exist"""
+        with self._lock:
+            if conversation_id not in self._conversations:
+                return False
+            self._drop(conversation_id)
+            return True
+
+    def ids(self) -> List[str]:
+        """Get the ids of all stored conversations"""
+        with self._lock:
+            self._expire(time.monotonic())
+            return list(self._sorted_ids)
+
+    def page_ids(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[str], Optional[str]]:
+        """Get one page of conversation ids in id order (see ConversationStore.page_ids)"""
+        with self._lock:
+            self._expire(time.monotonic())
+            start = bisect_right(self._sorted_ids, cursor) if cursor is not None else 0
+            ids = self._sorted_ids[start:start + limit]
+            more = start + limit < len(self._sorted_ids)
+        return ids, (ids[-1] if more and ids else None)
+
+    def page_messages(self, conversation_id: str, cursor: Optional[int] = None,
+                      limit: int = 100) -> Tuple[List[Dict], Optional[int]]:
+        """Get one page of a conversation's messages (see ConversationStore.page_messages)"""
+        with self._lock:
+            entry = self._conversations.get(conversation_id)
+            if entry is None:
+                return [], None
+            start = max((cursor + 1 if cursor is not None else 0) - entry['first_seq'], 0)
+            messages = list(islice(entry['messages'], start, start + limit))
+            more = start + limit < len(entry['messages'])
+            next_cursor = entry['first_seq'] + start + len(messages) - 1
+        return messages, (next_cursor if more else None)
+
+    def stats(self) -> Dict:
+        """Get backend counters for monitoring"""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'conversations': len(self._conversations),
+                'approx_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'max_messages': self.max_messages,
+                'ttl_seconds': self.ttl_seconds,
+                **self.counters
+            }
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return conversation_id in self._conversations
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    Durable conversation store backed by SQLite in WAL mode
+
+    Appends and deletes are queued and applied by a background writer thread
+    that commits them in groups, so request threads never wait on disk I/O:
+    the queue lock is never held while the database is read or committed.
+    Reads take a snapshot of the committed rows and merge the operations still
+    waiting in the queue, so a conversation always reflects its own latest
+    messages. If the database keeps failing, a batch is dropped after
+    MAX_WRITE_ATTEMPTS tries, and the queue is capped at max_pending
+    operations; dropped operations are counted in stats().
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            message_count INTEGER NOT NULL DEFAULT 0
+        )""",
+        """CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            conversation_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            message TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (conversation_id, id)",
+        """CREATE TABLE IF NOT EXISTS writers (
+            id TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL
+        )"""
+    ]
+
+    # Statements are kept as constants so sqlite3's statement cache reuses
+    # the prepared form on every call
+    SQL_UPSERT_CONVERSATION = (
+        "INSERT INTO conversations (id, created_at, updated_at, message_count) VALUES (?, ?, ?, 1) "
+        "ON CONFLICT(id) DO UPDATE SET updated_at = excluded.updated_at, message_count = message_count + 1"
+    )
+    SQL_INSERT_MESSAGE = "INSERT INTO messages (conversation_id, role, message, timestamp) VALUES (?, ?, ?, ?)"
+    SQL_DELETE_MESSAGES = "DELETE FROM messages WHERE conversation_id = ?"
+    SQL_DELETE_CONVERSATION = "DELETE FROM conversations WHERE id = ?"
+    SQL_SELECT_MESSAGES = "SELECT role, message, timestamp FROM messages WHERE conversation_id = ? ORDER BY id"
+    SQL_CONVERSATION_EXISTS = "SELECT 1 FROM conversations WHERE id = ?"
+    SQL_SELECT_IDS = "SELECT id FROM conversations ORDER BY id"
+    SQL_PAGE_IDS = "SELECT id FROM conversations WHERE id > ? ORDER BY id LIMIT ?"
+    SQL_PAGE_MESSAGES = (
+        "SELECT id, role, message, timestamp FROM messages "
+        "WHERE conversation_id = ? AND id > ? ORDER BY id LIMIT ?"
+    )
+    SQL_COUNT_CONVERSATIONS = "SELECT COUNT(*) FROM conversations"
+    SQL_UPSERT_WRITER = (
+        "INSERT INTO writers (id, last_seq) VALUES (?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET last_seq = excluded.last_seq"
+    )
+    SQL_WRITER_SEQ = "SELECT last_seq FROM writers WHERE id = ?"
+
+    # Failed commits of the same batch before it is dropped
+    MAX_WRITE_ATTEMPTS = 5
+
+    def __init__(self, path: str = 'conversations.db', batch_size: int = 256, flush_interval: float = 0.02,
+                 max_pending: int = 10000):
+        """
+        Initialize the store
+
+        Args:
+            path: SQLite database file
+            batch_size: Maximum queued operations committed in one transaction
+            flush_interval: Seconds the writer waits to gather a batch
+            max_pending: Maximum queued operations; more are dropped (and counted)
+                while the database cannot keep up
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        # Queued operations: ('append', conversation id, record, seq) or
+        # ('delete', conversation id, seq). The seq of the last committed
+        # operation is stored in the same transaction (per process, in the
+        # writers table), so a reader knows which queued operations its
+        # snapshot of the database already includes.
+        self._pending: List[tuple] = []
+        self._next_seq = 1
+        self._instance = uuid.uuid4().hex
+        self._failed_attempts = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._local = threading.local()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+
+        self.counters = {
+            'messages_appended': 0,
+            'batches_committed': 0,
+            'operations_committed': 0,
+            'operations_dropped': 0,
+            'write_errors': 0
+        }
+
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        for statement in self.SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+
+        atexit.register(self.flush)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, reconnecting after a fork"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _writer_id(self) -> str:
+        """Identify this process's writer in the writers table"""
+        return f"{self._instance}-{os.getpid()}"
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread (again, in a forked worker) if needed (caller holds the lock)"""
+        if self._writer is not None and self._writer_pid == os.getpid() and self._writer.is_alive():
+            return
+        self._writer_pid = os.getpid()
+        self._writer = threading.Thread(target=self._write_loop, name='conversation-writer', daemon=True)
+        self._writer.start()
+
+    def _enqueue(self, *operation) -> bool:
+        """Queue an operation for the writer thread; returns False if the queue is full"""
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.counters['operations_dropped'] += 1
+                return False
+            self._ensure_writer()
+            self._pending.append(operation + (self._next_seq,))
+            self._next_seq += 1
+            self._wakeup.notify()
+        return True
+
+    def _write_loop(self) -> None:
+        """Group-commit queued operations until the process exits"""
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+            # Let concurrent requests join this batch
+            time.sleep(self.flush_interval)
+            self._write_batch()
+
+    def _write_batch(self) -> int:
+        """Commit up to batch_size queued operations; returns the number written"""
+        with self._write_lock:
+            return self._write_batch_locked()
+
+    def _write_batch_locked(self) -> int:
+        """Commit the next batch (caller holds the write lock, not the queue lock)"""
+        with self._lock:
+            batch = self._pending[:self.batch_size]
+        if not batch:
+            return 0
+
+        connection = self._connect()
+        try:
+            for operation in batch:
+                if operation[0] == 'append':
+                    _, conversation_id, record, _ = operation
+                    connection.execute(self.SQL_UPSERT_CONVERSATION,
+                                       (conversation_id, record['timestamp'], record['timestamp']))
+                    connection.execute(self.SQL_INSERT_MESSAGE,
+                                       (conversation_id, record['role'], record['message'], record['timestamp']))
+                else:
+                    connection.execute(self.SQL_DELETE_MESSAGES, (operation[1],))
+                    connection.execute(self.SQL_DELETE_CONVERSATION, (operation[1],))
+            connection.execute(self.SQL_UPSERT_WRITER, (self._writer_id(), batch[-1][-1]))
+            # Requests keep queueing (and reading) while the commit waits on the disk
+            connection.commit()
+        except sqlite3.Error as e:
+            connection.rollback()
+            self.counters['write_errors'] += 1
+            self._failed_attempts += 1
+            if self._failed_attempts < self.MAX_WRITE_ATTEMPTS:
+                print(f"Error writing conversations (will retry): {e}")
+                time.sleep(0.5)
+                return 0
+            print(f"Error writing conversations, dropping {len(batch)} operations: {e}")
+            self.counters['operations_dropped'] += len(batch)
+        else:
+            self.counters['batches_committed'] += 1
+            self.counters['operations_committed'] += len(batch)
+
+        self._failed_attempts = 0
+        with self._lock:
+            # Only the writer removes operations, so the batch is still at the front
+            del self._pending[:len(batch)]
+        return len(batch)
+
+    def flush(self) -> None:
+        """Write every queued operation now (used at shutdown)"""
+        while self._pending:
+            if not self._write_batch():
+                break
+
+    def _snapshot(self, read: Callable[[sqlite3.Connection, List[tuple]], Any]) -> Tuple[Any, List[tuple]]:
+        """
+        Read the database without holding the queue lock
+
+        Args:
+            read: Called with a connection in a read transaction and the
+                operations queued when the read started
+
+        Returns:
+            Tuple[Any, List[tuple]]: The result of read and the queued
+            operations that the snapshot it read does not include yet
+        """
+        with self._lock:
+            pending = list(self._pending)
+        connection = self._connect()
+        connection.execute("BEGIN")
+        try:
+            row = connection.execute(self.SQL_WRITER_SEQ, (self._writer_id(),)).fetchone()
+            result = read(connection, pending)
+        finally:
+            connection.rollback()
+        last_seq = row[0] if row else 0
+        return result, [operation for operation in pending if operation[-1] > last_seq]
+
+    def append(self, conversation_id: str, role: str, message: str) -> None:
+        """Append a message to a conversation, creating it if needed"""
+        record = {
+            'role': role,
+            'message': message,
+            'timestamp': datetime.now().isoformat()
+        }
+        if self._enqueue('append', conversation_id, record):
+            self.counters['messages_appended'] += 1
+        else:
+            print(f"Conversation write queue full, dropping message for {conversation_id}")
+
+    @staticmethod
+    def _apply_pending(messages: List[Dict], conversation_id: str, pending: List[tuple]) -> List[Dict]:
+        """Apply queued operations of one conversation to its committed messages"""
+        for operation in pending:
+            if operation[1] != conversation_id:
+                continue
+            if operation[0] == 'append':
+                messages.append(operation[2])
+            else:
+                messages = []
+        return messages
+
+    def get(self, conversation_id: str) -> List[Dict]:
+        """Get the messages of a conversation (empty list if unknown)"""
+        messages, pending = self._snapshot(lambda connection, _: [
+            {'role': role, 'message': message, 'timestamp': timestamp}
+            for role, message, timestamp in connection.execute(self.SQL_SELECT_MESSAGES, (conversation_id,))
+        ])
+        return self._apply_pending(messages, conversation_id, pending)
+
+    def _exists(self, conversation_id: str) -> bool:
+        """Check whether a conversation exists, including queued operations"""
+        exists, pending = self._snapshot(lambda connection, _: connection.execute(
+            self.SQL_CONVERSATION_EXISTS, (conversation_id,)).fetchone() is not None)
+        for operation in pending:
+            if operation[1] == conversation_id:
+                exists = operation[0] == 'append'
+        return exists
+
+    def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation; returns False if it did not exist"""
+        if not self._exists(conversation_id):
+            return False
+        return self._enqueue('delete', conversation_id)
+
+    @staticmethod
+    def _pending_changes(pending: List[tuple]) -> Dict[str, bool]:
+        """Map conversation ids touched by queued operations to whether they will exist"""
+        changes: Dict[str, bool] = {}
+        for operation in pending:
+            changes[operation[1]] = operation[0] == 'append'
+        return changes
+
+    def ids(self) -> List[str]:
+        """Get the ids of all stored conversations"""
+        ids, pending = self._snapshot(lambda connection, _: [row[0] for row in connection.execute(self.SQL_SELECT_IDS)])
+        changes = self._pending_changes(pending)
+        if changes:
+            ids = sorted((set(ids) | {i for i, exists in changes.items() if exists})
+                         - {i for i, exists in changes.items() if not exists})
+        return ids
+
+    def page_ids(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[str], Optional[str]]:
+        """Get one page of conversation ids in id order (see ConversationStore.page_ids)"""
+        # Read enough committed ids to fill the page even if queued deletes remove some
+        def read(connection, queued):
+            extra = sum(1 for operation in queued if operation[0] == 'delete')
+            return [row[0] for row in connection.execute(self.SQL_PAGE_IDS, (cursor or '', limit + 1 + extra))]
+
+        ids, pending = self._snapshot(read)
+        changes = self._pending_changes(pending)
+        if changes:
+            ids = sorted((set(ids) | {i for i, exists in changes.items() if exists and i > (cursor or '')})
+                         - {i for i, exists in changes.items() if not exists})
+        page = ids[:limit]
+        return page, (page[-1] if len(ids) > limit else None)
+
+    def page_messages(self, conversation_id: str, cursor: Optional[int] = None,
+                      limit: int = 100) -> Tuple[List[Dict], Optional[int]]:
+        """Get one page of a conversation's messages (see ConversationStore.page_messages)"""
+        rows, pending = self._snapshot(lambda connection, _: connection.execute(
+            self.SQL_PAGE_MESSAGES, (conversation_id, cursor or 0, limit + 1)).fetchall())
+        queued = [operation for operation in pending if operation[1] == conversation_id]
+        if any(operation[0] == 'delete' for operation in queued):
+            # The committed rows are about to be deleted
+            return self._apply_pending([], conversation_id, queued), None
+
+        messages = [
+            {'role': role, 'message': message, 'timestamp': timestamp}
+            for _, role, message, timestamp in rows[:limit]
+        ]
+        if len(rows) > limit:
+            return messages, rows[limit - 1][0]
+
+        # Last committed page: add the messages still queued. They have no row
+        # id yet, so if they do not fit the page ends at the committed rows and
+        # the next page (read once they are committed) starts after them.
+        messages.extend(operation[2] for operation in queued)
+        if len(messages) > limit and rows:
+            return messages[:len(rows)], rows[-1][0]
+        return messages, None
+
+    def stats(self) -> Dict:
+        """Get backend counters for monitoring"""
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'conversations': len(self),
+            'pending_operations': len(self._pending),
+            'max_pending': self.max_pending,
+            **self.counters
+        }
+
+    def __len__(self) -> int:
+        def read(connection, queued):
+            count = connection.execute(self.SQL_COUNT_CONVERSATIONS).fetchone()[0]
+            stored = {
+                conversation_id: connection.execute(self.SQL_CONVERSATION_EXISTS, (conversation_id,)).fetchone() is not None
+                for conversation_id in self._pending_changes(queued)
+            }
+            return count, stored
+
+        (count, stored), pending = self._snapshot(read)
+        for conversation_id, exists in self._pending_changes(pending).items():
+            count += int(exists) - int(stored[conversation_id])
+        return count
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return self._exists(conversation_id)
+
+def create_conversation_store(backend: Optional[str] = None) -> ConversationStore:
+    """
+    Create the conversation store configured by environment variables
+
+    Args:
+        backend: Backend name overriding CONVERSATION_STORE (optional)
+
+    Returns:
+        ConversationStore: The configured store
+    """
+    backend = (backend or os.getenv('CONVERSATION_STORE', 'memory')).lower()
+
+    if backend == 'memory':
+        return InMemoryConversationStore(
+            max_messages=int(os.getenv('CONVERSATION_MAX_MESSAGES', '200')),
+            ttl_seconds=float(os.getenv('CONVERSATION_TTL_SECONDS', '3600')),
+            max_bytes=int(float(os.getenv('CONVERSATION_MEMORY_MB', '64')) * 1024 * 1024)
+        )
+
+    if backend == 'sqlite':
+        return SQLiteConversationStore(
+            path=os.getenv('CONVERSATION_DB', 'conversations.db'),
+            batch_size=int(os.getenv('CONVERSATION_BATCH_SIZE', '256')),
+            flush_interval=float(os.getenv('CONVERSATION_FLUSH_MS', '20')) / 1000,
+            max_pending=int(os.getenv('CONVERSATION_MAX_PENDING', '10000'))
+        )
+
+    raise ValueError(f"Unknown conversation store backend: {backend}")
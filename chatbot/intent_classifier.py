@@ -0,0 +1,81 @@
+"""
+Compiled Intent Classifier
+
+This module turns the chatbot's ordered keyword lists into a single compiled
+regular expression so that a message can be classified in one pass instead of
+running one substring scan per intent.
+
+Example usage:
+    from intent_classifier import IntentClassifier
+
+    classifier = IntentClassifier([
+        ('greetings', ['hi', 'hello']),
+        ('goodbye', ['bye', 'see you']),
+    ])
+    intent = classifier.classify("hello there")  # -> 'greetings'
+"""
+
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+class IntentClassifier:
+    """
+    Single-pass keyword intent classifier
+
+    Intents are given in priority order. A message is assigned the first
+    intent (by priority, not by position in the message) that has any of its
+    keywords occurring as a substring of the lowercased message, which is
+    exactly what a cascade of ``any(word in message for word in [...])``
+    checks does.
+    """
+
+    def __init__(self, intents: Sequence[Tuple[str, Iterable[str]]]):
+        """
+        Compile the classifier
+
+        Args:
+            intents: Ordered (intent name, keywords) pairs, highest priority first
+        """
+        self.intents: List[str] = []
+        alternatives = []
+
+        for name, keywords in intents:
+            keywords = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+            group = f"i{len(self.intents)}"
+            self.intents.append(name)
+            if not keywords:
+                # Matched by the caller (see ``classify``), e.g. from parsed entities
+                continue
+            alternatives.append(f"(?P<{group}>{'|'.join(re.escape(k) for k in keywords)})")
+
+        # A zero-width lookahead is tried at every position, so overlapping
+        # keywords are all seen. At a given position the alternation reports
+        # the highest-priority intent that matches there.
+        self._pattern = re.compile(f"(?=(?:{'|'.join(alternatives)}))") if alternatives else None
+
+    def classify(self, message: str, matched: Iterable[str] = ()) -> Optional[str]:
+        """
+        Classify a message
+
+        Args:
+            message: The user's message (case-insensitive)
+            matched: Intents the caller already knows to match; they compete
+                     on priority with the keyword matches
+
+        Returns:
+            Name of the highest-priority matching intent, or None
+        """
+        known = [self.intents.index(name) for name in matched if name in self.intents]
+        best = min(known) if known else None
+        if self._pattern is None or best == 0:
+            return self.intents[best] if best is not None else None
+
+        for match in self._pattern.finditer(message.lower()):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+
+        return self.intents[best] if best is not None else None
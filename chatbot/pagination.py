@@ -0,0 +1,59 @@
+"""
+Pagination and Streaming Helpers
+
+Helpers shared by the Flask apps for endpoints that return long lists. A
+request either gets one bounded page (the cursor for the next page is sent in
+the X-Next-Cursor header) or, with ?format=ndjson, a newline-delimited JSON
+stream produced from a generator so the full list is never built in memory.
+
+Query parameters:
+    limit: Page size (default: 100, max: 1000)
+    cursor: Value of X-Next-Cursor from the previous page
+    format: 'ndjson' to stream every item instead of returning one page
+"""
+
+import json
+from typing import Iterable, List, Mapping, Optional
+
+from flask import Response, jsonify, request, stream_with_context
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def page_size_from(args: Mapping[str, str]) -> int:
+    """Get the page size from query parameters, clamped to [1, MAX_PAGE_SIZE]"""
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def stream_requested(args: Mapping[str, str]) -> bool:
+    """Check whether query parameters ask for an NDJSON stream"""
+    return args.get('format', '').lower() == 'ndjson'
+
+
+def get_page_size() -> int:
+    """Get the requested page size, clamped to [1, MAX_PAGE_SIZE]"""
+    return page_size_from(request.args)
+
+
+def wants_stream() -> bool:
+    """Check whether the client asked for an NDJSON stream"""
+    return stream_requested(request.args)
+
+
+def page_response(items: List, next_cursor: Optional[object]) -> Response:
+    """Build a JSON list response, advertising the next page cursor if there is one"""
+    response = jsonify(items)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+    return response
+
+
+def ndjson_response(items: Iterable) -> Response:
+    """Stream items as newline-delimited JSON"""
+    lines = (json.dumps(item) + '\n' for item in items)
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
@@ -0,0 +1,205 @@
+"""
+College Recommender
+
+This module ranks colleges for a student profile (GPA, SAT/ACT, budget,
+preferred locations, programs). Every college gets a match score combining:
+
+- admission fit: the admission calculator score (same weights as
+  college_data.get_admission_calculator), so colleges where the student is
+  competitive rank higher
+- ranking: the college's ranking, scaled so #1 scores highest
+- cost: full marks within budget, falling linearly to zero at twice the budget
+- location and programs: share of the preferred locations/programs matched
+
+The per-college features are precomputed as NumPy arrays from the columnar
+snapshot, scoring is a handful of vector operations, and only the top K
+are selected and sorted.
+
+Example usage:
+    from recommender import recommend_colleges
+
+    matches = recommend_colleges(gpa=3.8, sat=1450, budget=60000,
+                                 locations=['california'], programs=['computer science'])
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from admission_batch import CHANCE_BANDS, chance_band_indexes, score_matrix
+from college_columns import CollegeColumns, get_college_columns
+from college_data import PROGRAM_INDEX
+
+# Contribution of each feature to the match score (sums to 1)
+RECOMMENDATION_WEIGHTS = {
+    'admission': 0.4,
+    'ranking': 0.2,
+    'cost': 0.2,
+    'location': 0.1,
+    'programs': 0.1
+}
+
+DEFAULT_RECOMMENDATIONS = 5
+MAX_RECOMMENDATIONS = 100
+
+
+class CollegeRecommender:
+    """
+    Top-K college recommendations over one columnar snapshot
+    """
+
+    def __init__(self, columns: CollegeColumns, program_cache_size: int = 256):
+        """
+        Precompute the feature arrays
+
+        Args:
+            columns: Columnar snapshot of the catalog
+            program_cache_size: Number of program row sets kept in memory
+        """
+        self.columns = columns
+        self.version = columns.version
+
+        # Ranking scaled to [0, 1] with the top-ranked college at 1
+        ranking = columns.ranking
+        if len(ranking) and not np.all(np.isnan(ranking)):
+            best, worst = np.nanmin(ranking), np.nanmax(ranking)
+            spread = worst - best if worst > best else 1.0
+            self.ranking_score = np.nan_to_num(1.0 - (ranking - best) / spread, nan=0.0)
+        else:
+            self.ranking_score = np.zeros(len(ranking))
+
+        # Yearly cost of attendance (tuition plus room and board when known)
+        self.cost = columns.tuition + np.nan_to_num(columns.room_board, nan=0.0)
+
+        # Requirements with non-positive values treated as unknown
+        self.gpa_required = np.where(columns.gpa > 0, columns.gpa, np.nan)
+        self.sat_required = np.where(columns.sat > 0, columns.sat, np.nan)
+        self.act_required = np.where(columns.act > 0, columns.act, np.nan)
+
+        self.program_cache_size = program_cache_size
+        self._program_rows: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _rows_offering(self, program: str) -> np.ndarray:
+        """Rows of the colleges offering a program (cached per program)"""
+        program = program.lower()
+        with self._lock:
+            rows = self._program_rows.get(program)
+            if rows is not None:
+                self._program_rows.move_to_end(program)
+                return rows
+
+        rows = np.array([self.columns.rows[key] for key in PROGRAM_INDEX.search(program)
+                         if key in self.columns.rows], dtype=np.int64)
+
+        with self._lock:
+            self._program_rows[program] = rows
+            while len(self._program_rows) > self.program_cache_size:
+                self._program_rows.popitem(last=False)
+        return rows
+
+    def admission_scores(self, gpa: Optional[float], sat: Optional[float], act: Optional[float]) -> np.ndarray:
+        """Admission calculator score of the student at every college (NaN where not computable)"""
+        if not gpa:
+            return np.full(len(self.columns), np.nan)
+        return score_matrix(
+            np.array([float(gpa)]), np.array([float(sat or 0)]), np.array([float(act or 0)]),
+            self.gpa_required, self.sat_required, self.act_required
+        )[0]
+
+    def recommend(self, gpa: Optional[float] = None, sat: Optional[float] = None, act: Optional[float] = None,
+                  budget: Optional[float] = None, locations: Sequence[str] = (),
+                  programs: Sequence[str] = (), limit: int = DEFAULT_RECOMMENDATIONS) -> List[Dict]:
+        """
+        Get the best matching colleges for a student profile
+
+        Args:
+            gpa, sat, act: Student stats (optional)
+            budget: Yearly budget in dollars (optional)
+            locations: Preferred cities or states (matched against college locations)
+            programs: Programs the student wants to study
+            limit: Number of colleges to return
+
+        Returns:
+            List[Dict]: Colleges with their match score, best match first
+        """
+        count = len(self.columns)
+        if count == 0 or limit <= 0:
+            return []
+
+        weights = RECOMMENDATION_WEIGHTS
+        score = weights['ranking'] * self.ranking_score
+
+        admission = self.admission_scores(gpa, sat, act)
+        score += weights['admission'] * np.nan_to_num(admission / 100.0, nan=0.0)
+
+        if budget:
+            with np.errstate(invalid='ignore'):
+                affordability = np.clip(1.0 - (self.cost - budget) / budget, 0.0, 1.0)
+            # Unknown cost counts as half a match
+            score += weights['cost'] * np.nan_to_num(affordability, nan=0.5)
+
+        if locations:
+            matched = np.zeros(count)
+            for location in locations:
+                matched += self.columns.location.contains(location)
+            score += weights['location'] * np.minimum(matched, 1.0)
+
+        if programs:
+            offered = np.zeros(count)
+            for program in programs:
+                offered[self._rows_offering(program)] += 1.0
+            score += weights['programs'] * offered / len(programs)
+
+        # Partial selection: O(n) to find the top K, then sort only those K
+        # (best score first, better ranking breaks ties)
+        k = min(limit, count)
+        top = np.argpartition(-score, k - 1)[:k] if k < count else np.arange(count)
+        top = top[np.lexsort((self.columns.ranking[top], -score[top]))]
+
+        bands = chance_band_indexes(admission[top])
+        recommendations = []
+        for position, row in enumerate(top):
+            college = self.columns.college(row)
+            entry = {
+                'key': self.columns.keys[row],
+                'name': college['name'],
+                'location': college.get('location'),
+                'ranking': college.get('ranking'),
+                'acceptance_rate': college.get('acceptance_rate'),
+                'match_score': round(float(score[row]) * 100, 1),
+                'cost': None if np.isnan(self.cost[row]) else int(self.cost[row]),
+                'admission_score': None,
+                'chance': None
+            }
+            if not np.isnan(admission[row]):
+                entry['admission_score'] = round(float(admission[row]), 1)
+                entry['chance'] = CHANCE_BANDS[bands[position]][0]
+            recommendations.append(entry)
+        return recommendations
+
+
+_recommender: Optional[CollegeRecommender] = None
+_recommender_lock = threading.Lock()
+
+
+def get_recommender() -> CollegeRecommender:
+    """Get the recommender for the current catalog, rebuilding it if the catalog changed"""
+    global _recommender
+
+    columns = get_college_columns()
+    recommender = _recommender
+    if recommender is not None and recommender.version == columns.version:
+        return recommender
+
+    with _recommender_lock:
+        if _recommender is None or _recommender.version != columns.version:
+            _recommender = CollegeRecommender(columns)
+        return _recommender
+
+
+def recommend_colleges(**profile) -> List[Dict]:
+    """Recommend colleges for a student profile (see CollegeRecommender.recommend)"""
+    return get_recommender().recommend(**profile)
@@ -0,0 +1,20 @@
+"""
+Shared test setup
+
+The chatbot modules are imported from the chatbot directory as the apps
+import each other. Runtime files (the catalog journal) go to a temporary
+directory, so the tests never touch the checked-in data.
+"""
+
+import os
+import sys
+import tempfile
+
+CHATBOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CHATBOT_DIR not in sys.path:
+    sys.path.insert(0, CHATBOT_DIR)
+
+os.environ['COLLEGE_DATA_DIR'] = tempfile.mkdtemp(prefix='chatbot-tests-')
+os.environ.pop('COLLEGE_CATALOG', None)
+os.environ['CONVERSATION_STORE'] = 'memory'
+os.environ['USE_AI'] = 'false'
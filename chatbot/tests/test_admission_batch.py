@@ -0,0 +1,51 @@
+"""Tests for the batch admission calculator (/admission/calculator/batch)"""
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+def post_batch(client, body):
+    return client.post('/admission/calculator/batch', json=body)
+
+
+def test_batch_scores_every_student_and_college(client):
+    response = post_batch(client, {'students': [{'id': 'a', 'gpa': 3.9, 'sat': 1500}, {'id': 'b', 'gpa': 3.2}],
+                                   'colleges': ['Harvard', 'MIT', 'Nowhere State']})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [result['student'] for result in body['results']] == ['a', 'b']
+    assert [college['key'] for college in body['results'][0]['colleges']] == ['harvard', 'mit']
+    assert body['unknown_colleges'] == ['Nowhere State']
+
+
+@pytest.mark.parametrize('student, error', [
+    ({'gpa': True}, 'Student 0: GPA is required'),
+    ({'gpa': 3.5, 'sat': True}, 'Student 0: SAT must be a number'),
+    ({'gpa': 3.5, 'act': False}, 'Student 0: ACT must be a number'),
+    ({'gpa': '3.5'}, 'Student 0: GPA is required'),
+    ({'gpa': 3.5, 'sat': '1400'}, 'Student 0: SAT must be a number'),
+    ({}, 'Student 0: GPA is required'),
+])
+def test_batch_rejects_invalid_scores(client, student, error):
+    response = post_batch(client, {'students': [student]})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+
+def test_batch_rejects_malformed_bodies(client):
+    assert post_batch(client, {'students': []}).status_code == 400
+    assert post_batch(client, {'students': [{'gpa': 3.5}], 'colleges': 'Harvard'}).status_code == 400
+
+
+def test_batch_limits_student_college_pairs(client, monkeypatch):
+    monkeypatch.setattr(app, 'MAX_BATCH_PAIRS', 3)
+    response = post_batch(client, {'students': [{'gpa': 3.5}, {'gpa': 3.6}], 'colleges': ['Harvard', 'MIT']})
+    assert response.status_code == 400
+    assert 'At most 3' in response.get_json()['error']
@@ -0,0 +1,119 @@
+"""Tests for the async chat completions client (ai_client.AsyncChatClient) against the mock server"""
+
+import asyncio
+import socket
+import threading
+
+import pytest
+
+import ai_client
+from ai_client import AIBackendError, AsyncChatClient
+from mock_completion_server import CompletionHandler, create_server
+
+pytestmark = pytest.mark.skipif(not ai_client.AIOHTTP_AVAILABLE, reason='aiohttp is not installed')
+
+MESSAGES = [{'role': 'system', 'content': 'Be brief'}, {'role': 'user', 'content': 'hello there'}]
+REPLY = '(mock) You said: hello there'
+
+
+@pytest.fixture
+def server():
+    def start(delay=0.0, failure_rate=0.0):
+        server = create_server(port=0, delay=delay, failure_rate=failure_rate)
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_port}/v1'
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    CompletionHandler.delay = CompletionHandler.failure_rate = 0.0
+
+
+@pytest.fixture
+def client():
+    clients = []
+
+    def make(base_url, **options):
+        clients.append(AsyncChatClient('test', base_url=base_url, **options))
+        return clients[-1]
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_complete_sync(server, client):
+    chat = client(server())
+    assert chat.complete_sync(MESSAGES, 'mock') == REPLY
+    stats = chat.stats()
+    assert stats['completed'] == 1 and stats['failed'] == 0 and stats['in_flight'] == 0
+
+
+def test_complete_async_from_another_loop(server, client):
+    chat = client(server())
+
+    async def ask():
+        return await asyncio.gather(*(chat.complete_async([{'role': 'user', 'content': f'q{i}'}], 'mock')
+                                      for i in range(5)))
+
+    assert asyncio.run(ask()) == [f'(mock) You said: q{i}' for i in range(5)]
+
+
+def test_stream_sync_yields_pieces(server, client):
+    pieces = list(client(server()).stream_sync(MESSAGES, 'mock'))
+    assert len(pieces) > 1
+    assert ''.join(pieces) == REPLY
+
+
+def test_stream_async_yields_pieces(server, client):
+    chat = client(server())
+
+    async def collect():
+        return [piece async for piece in chat.stream_async(MESSAGES, 'mock')]
+
+    assert ''.join(asyncio.run(collect())) == REPLY
+
+
+def test_http_error_is_a_backend_error(server, client):
+    chat = client(server(failure_rate=1.0))
+    with pytest.raises(AIBackendError, match='HTTP 500'):
+        chat.complete_sync(MESSAGES, 'mock')
+    with pytest.raises(AIBackendError, match='HTTP 500'):
+        list(chat.stream_sync(MESSAGES, 'mock'))
+    assert chat.stats()['failed'] == 2
+
+
+def test_unknown_endpoint_is_a_backend_error(server, client):
+    chat = client(server().replace('/v1', '/nowhere/v1'))
+    with pytest.raises(AIBackendError, match='HTTP 404'):
+        chat.complete_sync(MESSAGES, 'mock')
+
+
+def test_slow_answer_times_out(server, client):
+    chat = client(server(delay=1.0), timeout=0.1)
+    with pytest.raises(AIBackendError, match='did not answer within'):
+        chat.complete_sync(MESSAGES, 'mock')
+    assert chat.stats()['timeouts'] == 1
+
+
+def test_unreachable_api_is_a_backend_error(client):
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    chat = client(f'http://127.0.0.1:{port}/v1', timeout=2)
+    with pytest.raises(AIBackendError, match='request failed'):
+        chat.complete_sync(MESSAGES, 'mock')
+
+
+def test_configuration_from_environment(monkeypatch):
+    monkeypatch.setenv('OPENAI_BASE_URL', 'http://example.invalid/v1/')
+    monkeypatch.setenv('AI_TIMEOUT_SECONDS', '3')
+    monkeypatch.setenv('AI_MAX_CONCURRENCY', '4')
+    chat = AsyncChatClient('test')
+
+    assert chat.base_url == 'http://example.invalid/v1'
+    assert chat.stats()['timeout_seconds'] == 3.0
+    assert chat.stats()['max_concurrency'] == 4
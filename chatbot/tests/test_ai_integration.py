@@ -0,0 +1,66 @@
+"""Tests for the AI response generator (ai_integration.AIResponseGenerator), without a backend"""
+
+import pytest
+
+from ai_integration import AIResponseGenerator
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    generator = AIResponseGenerator(api_key='test-key')
+    # Every call goes through the stubbed _complete below
+    generator.client = None
+    generator.completions = []
+    generator.context_builds = 0
+
+    def complete(messages, **params):
+        generator.completions.append(messages)
+        return f"answer {len(generator.completions)}"
+
+    build_context = generator._context_messages
+
+    def context_messages(*args, **kwargs):
+        generator.context_builds += 1
+        return build_context(*args, **kwargs)
+
+    monkeypatch.setattr(generator, '_complete', complete)
+    monkeypatch.setattr(generator, '_context_messages', context_messages)
+    return generator
+
+
+def test_prepared_request_builds_the_context_once(generator):
+    history = [{'role': 'user', 'message': 'hi'}, {'role': 'assistant', 'message': 'hello'}]
+    prepared = generator.prepare_request('tell me about harvard', {'current_date': 'today'}, history)
+    assert generator.cached_response('tell me about harvard', prepared) is None
+
+    response = generator.generate_response_with_context('tell me about harvard', prepared=prepared)
+
+    assert response == 'answer 1'
+    assert generator.context_builds == 1
+    assert generator.completions == [prepared[0]]
+    assert generator.cached_response('tell me about harvard', prepared) == 'answer 1'
+
+
+def test_generate_reads_the_cache_without_a_prepared_request(generator):
+    assert generator.generate_response_with_context('what is the sat?') == 'answer 1'
+    assert generator.generate_response_with_context('what is the sat?') == 'answer 1'
+    assert len(generator.completions) == 1
+
+
+def test_stream_with_prepared_request_caches_the_reply(generator):
+    prepared = generator.prepare_request('what about mit?')
+    assert list(generator.stream_response_with_context('what about mit?', prepared=prepared)) == ['answer 1']
+    assert generator.context_builds == 1
+    assert generator.cached_response('what about mit?', prepared) == 'answer 1'
+
+
+def test_failure_raises_or_apologizes(generator, monkeypatch):
+    def fail(messages, **params):
+        raise ConnectionError('backend down')
+
+    monkeypatch.setattr(generator, '_complete', fail)
+    prepared = generator.prepare_request('hello')
+    with pytest.raises(ConnectionError):
+        generator.generate_response_with_context('hello', raise_errors=True, prepared=prepared)
+    assert 'trouble' in generator.generate_response_with_context('hello')
+    assert generator.cached_response('hello', prepared) is None
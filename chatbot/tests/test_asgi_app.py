@@ -0,0 +1,88 @@
+"""Tests for the ASGI app (asgi_app), driven through its ASGI interface"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+import asgi_app
+
+pytestmark = pytest.mark.skipif(not asgi_app.STARLETTE_AVAILABLE, reason='starlette is not installed')
+
+
+def call(application, method, path, body=None):
+    """Send one request to an ASGI app and return (status, decoded body)"""
+    messages = []
+    encoded = json.dumps(body).encode('utf-8') if body is not None else b''
+
+    async def receive():
+        return {'type': 'http.request', 'body': encoded, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+        'scheme': 'http', 'path': path, 'raw_path': path.encode('ascii'), 'root_path': '',
+        'query_string': b'', 'headers': [(b'content-type', b'application/json')],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80)
+    }
+    asyncio.run(application(scope, receive, send))
+    status = next(m['status'] for m in messages if m['type'] == 'http.response.start')
+    content = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return status, json.loads(content)
+
+
+@pytest.fixture
+def ai_bot():
+    import app_with_ai
+    return app_with_ai
+
+
+class RecordingGenerator:
+    """Stand-in for AIResponseGenerator recording the threads its blocking calls run on"""
+
+    def __init__(self, cached):
+        self.cached = cached
+        self.threads = []
+
+    def prepare_request(self, user_message, context=None, history=None, conversation_id=None):
+        self.threads.append(threading.current_thread())
+        return [{'role': 'user', 'content': user_message}], {}
+
+    def cached_response(self, user_message, prepared):
+        self.threads.append(threading.current_thread())
+        return self.cached
+
+
+def test_health_runs_off_the_event_loop(ai_bot, monkeypatch):
+    threads = []
+
+    def get_health():
+        threads.append(threading.current_thread())
+        return {'status': 'healthy'}
+
+    monkeypatch.setattr(ai_bot, 'get_health', get_health)
+    status, body = call(asgi_app.create_app('ai'), 'GET', '/health')
+    assert (status, body) == (200, {'status': 'healthy'})
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_cached_ai_answer_is_looked_up_off_the_event_loop(ai_bot, monkeypatch):
+    generator = RecordingGenerator(cached='cached answer')
+    monkeypatch.setattr(ai_bot, 'AI_GENERATOR', generator)
+    monkeypatch.setattr(ai_bot, 'ai_enabled', lambda: True)
+
+    status, body = call(asgi_app.create_app('ai'), 'POST', '/chat', {'message': 'hello'})
+
+    assert status == 200
+    assert body['response'] == 'cached answer'
+    assert len(generator.threads) == 2
+    assert threading.main_thread() not in generator.threads
+
+
+def test_chat_rejects_an_empty_message(ai_bot):
+    status, body = call(asgi_app.create_app('ai'), 'POST', '/chat', {'message': '  '})
+    assert status == 400
+    assert 'error' in body
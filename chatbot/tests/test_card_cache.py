@@ -0,0 +1,45 @@
+"""Tests for the rendered card cache (card_cache.CardCache)"""
+
+import card_cache
+from card_cache import CardCache
+
+
+def render_name(college):
+    return college['name']
+
+
+def test_get_caches_until_invalidated(monkeypatch):
+    colleges = {'one': {'name': 'One'}}
+    monkeypatch.setattr(card_cache, 'COLLEGES_DATA', colleges)
+    cache = CardCache({'name': render_name})
+
+    assert cache.get('one', 'name') == 'One'
+    assert cache.get('one', 'name') == 'One'
+    assert cache.stats()['hits'] == 1
+
+    colleges['one'] = {'name': 'One, renamed'}
+    cache.invalidate('one')
+    assert cache.get('one', 'name') == 'One, renamed'
+
+
+def test_get_unknown_college_returns_none(monkeypatch):
+    monkeypatch.setattr(card_cache, 'COLLEGES_DATA', {})
+    assert CardCache({'name': render_name}).get('missing', 'name') is None
+
+
+def test_change_during_get_is_not_cached_as_current(monkeypatch):
+    cache = CardCache({'name': render_name})
+
+    class ChangingCatalog(dict):
+        def get(self, key, default=None):
+            record = super().get(key, default)
+            # Another thread replaces the college right after this read
+            self[key] = {'name': 'New'}
+            cache.invalidate(key)
+            return record
+
+    monkeypatch.setattr(card_cache, 'COLLEGES_DATA', ChangingCatalog(one={'name': 'Old'}))
+    assert cache.get('one', 'name') == 'Old'
+
+    monkeypatch.setattr(card_cache, 'COLLEGES_DATA', {'one': {'name': 'New'}})
+    assert cache.get('one', 'name') == 'New'
@@ -0,0 +1,121 @@
+"""Tests for the catalog change journal (catalog_journal.CatalogJournal)"""
+
+import time
+
+from catalog_journal import CatalogJournal
+
+
+def record(journal, key, name):
+    journal.record(key, {'name': name})
+    journal.flush()
+
+
+def test_own_appends_are_not_changes_elsewhere(tmp_path):
+    journal = CatalogJournal(str(tmp_path))
+    journal.load()
+    record(journal, 'one', 'One')
+    assert not journal.changed_elsewhere()
+
+
+def test_own_compaction_is_not_a_change_elsewhere(tmp_path):
+    journal = CatalogJournal(str(tmp_path), compact_every=2)
+    journal.load()
+    record(journal, 'one', 'One')
+    record(journal, 'two', 'Two')
+    assert (tmp_path / 'colleges_backup.json').exists()
+    assert not journal.changed_elsewhere()
+
+
+def test_other_process_append_is_a_change_elsewhere(tmp_path):
+    journal = CatalogJournal(str(tmp_path))
+    other = CatalogJournal(str(tmp_path))
+    journal.load()
+    other.load()
+    record(other, 'one', 'One')
+    assert journal.changed_elsewhere()
+    assert journal.load() == {'one': {'name': 'One'}}
+    assert not journal.changed_elsewhere()
+
+
+def test_own_append_after_other_process_still_reports_change(tmp_path):
+    journal = CatalogJournal(str(tmp_path))
+    other = CatalogJournal(str(tmp_path))
+    journal.load()
+    record(other, 'one', 'One')
+    record(journal, 'two', 'Two')
+    assert journal.changed_elsewhere()
+
+
+def test_loads_do_not_count_toward_compaction(tmp_path):
+    journal = CatalogJournal(str(tmp_path), compact_every=3)
+    record(journal, 'one', 'One')
+    for _ in range(3):
+        journal.load()
+    record(journal, 'two', 'Two')
+    assert not (tmp_path / 'colleges_backup.json').exists()
+
+
+def test_load_counts_entries_already_logged(tmp_path):
+    record(CatalogJournal(str(tmp_path)), 'one', 'One')
+    record(CatalogJournal(str(tmp_path)), 'two', 'Two')
+    journal = CatalogJournal(str(tmp_path), compact_every=3)
+    journal.load()
+    record(journal, 'three', 'Three')
+    assert (tmp_path / 'colleges_backup.json').exists()
+    assert journal.load() == {name: {'name': name.title()} for name in ('one', 'two', 'three')}
+
+
+def test_changes_survive_a_restart(tmp_path):
+    journal = CatalogJournal(str(tmp_path))
+    journal.record_many([('a', {'name': 'A'}), ('b', {'name': 'B'})])
+    journal.record('a', None)
+    journal.flush()
+
+    assert CatalogJournal(str(tmp_path)).load() == {'b': {'name': 'B'}}
+
+
+def test_compaction_folds_the_log_into_the_snapshot(tmp_path):
+    journal = CatalogJournal(str(tmp_path), compact_every=3)
+    for number in range(3):
+        record(journal, f"c{number}", f"College {number}")
+
+    assert (tmp_path / 'colleges_changes.log').read_text() == ''
+    assert CatalogJournal(str(tmp_path)).load() == {f"c{number}": {'name': f"College {number}"} for number in range(3)}
+
+
+def test_torn_final_line_is_ignored(tmp_path):
+    journal = CatalogJournal(str(tmp_path))
+    record(journal, 'a', 'A')
+    with open(tmp_path / 'colleges_changes.log', 'a') as f:
+        f.write('{"op": "put", "key": "b", "coll')
+
+    assert CatalogJournal(str(tmp_path)).load() == {'a': {'name': 'A'}}
+
+
+def test_failed_write_keeps_the_changes_queued(tmp_path):
+    directory = tmp_path / 'not-created-yet'
+    journal = CatalogJournal(str(directory))
+    journal.record('a', {'name': 'A'})
+    assert journal.flush() is False
+    assert journal._pending
+
+    directory.mkdir()
+    assert journal.flush() is True
+    assert not journal._pending
+    assert CatalogJournal(str(directory)).load() == {'a': {'name': 'A'}}
+
+
+def test_writer_backs_off_after_a_failed_write(tmp_path, capsys):
+    directory = tmp_path / 'missing'
+    journal = CatalogJournal(str(directory))
+    journal.RETRY_SECONDS = 0.2
+    journal.record('a', {'name': 'A'})
+    time.sleep(0.3)
+
+    errors = capsys.readouterr().out.count('Error writing college change log')
+    assert 1 <= errors <= 3
+
+    # The writer retries on its own once the directory exists
+    directory.mkdir()
+    time.sleep(0.3)
+    assert not journal._pending
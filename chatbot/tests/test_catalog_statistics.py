@@ -0,0 +1,120 @@
+"""Tests for the incremental admin statistics (college_index.CatalogStatistics)"""
+
+import copy
+
+import pytest
+
+import app
+from builtin_colleges import BUILTIN_COLLEGES
+from college_data import COLLEGES_DATA
+from college_index import CatalogStatistics, get_undergraduate_tuition
+
+
+def recompute(colleges):
+    """Statistics computed from scratch, as the admin page used to"""
+    colleges = list(colleges.values())
+    rankings = [c['ranking'] for c in colleges]
+    types, states = {}, {}
+    for college in colleges:
+        types[college['type']] = types.get(college['type'], 0) + 1
+        state = college['location'].split(',')[-1].strip()
+        states[state] = states.get(state, 0) + 1
+    return {
+        'total_colleges': len(colleges),
+        'average_acceptance_rate': sum(c['acceptance_rate'] for c in colleges) / len(colleges),
+        'average_tuition': sum(get_undergraduate_tuition(c) for c in colleges) / len(colleges),
+        'rankings_range': {'min': min(rankings), 'max': max(rankings)},
+        'colleges_by_type': types,
+        'colleges_by_state': states
+    }
+
+
+def assert_matches(statistics, colleges):
+    snapshot = statistics.snapshot()
+    expected = recompute(colleges)
+    for field in ('average_acceptance_rate', 'average_tuition'):
+        assert snapshot.pop(field) == pytest.approx(expected.pop(field))
+    assert snapshot == expected
+
+
+class Catalog:
+    """A catalog copy whose changes are applied to the statistics like register_college does"""
+
+    def __init__(self):
+        self.colleges = copy.deepcopy(dict(BUILTIN_COLLEGES))
+        self.statistics = CatalogStatistics(self.colleges)
+
+    def put(self, key, college):
+        previous = self.colleges.get(key)
+        if college is None:
+            del self.colleges[key]
+        else:
+            self.colleges[key] = college
+        self.statistics.update(key, previous, college)
+
+
+@pytest.fixture
+def catalog():
+    return Catalog()
+
+
+def test_snapshot_matches_a_full_scan(catalog):
+    assert_matches(catalog.statistics, catalog.colleges)
+
+
+def test_changes_keep_the_statistics_exact(catalog):
+    catalog.statistics.build()
+
+    college = copy.deepcopy(catalog.colleges['mit'])
+    college.update({'name': 'Statistics Test College', 'type': 'Liberal Arts College', 'location': 'Reno, NV',
+                    'ranking': 250, 'acceptance_rate': 71.5})
+    catalog.put('statisticstestcollege', college)
+    assert_matches(catalog.statistics, catalog.colleges)
+
+    # Replacing and removing the extremes moves the ranking range
+    catalog.put('harvard', dict(catalog.colleges['harvard'], ranking=40))
+    catalog.put('statisticstestcollege', None)
+    assert_matches(catalog.statistics, catalog.colleges)
+
+
+def test_repeated_changes_leave_no_drift(catalog):
+    catalog.statistics.build()
+    college = copy.deepcopy(catalog.colleges['yale'])
+    before = catalog.statistics.snapshot()
+
+    for _ in range(1000):
+        catalog.put('yale', dict(college, acceptance_rate=0.1))
+        catalog.put('yale', college)
+
+    assert catalog.statistics.snapshot() == before
+
+
+def test_missing_numbers_are_left_out_of_averages():
+    statistics = CatalogStatistics({
+        'a': {'name': 'A', 'location': 'Reno, NV', 'type': 'Private', 'ranking': 3, 'acceptance_rate': 20.0},
+        'b': {'name': 'B', 'location': 'Ogden, UT', 'type': 'Private', 'ranking': 'n/a', 'acceptance_rate': None}
+    })
+    snapshot = statistics.snapshot()
+
+    assert snapshot['total_colleges'] == 2
+    assert snapshot['average_acceptance_rate'] == 20.0
+    assert snapshot['average_tuition'] is None
+    assert snapshot['rankings_range'] == {'min': 3, 'max': 3}
+    assert snapshot['colleges_by_state'] == {'NV': 1, 'UT': 1}
+
+
+def test_empty_catalog_reports_an_error(catalog):
+    assert CatalogStatistics({}).snapshot() == {'error': 'No colleges in database'}
+
+    catalog.statistics.build()
+    for key in list(catalog.colleges):
+        catalog.put(key, None)
+    assert catalog.statistics.snapshot() == {'error': 'No colleges in database'}
+
+
+def test_admin_statistics_endpoint():
+    app.app.config['TESTING'] = True
+    response = app.app.test_client().get('/admin/statistics')
+
+    assert response.status_code == 200
+    assert response.get_json()['total_colleges'] == len(COLLEGES_DATA)
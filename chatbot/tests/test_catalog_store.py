@@ -0,0 +1,78 @@
+"""Tests for the compiled catalog file (catalog_store)"""
+
+import json
+
+import pytest
+
+from builtin_colleges import BUILTIN_COLLEGES
+from catalog_journal import CatalogJournal
+from catalog_store import LazyCatalog, build_catalog, open_catalog, scan_catalog, write_catalog
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'data'
+    directory.mkdir()
+    monkeypatch.setenv('COLLEGE_DATA_DIR', str(directory))
+    return directory
+
+
+def test_build_merges_builtin_sources_and_journal(tmp_path, data_dir):
+    source = tmp_path / 'extra.json'
+    source.write_text(json.dumps({'extra': {'name': 'Extra'}, 'harvard': {'name': 'Replaced'}}))
+    journal = CatalogJournal(str(data_dir))
+    journal.record('journaled', {'name': 'Journaled'})
+    journal.record('extra', {'name': 'Extra, edited'})
+    journal.flush()
+
+    output = tmp_path / 'colleges.catalog'
+    count = build_catalog(str(output), [str(source)])
+
+    catalog = open_catalog(str(output))
+    assert count == len(catalog) == len(BUILTIN_COLLEGES) + 2
+    assert catalog['mit'] == BUILTIN_COLLEGES['mit']
+    assert catalog['harvard'] == {'name': 'Replaced'}
+    assert catalog['extra'] == {'name': 'Extra, edited'}
+    assert catalog['journaled'] == {'name': 'Journaled'}
+
+
+def test_build_accepts_an_earlier_catalog(tmp_path, data_dir):
+    earlier = tmp_path / 'earlier.catalog'
+    write_catalog({'earlier': {'name': 'Earlier'}}, str(earlier))
+    output = tmp_path / 'colleges.catalog'
+    build_catalog(str(output), [str(earlier)])
+    assert open_catalog(str(output))['earlier'] == {'name': 'Earlier'}
+
+
+def test_build_rejects_a_source_that_is_not_a_mapping(tmp_path, data_dir):
+    source = tmp_path / 'list.json'
+    source.write_text('[]')
+    output = tmp_path / 'colleges.catalog'
+    with pytest.raises(ValueError):
+        build_catalog(str(output), [str(source)])
+    assert not output.exists()
+
+
+def test_build_reports_a_missing_source(tmp_path, data_dir):
+    with pytest.raises(OSError):
+        build_catalog(str(tmp_path / 'colleges.catalog'), [str(tmp_path / 'missing.json')])
+
+
+def test_scan_reads_every_record_without_filling_the_cache(tmp_path):
+    path = tmp_path / 'colleges.catalog'
+    write_catalog({f'college{i}': {'name': f'College {i}'} for i in range(10)}, str(path))
+    catalog = LazyCatalog(str(path), cache_size=4)
+    assert catalog['college0'] == {'name': 'College 0'}
+    catalog['added'] = {'name': 'Added'}
+    del catalog['college1']
+
+    scanned = dict(scan_catalog(catalog))
+
+    assert len(scanned) == 10
+    assert 'college1' not in scanned
+    assert scanned['added'] == {'name': 'Added'}
+    assert list(catalog._cache) == ['college0']
+
+
+def test_scan_iterates_a_plain_mapping():
+    assert list(scan_catalog({'a': {'name': 'A'}})) == [('a', {'name': 'A'})]
@@ -0,0 +1,174 @@
+"""Tests for streamed /chat replies over Server-Sent Events (streaming)"""
+
+import json
+
+import pytest
+
+import app
+from circuit_breaker import CircuitBreaker
+from conversation_store import InMemoryConversationStore
+from streaming import split_chunks, sse_event, stream_chat_reply
+
+
+def parse_events(body):
+    """Parse a text/event-stream body into (event, data) pairs"""
+    events = []
+    for block in body.strip().split('\n\n'):
+        event, data = 'message', None
+        for line in block.split('\n'):
+            field, _, value = line.partition(': ')
+            if field == 'event':
+                event = value
+            elif field == 'data':
+                data = json.loads(value)
+        events.append((event, data))
+    return events
+
+
+def reply_text(events):
+    return ''.join(data['delta'] for event, data in events if event == 'message')
+
+
+def test_sse_event_format():
+    assert sse_event({'delta': 'hi'}) == 'data: {"delta": "hi"}\n\n'
+    assert sse_event({}, 'done') == 'event: done\ndata: {}\n\n'
+
+
+def test_split_chunks_rejoin_to_the_text():
+    text = ''.join(f"line {number}\n" for number in range(7))
+    chunks = list(split_chunks(text, lines_per_chunk=3))
+    assert len(chunks) == 3
+    assert ''.join(chunks) == text
+    assert list(split_chunks('')) == []
+
+
+def test_stream_chat_reply_events():
+    saved = []
+    events = parse_events(''.join(stream_chat_reply('c1', iter(['Hel', 'lo']), saved.append, {'extra': 1})))
+
+    assert events[0] == ('start', {'conversation_id': 'c1'})
+    assert reply_text(events) == 'Hello'
+    assert events[-1] == ('done', {'conversation_id': 'c1', 'extra': 1})
+    assert saved == ['Hello']
+
+
+def test_failing_stream_ends_with_an_error_event():
+    def pieces():
+        yield 'partial'
+        raise RuntimeError('backend went away')
+
+    saved = []
+    events = parse_events(''.join(stream_chat_reply('c1', pieces(), saved.append)))
+
+    assert [event for event, _ in events] == ['start', 'message', 'error']
+    assert events[-1][1] == {'error': 'An error occurred processing your message'}
+    assert saved == []
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = InMemoryConversationStore()
+    monkeypatch.setattr(app, 'conversations', store)
+    return store
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+def test_chat_streams_with_accept_header(store, client):
+    response = client.post('/chat', json={'message': 'Tell me about MIT'},
+                           headers={'Accept': 'text/event-stream'})
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    events = parse_events(response.get_data(as_text=True))
+    conversation_id = events[0][1]['conversation_id']
+    assert events[-1] == ('done', {'conversation_id': conversation_id})
+
+    reply = reply_text(events)
+    assert 'Massachusetts Institute of Technology' in reply
+    assert len([event for event, _ in events if event == 'message']) > 1
+    assert [(m['role'], m['message']) for m in store.get(conversation_id)] == [
+        ('user', 'Tell me about MIT'), ('bot', reply)
+    ]
+
+
+def test_chat_streams_when_the_body_asks(store, client):
+    response = client.post('/chat', json={'message': 'hello', 'stream': True})
+    assert response.mimetype == 'text/event-stream'
+    assert reply_text(parse_events(response.get_data(as_text=True)))
+
+
+def test_streamed_chat_rejects_an_empty_message(store, client):
+    response = client.post('/chat', json={'message': '  '}, headers={'Accept': 'text/event-stream'})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Message cannot be empty'}
+
+
+class StreamingGenerator:
+    """Stand-in for AIResponseGenerator streaming a fixed reply"""
+
+    def __init__(self, pieces, fail_after=None):
+        self.pieces = pieces
+        self.fail_after = fail_after
+
+    def is_available(self):
+        return True
+
+    def prepare_request(self, user_message, context=None, history=None, conversation_id=None):
+        return [{'role': 'user', 'content': user_message}], {}
+
+    def cached_response(self, user_message, prepared):
+        return None
+
+    def stream_response_with_context(self, user_message, raise_errors=False, prepared=None):
+        for number, piece in enumerate(self.pieces):
+            if number == self.fail_after:
+                raise ConnectionError('backend went away')
+            yield piece
+
+
+@pytest.fixture
+def ai_app(monkeypatch):
+    import app_with_ai
+    monkeypatch.setattr(app_with_ai, 'conversations', InMemoryConversationStore())
+    monkeypatch.setattr(app_with_ai, 'AI_BREAKER', CircuitBreaker())
+    app_with_ai.app.config['TESTING'] = True
+    return app_with_ai
+
+
+def post_stream(ai_app, message):
+    response = ai_app.app.test_client().post('/chat', json={'message': message},
+                                             headers={'Accept': 'text/event-stream'})
+    return parse_events(response.get_data(as_text=True))
+
+
+def test_ai_reply_is_forwarded_piece_by_piece(ai_app, monkeypatch):
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', StreamingGenerator(['The ', 'answer', '.']))
+    events = post_stream(ai_app, 'what is the answer?')
+
+    assert [data['delta'] for event, data in events if event == 'message'] == ['The ', 'answer', '.']
+    assert events[-1][1]['ai_enabled'] is True
+    conversation_id = events[0][1]['conversation_id']
+    assert ai_app.conversations.get(conversation_id)[-1]['message'] == 'The answer.'
+
+
+def test_ai_failure_before_the_first_piece_falls_back(ai_app, monkeypatch):
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', StreamingGenerator(['never sent'], fail_after=0))
+    events = post_stream(ai_app, 'hello')
+
+    assert events[-1][0] == 'done'
+    assert reply_text(events) and 'never sent' not in reply_text(events)
+    assert ai_app.AI_BREAKER.failures == 1
+
+
+def test_ai_failure_mid_stream_ends_with_an_error(ai_app, monkeypatch):
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', StreamingGenerator(['partial ', 'reply'], fail_after=1))
+    events = post_stream(ai_app, 'hello')
+
+    assert [event for event, _ in events] == ['start', 'message', 'error']
+    conversation_id = events[0][1]['conversation_id']
+    assert [m['role'] for m in ai_app.conversations.get(conversation_id)] == ['user']
@@ -0,0 +1,191 @@
+"""Tests for the circuit breaker (circuit_breaker) and the AI app's hedged fallback"""
+
+import threading
+import types
+
+import pytest
+
+import circuit_breaker
+from ai_client import AIOverloadedError
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, create_circuit_breaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the breaker's monotonic clock with one the test advances"""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(circuit_breaker, 'time', fake)
+    return fake
+
+
+def make_breaker(**options):
+    options = {'window_size': 4, 'min_calls': 4, 'open_seconds': 10, 'slow_call_seconds': 1.0, **options}
+    return CircuitBreaker(**options)
+
+
+def test_failures_open_the_breaker(clock):
+    breaker = make_breaker()
+    for failed in (False, True, False):
+        assert breaker.allow_request()
+        (breaker.record_failure if failed else breaker.record_success)(0.1)
+    assert breaker.state == CLOSED
+
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    stats = breaker.stats()
+    assert stats['times_opened'] == 1 and stats['rejected'] == 1
+    assert stats['retry_in_seconds'] == 10
+
+
+def test_slow_calls_open_the_breaker(clock):
+    breaker = make_breaker(slow_call_rate_threshold=0.75)
+    for duration in (2.0, 2.0, 0.1):
+        breaker.record_success(duration)
+    assert breaker.state == CLOSED
+    breaker.record_success(2.0)
+    assert breaker.state == OPEN
+
+
+def test_too_few_calls_never_open(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure(0.1)
+    assert breaker.state == CLOSED
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+
+def test_successful_probe_closes(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+
+    clock.now += 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # one probe at a time
+
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()['window_calls'] == 0
+
+
+@pytest.mark.parametrize('record', [lambda b: b.record_failure(0.1), lambda b: b.record_success(5.0)])
+def test_failed_or_slow_probe_reopens(clock, record):
+    breaker = make_breaker()
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.allow_request()
+
+    record(breaker)
+    assert breaker.state == OPEN
+    assert breaker.stats()['times_opened'] == 2
+
+
+def test_released_probe_frees_the_slot(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.allow_request()
+
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_calls_finishing_while_open_are_ignored(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+    breaker.record_success(0.1)
+    assert breaker.state == OPEN
+
+
+def test_create_circuit_breaker_reads_environment(monkeypatch):
+    monkeypatch.setenv('AI_BREAKER_FAILURE_RATE', '0.25')
+    monkeypatch.setenv('AI_BREAKER_WINDOW', '8')
+    monkeypatch.setenv('AI_BREAKER_OPEN_SECONDS', '3')
+    breaker = create_circuit_breaker()
+    assert (breaker.failure_rate_threshold, breaker.window_size, breaker.open_seconds) == (0.25, 8, 3.0)
+
+
+class BlockingGenerator:
+    """Stand-in for AIResponseGenerator whose completions the test controls"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.release = threading.Event()
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    def prepare_request(self, user_message, context=None, history=None, conversation_id=None):
+        return [{'role': 'user', 'content': user_message}], {}
+
+    def cached_response(self, user_message, prepared):
+        return None
+
+    def generate_response_with_context(self, user_message, raise_errors=False, prepared=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        self.release.wait(5)
+        return 'AI answer'
+
+
+@pytest.fixture
+def ai_app(monkeypatch):
+    import app_with_ai
+    monkeypatch.setattr(app_with_ai, 'AI_BREAKER', make_breaker())
+    monkeypatch.setattr(app_with_ai, 'AI_STATS', {'hedged': 0})
+    monkeypatch.setattr(app_with_ai, 'AI_HEDGE_SECONDS', None)
+    return app_with_ai
+
+
+def test_ai_answer_is_used_when_healthy(ai_app, monkeypatch):
+    generator = BlockingGenerator()
+    generator.release.set()
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', generator)
+
+    assert ai_app.get_bot_response('hello') == 'AI answer'
+    assert ai_app.AI_BREAKER.stats()['calls'] == 1
+
+
+def test_ai_failure_falls_back_and_is_recorded(ai_app, monkeypatch):
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', BlockingGenerator(ConnectionError('backend down')))
+
+    assert ai_app.get_bot_response('hello') != 'AI answer'
+    assert ai_app.AI_BREAKER.stats()['failures'] == 1
+
+
+def test_open_breaker_skips_the_ai(ai_app, monkeypatch):
+    generator = BlockingGenerator()
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', generator)
+    open_breaker(ai_app.AI_BREAKER)
+
+    assert ai_app.get_bot_response('hello') != 'AI answer'
+    assert generator.calls == 0
+
+
+def test_overload_is_not_a_backend_failure(ai_app, monkeypatch):
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', BlockingGenerator(AIOverloadedError('queue full')))
+
+    ai_app.get_bot_response('hello')
+    assert ai_app.AI_BREAKER.stats()['calls'] == 0
+
+
+def test_slow_ai_is_hedged_with_the_pattern_answer(ai_app, monkeypatch):
+    generator = BlockingGenerator()
+    monkeypatch.setattr(ai_app, 'AI_GENERATOR', generator)
+    monkeypatch.setattr(ai_app, 'AI_HEDGE_SECONDS', 0.05)
+
+    try:
+        assert ai_app.get_bot_response('hello') != 'AI answer'
+        assert ai_app.AI_STATS['hedged'] == 1
+    finally:
+        generator.release.set()
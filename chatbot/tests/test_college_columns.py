@@ -0,0 +1,95 @@
+"""Tests for the columnar college snapshot (college_columns) and criteria search"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from builtin_colleges import BUILTIN_COLLEGES
+from college_admin import search_colleges_by_criteria
+from college_columns import CollegeColumns, StringColumn, get_college_columns
+from college_data import get_undergraduate_tuition, register_college
+
+
+def tuition(college):
+    price = get_undergraduate_tuition(college)
+    return float('nan') if price is None else price
+
+
+def linear_search(colleges, criteria):
+    """The dict walk the snapshot replaces"""
+    bounds = {
+        'min_ranking': lambda c, v: c['ranking'] <= v,
+        'max_ranking': lambda c, v: c['ranking'] >= v,
+        'min_acceptance_rate': lambda c, v: c['acceptance_rate'] >= v,
+        'max_acceptance_rate': lambda c, v: c['acceptance_rate'] <= v,
+        'min_tuition': lambda c, v: tuition(c) >= v,
+        'max_tuition': lambda c, v: tuition(c) <= v,
+        'location': lambda c, v: v.lower() in c['location'].lower(),
+        'type': lambda c, v: v.lower() in c['type'].lower()
+    }
+    keys = [key for key, college in colleges.items()
+            if all(bounds[name](college, value) for name, value in criteria.items())]
+    return sorted(keys, key=lambda key: colleges[key]['ranking'])
+
+
+@pytest.fixture
+def colleges():
+    return copy.deepcopy(dict(BUILTIN_COLLEGES))
+
+
+@pytest.mark.parametrize('criteria', [
+    {},
+    {'min_ranking': 5},
+    {'max_ranking': 3, 'min_ranking': 10},
+    {'max_acceptance_rate': 5},
+    {'min_acceptance_rate': 4, 'max_tuition': 60000},
+    {'location': 'ca'},
+    {'type': 'PRIVATE'},
+    {'location': 'Nowhere'}
+])
+def test_filter_rows_matches_the_linear_scan(colleges, criteria):
+    columns = CollegeColumns(colleges)
+    assert [columns.keys[row] for row in columns.filter_rows(criteria)] == linear_search(colleges, criteria)
+
+
+def test_missing_numbers_never_match_a_range(colleges):
+    colleges['xylophonecolumnscollege'] = {'name': 'Xylophone Columns College', 'location': 'Reno, NV',
+                                            'type': 'Private', 'ranking': 'unranked'}
+    columns = CollegeColumns(colleges)
+
+    assert np.isnan(columns.ranking[columns.rows['xylophonecolumnscollege']])
+    assert 'xylophonecolumnscollege' not in [columns.keys[row] for row in columns.filter_rows({'min_ranking': 1000})]
+    assert 'xylophonecolumnscollege' in [columns.keys[row] for row in columns.filter_rows({'location': 'reno'})]
+
+
+def test_empty_catalog(colleges):
+    columns = CollegeColumns({})
+    assert len(columns) == 0
+    assert len(columns.filter_rows({'location': 'ca', 'max_tuition': 1})) == 0
+
+
+def test_string_column():
+    column = StringColumn(['Boston, MA', 'Stanford, CA', 'Boston, MA'])
+
+    assert column.table == ['Boston, MA', 'Stanford, CA']
+    assert column.contains('boston').tolist() == [True, False, True]
+    assert column.equals_any(['stanford, ca']).tolist() == [False, True, False]
+    assert column.counts() == {'Boston, MA': 2, 'Stanford, CA': 1}
+    assert StringColumn([]).contains('x').tolist() == []
+
+
+def test_snapshot_is_rebuilt_after_a_catalog_change():
+    snapshot = get_college_columns()
+    assert get_college_columns() is snapshot
+
+    college = copy.deepcopy(BUILTIN_COLLEGES['mit'])
+    college['name'] = 'Columnsnapshot Test Institute'
+    college['location'] = 'Columnsnapshot Springs, NV'
+    register_college('columnsnapshottestinstitute', college)
+
+    rebuilt = get_college_columns()
+    assert rebuilt is not snapshot
+    assert [c['name'] for c in search_colleges_by_criteria({'location': 'columnsnapshot springs'})] == [
+        'Columnsnapshot Test Institute'
+    ]
@@ -0,0 +1,106 @@
+"""Tests for bulk college import (college_admin.import_colleges and /admin/import-colleges)"""
+
+import io
+import json
+
+import pytest
+
+import app
+import college_admin
+from college_data import COLLEGES_DATA
+from college_index import normalize_college_name
+
+
+def minimal_college(name):
+    """A college with only the fields validate_college_data requires"""
+    return {
+        'name': name,
+        'location': 'Boulder, CO',
+        'type': 'Private University',
+        'founded': 1990,
+        'ranking': 40,
+        'acceptance_rate': 30.0
+    }
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+def chat(client, message):
+    return client.post('/chat', json={'message': message})
+
+
+def test_import_ndjson_reports_rows():
+    records = [minimal_college('Import Test College One'), {'name': 'Broken'}, 'not an object']
+    stream = io.StringIO('\n'.join(json.dumps(r) for r in records) + '\n{bad json\n')
+    report = college_admin.import_colleges(college_admin.iter_college_records(stream, 'ndjson'))
+
+    assert report['imported'] == 1
+    assert report['rejected'] == 3
+    assert [error['row'] for error in report['errors']] == [2, 3, 4]
+    assert normalize_college_name('Import Test College One') in COLLEGES_DATA
+
+
+def test_import_rejects_existing_unless_replacing():
+    college = minimal_college('Import Test College Two')
+    rows = lambda: iter([(1, dict(college))])
+    assert college_admin.import_colleges(rows())['imported'] == 1
+    assert college_admin.import_colleges(rows())['rejected'] == 1
+    assert college_admin.import_colleges(rows(), replace_existing=True)['imported'] == 1
+
+
+def test_import_csv_splits_list_columns():
+    stream = io.StringIO(
+        'name,location,type,founded,ranking,acceptance_rate,programs.undergraduate\n'
+        'Import Test College Three,"Austin, TX",Public University,1900,50,40.5,Physics;Economics\n'
+    )
+    report = college_admin.import_colleges(college_admin.iter_college_records(stream, 'csv'))
+    assert report['imported'] == 1
+    college = COLLEGES_DATA[normalize_college_name('Import Test College Three')]
+    assert college['founded'] == 1900
+    assert college['programs']['undergraduate'] == ['Physics', 'Economics']
+
+
+def test_chat_about_imported_college_with_only_required_fields(client):
+    response = client.post('/admin/import-colleges?format=ndjson',
+                           data=json.dumps(minimal_college('Zephyr Tech Institute')),
+                           content_type='application/x-ndjson')
+    assert response.status_code == 200
+    assert response.get_json()['imported'] == 1
+
+    for message in ['tell me about Zephyr Tech Institute',
+                    'admission requirements for Zephyr Tech Institute',
+                    'tuition at Zephyr Tech Institute',
+                    'compare Zephyr Tech Institute and MIT']:
+        response = chat(client, message)
+        assert response.status_code == 200, message
+        assert 'Zephyr Tech Institute' in response.get_json()['response'], message
+
+    assert 'not available' in chat(client, 'tuition at Zephyr Tech Institute').get_json()['response']
+
+
+def test_admission_calculator_without_requirements(client):
+    college_admin.import_colleges(iter([(1, minimal_college('Import Test College Four'))]))
+    response = client.post('/admission/calculator', json={'college': 'Import Test College Four', 'gpa': 3.5})
+    assert response.status_code == 200
+    assert 'not available' in response.get_json()['error']
+
+
+def test_import_endpoint_rejects_an_unknown_format(client):
+    response = client.post('/admin/import-colleges', data='<colleges/>', content_type='application/xml')
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Unknown import format; use ndjson, csv or json'}
+
+
+def test_import_endpoint_reports_rejected_rows(client):
+    body = '\n'.join([json.dumps(minimal_college('Import Test College Five')), json.dumps({'name': 'Broken'})])
+    response = client.post('/admin/import-colleges?format=ndjson', data=body)
+
+    report = response.get_json()
+    assert response.status_code == 200
+    assert report['success'] is False
+    assert (report['imported'], report['rejected']) == (1, 1)
+    assert report['errors'][0]['row'] == 2
@@ -0,0 +1,61 @@
+"""Tests for catalog fact retrieval (college_retrieval.CollegeRetriever)"""
+
+from builtin_colleges import BUILTIN_COLLEGES
+from college_retrieval import CollegeRetriever, tokenize
+
+
+def small_college(name, location='Reno, NV'):
+    return {'name': name, 'location': location, 'type': 'Private University', 'founded': 1990,
+            'ranking': 100, 'acceptance_rate': 50.0}
+
+
+def test_tokenize_drops_stopwords_and_plurals():
+    assert tokenize('What are the programs at MIT?') == ['program', 'mit']
+
+
+def test_search_ranks_the_asked_college_first():
+    retriever = CollegeRetriever(dict(BUILTIN_COLLEGES))
+    results = retriever.search('What SAT score does MIT require?')
+    assert results and results[0]['college'] == 'mit'
+    assert [r['score'] for r in results] == sorted((r['score'] for r in results), reverse=True)
+
+
+def test_small_talk_finds_nothing():
+    retriever = CollegeRetriever(dict(BUILTIN_COLLEGES))
+    assert retriever.search('hello') == []
+    assert retriever.search('') == []
+    assert retriever.search('mit', top_k=0) == []
+
+
+def test_updates_replace_a_college_chunks():
+    retriever = CollegeRetriever({**BUILTIN_COLLEGES, 'c1': small_college('Xylophone Institute')})
+    assert retriever.search('xylophone institute')[0]['college'] == 'c1'
+
+    retriever.update('c1', None, small_college('Quasar Institute'))
+    assert retriever.search('xylophone') == []
+    assert retriever.search('quasar institute')[0]['college'] == 'c1'
+
+    retriever.update('c1', None, None)
+    assert retriever.search('quasar') == []
+
+
+def test_index_grows_past_its_initial_size():
+    colleges = {f'college{i}': small_college(f'College Number {i}', f'Town{i}, NV') for i in range(1100)}
+    retriever = CollegeRetriever(colleges, top_k=3)
+    retriever.build()
+    assert retriever.stats()['chunks'] > 1024
+    assert retriever.search('town1099')[0]['college'] == 'college1099'
+
+
+def test_scoring_runs_without_the_index_lock(monkeypatch):
+    import college_retrieval
+
+    retriever = CollegeRetriever(dict(BUILTIN_COLLEGES))
+    bincount = college_retrieval.np.bincount
+
+    def unlocked_bincount(*args, **kwargs):
+        assert not retriever._lock.locked()
+        return bincount(*args, **kwargs)
+
+    monkeypatch.setattr(college_retrieval.np, 'bincount', unlocked_bincount)
+    assert retriever.search('tuition at stanford')[0]['college'] == 'stanford'
@@ -0,0 +1,152 @@
+"""Tests for AI request micro-batching (ai_client.CompletionBatcher)"""
+
+import asyncio
+
+import pytest
+
+from ai_client import AIBackendError, AIOverloadedError, CompletionBatcher
+
+
+class FakeBackend:
+    """Upstream stand-in recording calls and the number in flight"""
+
+    def __init__(self, delay=0.01, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.cancelled = 0
+
+    async def complete(self, messages, model, timeout, **params):
+        self.calls.append(messages[-1]['content'])
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            return f"reply to {messages[-1]['content']}"
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+def ask(content):
+    return [{'role': 'user', 'content': content}]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_requests_in_one_pass_are_dispatched_together():
+    backend = FakeBackend()
+    batcher = CompletionBatcher(backend.complete)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(ask(f"q{i}"), 'mock') for i in range(5)))
+
+    assert run(main()) == [f"reply to q{i}" for i in range(5)]
+    stats = batcher.stats()
+    assert stats['batches'] == 1 and stats['largest_batch'] == 5
+    assert stats['waiting'] == 0
+
+
+def test_identical_requests_share_one_call():
+    backend = FakeBackend()
+    batcher = CompletionBatcher(backend.complete)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(ask('same'), 'mock', temperature=0) for _ in range(3)),
+                                    batcher.submit(ask('same'), 'mock', temperature=1))
+
+    assert run(main()) == ['reply to same'] * 4
+    assert len(backend.calls) == 2
+    assert batcher.stats()['deduplicated'] == 2
+
+
+def test_parallel_calls_are_bounded():
+    backend = FakeBackend()
+    batcher = CompletionBatcher(backend.complete, max_parallel=2, max_batch=3)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(ask(f"q{i}"), 'mock') for i in range(7)))
+
+    assert len(run(main())) == 7
+    assert backend.most_in_flight == 2
+    assert batcher.stats()['batches'] == 3
+
+
+def test_full_queue_rejects_new_requests():
+    backend = FakeBackend()
+    batcher = CompletionBatcher(backend.complete, max_parallel=1, max_queue=2)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(ask(f"q{i}"), 'mock') for i in range(4)),
+                                    return_exceptions=True)
+
+    results = run(main())
+    assert results[:2] == ['reply to q0', 'reply to q1']
+    assert all(isinstance(result, AIOverloadedError) for result in results[2:])
+    assert batcher.stats()['rejected'] == 2
+    assert len(backend.calls) == 2
+
+
+def test_upstream_error_reaches_every_caller():
+    batcher = CompletionBatcher(FakeBackend(error=AIBackendError('HTTP 500')).complete)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(ask('same'), 'mock') for _ in range(2)),
+                                    return_exceptions=True)
+
+    assert [str(result) for result in run(main())] == ['HTTP 500', 'HTTP 500']
+
+
+def test_caller_giving_up_cancels_the_upstream_call():
+    backend = FakeBackend(delay=5)
+    batcher = CompletionBatcher(backend.complete)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.submit(ask('slow'), 'mock'), 0.05)
+        await asyncio.sleep(0.01)
+
+    run(main())
+    assert backend.cancelled == 1
+    assert batcher.stats()['waiting'] == 0
+
+
+def test_slots_are_shared_with_streams():
+    batcher = CompletionBatcher(FakeBackend().complete, max_parallel=1, max_queue=1)
+
+    async def main():
+        async with batcher.slot():
+            with pytest.raises(asyncio.TimeoutError):
+                async with batcher.slot(timeout=0.01):
+                    pass
+
+            waiting = asyncio.ensure_future(batcher.submit(ask('queued'), 'mock'))
+            await asyncio.sleep(0.01)
+            with pytest.raises(AIOverloadedError):
+                async with batcher.slot(timeout=1):
+                    pass
+        return await waiting
+
+    assert run(main()) == 'reply to queued'
+    assert batcher.stats()['streams'] == 1
+
+
+def test_close_cancels_queued_requests():
+    batcher = CompletionBatcher(FakeBackend().complete, window=1.0)
+
+    async def main():
+        request = asyncio.ensure_future(batcher.submit(ask('q'), 'mock'))
+        await asyncio.sleep(0.01)
+        await batcher.close()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+    run(main())
@@ -0,0 +1,101 @@
+"""Tests for AI context packing (context_builder.ContextBuilder)"""
+
+from context_builder import SUMMARY_HEADER, ContextBuilder, create_context_builder
+
+
+# Made-up words that never repeat, so no filler sentence outweighs the others
+WORDS = [first + vowel + last for first in 'bdfgklmnpst' for vowel in 'aeiou' for last in 'klmnrstvz']
+
+
+def history_of(count):
+    history = []
+    for number in range(count):
+        user_words = ' '.join(WORDS[6 * number:6 * number + 3])
+        bot_words = ' '.join(WORDS[6 * number + 3:6 * number + 6])
+        history.append({'role': 'user', 'message': f"What about {user_words}?", 'timestamp': f"t{number}u"})
+        history.append({'role': 'bot', 'message': f"It is {bot_words}.", 'timestamp': f"t{number}b"})
+    return history
+
+
+def prompt_tokens(builder, messages):
+    return sum(builder.tokens.count_message(message) for message in messages)
+
+
+def test_without_history_only_the_prompt_and_message_are_sent():
+    assert ContextBuilder().build('Be helpful', 'hi') == [
+        {'role': 'system', 'content': 'Be helpful'}, {'role': 'user', 'content': 'hi'}
+    ]
+
+
+def test_short_history_is_sent_verbatim():
+    history = history_of(2)
+    messages = ContextBuilder().build('Be helpful', 'and dining?', history)
+
+    assert [m['role'] for m in messages] == ['system', 'user', 'assistant', 'user', 'assistant', 'user']
+    assert [m['content'] for m in messages[1:-1]] == [m['message'] for m in history]
+
+
+def test_long_history_is_packed_into_the_budget_with_a_summary():
+    builder = ContextBuilder(max_tokens=300, summary_tokens=80)
+    history = [{'role': 'user', 'message': 'My GPA is 3.9 and I scored 1520 on the SAT.', 'timestamp': 'first'}]
+    history += history_of(30)
+
+    messages = builder.build('Be helpful', 'What about Rice?', history, 'c1')
+
+    assert prompt_tokens(builder, messages) <= 300
+    summary = messages[1]
+    assert summary['role'] == 'system' and summary['content'].startswith(SUMMARY_HEADER)
+    assert '1520' in summary['content']
+    # The newest messages are kept verbatim, oldest first
+    assert messages[-2]['content'] == history[-1]['message']
+    assert messages[-3]['content'] == history[-2]['message']
+    assert builder.stats()['summaries_built'] == 1
+
+
+def test_summary_is_rolled_forward_between_turns():
+    builder = ContextBuilder(max_tokens=300, summary_tokens=80)
+    history = history_of(30)
+    builder.build('Be helpful', 'next', history, 'c1')
+
+    builder.build('Be helpful', 'next', history, 'c1')
+    assert builder.stats()['summaries_reused'] == 1
+
+    history += history_of(31)[-2:]
+    messages = builder.build('Be helpful', 'next', history, 'c1')
+    stats = builder.stats()
+    assert stats['summaries_built'] == 1 and stats['summaries_extended'] == 1
+    assert prompt_tokens(builder, messages) <= 300
+
+
+def test_summary_is_rebuilt_when_history_was_trimmed():
+    builder = ContextBuilder(max_tokens=300, summary_tokens=80)
+    history = history_of(30)
+    builder.build('Be helpful', 'next', history, 'c1')
+
+    builder.build('Be helpful', 'next', history_of(60)[-40:], 'c1')
+    assert builder.stats()['summaries_built'] == 2
+
+
+def test_summaries_are_cached_per_conversation_and_bounded():
+    builder = ContextBuilder(max_tokens=300, summary_tokens=80, max_conversations=2)
+    for conversation_id in ('a', 'b', 'c'):
+        builder.build('Be helpful', 'next', history_of(30), conversation_id)
+    assert builder.stats()['cached_summaries'] == 2
+
+    builder.forget('c')
+    assert builder.stats()['cached_summaries'] == 1
+
+    builder.build('Be helpful', 'next', history_of(30), None)
+    assert builder.stats()['cached_summaries'] == 1
+
+
+def test_unknown_roles_are_sent_as_user_messages():
+    messages = ContextBuilder().build('Be helpful', 'hi', [{'role': 'moderator', 'message': 'note'}])
+    assert messages[1] == {'role': 'user', 'content': 'note'}
+
+
+def test_create_context_builder_reads_environment(monkeypatch):
+    monkeypatch.setenv('AI_CONTEXT_MAX_TOKENS', '500')
+    monkeypatch.setenv('AI_CONTEXT_SUMMARY_TOKENS', '50')
+    stats = create_context_builder().stats()
+    assert (stats['max_tokens'], stats['summary_tokens']) == (500, 50)
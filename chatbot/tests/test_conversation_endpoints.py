@@ -0,0 +1,98 @@
+"""Tests for the paginated and streaming conversation endpoints (/conversations, /conversation/<id>)"""
+
+import json
+
+import pytest
+
+import app
+from conversation_store import InMemoryConversationStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = InMemoryConversationStore()
+    monkeypatch.setattr(app, 'conversations', store)
+    return store
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+def read_all_pages(client, path, limit):
+    """Follow X-Next-Cursor until the last page"""
+    pages = []
+    response = client.get(f"{path}?limit={limit}")
+    while True:
+        assert response.status_code == 200
+        pages.append(response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            return pages
+        response = client.get(f"{path}?limit={limit}&cursor={cursor}")
+
+
+def test_conversations_are_listed_page_by_page(store, client):
+    for conversation_id in ['c3', 'c1', 'c5', 'c2', 'c4']:
+        store.append(conversation_id, 'user', 'hello')
+
+    assert read_all_pages(client, '/conversations', 2) == [['c1', 'c2'], ['c3', 'c4'], ['c5']]
+
+
+def test_conversation_messages_are_returned_page_by_page(store, client):
+    for number in range(5):
+        store.append('c1', 'user', f"message {number}")
+
+    pages = read_all_pages(client, '/conversation/c1', 2)
+    assert [[m['message'] for m in page] for page in pages] == [
+        ['message 0', 'message 1'], ['message 2', 'message 3'], ['message 4']
+    ]
+
+
+def test_ndjson_streams_every_item(store, client):
+    for number in range(3):
+        store.append('c1', 'user', f"message {number}")
+    store.append('c2', 'user', 'hello')
+
+    response = client.get('/conversation/c1?format=ndjson&limit=1')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['message'] for line in lines] == ['message 0', 'message 1', 'message 2']
+
+    response = client.get('/conversations?format=ndjson&limit=1')
+    assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()] == ['c1', 'c2']
+
+
+def test_page_size_is_clamped(store, client):
+    for number in range(3):
+        store.append(f"c{number}", 'user', 'hello')
+
+    assert client.get('/conversations?limit=0').get_json() == ['c0']
+    assert client.get('/conversations?limit=abc').get_json() == ['c0', 'c1', 'c2']
+
+
+def test_unknown_conversation_is_an_empty_page(store, client):
+    response = client.get('/conversation/missing')
+    assert response.status_code == 200
+    assert response.get_json() == []
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_invalid_message_cursor_is_rejected(store, client):
+    store.append('c1', 'user', 'hello')
+    response = client.get('/conversation/c1?cursor=abc')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
+
+
+def test_delete_conversation(store, client):
+    store.append('c1', 'user', 'hello')
+
+    assert client.delete('/conversation/c1').status_code == 200
+    assert store.get('c1') == []
+
+    response = client.delete('/conversation/c1')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Conversation not found'}
@@ -0,0 +1,151 @@
+"""Tests for the in-memory conversation store (conversation_store.InMemoryConversationStore)"""
+
+import types
+
+import pytest
+
+import conversation_store
+from conversation_store import InMemoryConversationStore, create_conversation_store
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the store's monotonic clock with one the test advances"""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(conversation_store, 'time', fake)
+    return fake
+
+
+def test_append_and_get_keep_message_order():
+    store = InMemoryConversationStore()
+    store.append('c1', 'user', 'hello')
+    store.append('c1', 'assistant', 'hi there')
+
+    messages = store.get('c1')
+    assert [(m['role'], m['message']) for m in messages] == [('user', 'hello'), ('assistant', 'hi there')]
+    assert all('timestamp' in m for m in messages)
+    assert 'c1' in store and len(store) == 1
+
+
+def test_unknown_conversation_is_empty():
+    store = InMemoryConversationStore()
+    assert store.get('missing') == []
+    assert store.page_messages('missing') == ([], None)
+    assert 'missing' not in store
+
+
+def test_delete():
+    store = InMemoryConversationStore()
+    store.append('c1', 'user', 'hello')
+
+    assert store.delete('c1') is True
+    assert store.get('c1') == []
+    assert store.ids() == []
+    assert store.delete('c1') is False
+
+
+def test_old_messages_are_trimmed():
+    store = InMemoryConversationStore(max_messages=3)
+    for number in range(5):
+        store.append('c1', 'user', f"message {number}")
+
+    assert [m['message'] for m in store.get('c1')] == ['message 2', 'message 3', 'message 4']
+    assert store.stats()['messages_trimmed'] == 2
+
+
+def test_idle_conversations_expire(clock):
+    store = InMemoryConversationStore(ttl_seconds=60)
+    store.append('old', 'user', 'hello')
+    clock.now += 30
+    store.append('recent', 'user', 'hello')
+
+    clock.now += 31
+    assert store.ids() == ['recent']
+    assert store.get('old') == []
+    assert store.stats()['conversations_expired'] == 1
+
+
+def test_reading_a_conversation_keeps_it_alive(clock):
+    store = InMemoryConversationStore(ttl_seconds=60)
+    store.append('c1', 'user', 'hello')
+    clock.now += 50
+    assert store.get('c1')
+
+    clock.now += 50
+    assert len(store.get('c1')) == 1
+
+
+def test_memory_budget_evicts_least_recently_used():
+    size = len('x' * 100) + InMemoryConversationStore.MESSAGE_OVERHEAD
+    store = InMemoryConversationStore(max_bytes=size * 2)
+    store.append('a', 'user', 'x' * 100)
+    store.append('b', 'user', 'x' * 100)
+    store.get('a')
+
+    store.append('c', 'user', 'x' * 100)
+
+    assert store.ids() == ['a', 'c']
+    stats = store.stats()
+    assert stats['conversations_evicted'] == 1
+    assert stats['approx_bytes'] == size * 2
+
+
+def test_conversation_being_appended_to_is_never_evicted():
+    size = len('x' * 100) + InMemoryConversationStore.MESSAGE_OVERHEAD
+    store = InMemoryConversationStore(max_bytes=size)
+    store.append('a', 'user', 'x' * 100)
+    store.append('a', 'user', 'x' * 100)
+
+    assert len(store.get('a')) == 2
+
+
+def test_page_ids_walks_every_id_once():
+    store = InMemoryConversationStore()
+    for conversation_id in ['d', 'b', 'e', 'a', 'c']:
+        store.append(conversation_id, 'user', 'hello')
+
+    pages = []
+    cursor = None
+    while True:
+        ids, cursor = store.page_ids(cursor, limit=2)
+        pages.append(ids)
+        if cursor is None:
+            break
+
+    assert pages == [['a', 'b'], ['c', 'd'], ['e']]
+    assert list(store.iter_ids(page_size=2)) == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_message_cursor_survives_trimming():
+    store = InMemoryConversationStore(max_messages=4)
+    for number in range(4):
+        store.append('c1', 'user', f"message {number}")
+
+    messages, cursor = store.page_messages('c1', limit=2)
+    assert [m['message'] for m in messages] == ['message 0', 'message 1']
+
+    # Two newer messages push the first page out of the conversation
+    store.append('c1', 'user', 'message 4')
+    store.append('c1', 'user', 'message 5')
+
+    messages, cursor = store.page_messages('c1', cursor, limit=2)
+    assert [m['message'] for m in messages] == ['message 2', 'message 3']
+    messages, cursor = store.page_messages('c1', cursor, limit=2)
+    assert [m['message'] for m in messages] == ['message 4', 'message 5']
+    assert cursor is None
+
+
+def test_create_conversation_store_reads_environment(monkeypatch):
+    monkeypatch.setenv('CONVERSATION_MAX_MESSAGES', '7')
+    monkeypatch.setenv('CONVERSATION_TTL_SECONDS', '5')
+    store = create_conversation_store('memory')
+
+    assert isinstance(store, InMemoryConversationStore)
+    assert store.stats()['max_messages'] == 7
+    assert store.stats()['ttl_seconds'] == 5
+
+
+def test_create_conversation_store_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        create_conversation_store('redis')
@@ -0,0 +1,65 @@
+"""Tests for the compiled intent classifier (intent_classifier.IntentClassifier)"""
+
+import pytest
+
+import app
+from intent_classifier import IntentClassifier
+
+
+def cascade(intents, message, matched=()):
+    """The elif cascade the classifier replaces"""
+    lower = message.lower()
+    for name, keywords in intents:
+        if name in matched or any(keyword in lower for keyword in keywords):
+            return name
+    return None
+
+
+@pytest.mark.parametrize('message', [
+    'Hello!', 'bye for now', 'what can you do', 'recommend me a college', 'list the universities',
+    'what programs does MIT offer', 'compare harvard vs yale', 'SAT requirements', 'how much is tuition',
+    'where is it', 'what time is it', "what's the date today", 'really?', 'nothing matches here',
+    'THIS IS ABOUT ADMISSION COSTS'
+])
+def test_matches_the_keyword_cascade(message):
+    assert app.INTENT_CLASSIFIER.classify(message) == cascade(app.INTENT_KEYWORDS, message)
+
+
+def test_priority_wins_over_position():
+    classifier = IntentClassifier([('first', ['zebra']), ('second', ['apple'])])
+    assert classifier.classify('apple before zebra') == 'first'
+
+
+def test_overlapping_keywords_are_all_seen():
+    classifier = IntentClassifier([('short', ['ask']), ('long', ['task'])])
+    assert classifier.classify('one task') == 'short'
+
+
+def test_caller_matched_intents_compete_on_priority():
+    classifier = IntentClassifier([('greetings', ['hello']), ('college', []), ('financial', ['tuition'])])
+    assert classifier.classify('tuition at mit', ['college']) == 'college'
+    assert classifier.classify('hello mit', ['college']) == 'greetings'
+    assert classifier.classify('tuition', ['unknown']) == 'financial'
+
+
+def test_no_match_returns_none():
+    assert IntentClassifier([('greetings', ['hello'])]).classify('nothing here') is None
+    assert IntentClassifier([]).classify('hello') is None
+    assert IntentClassifier([('college', [])]).classify('hello') is None
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+def test_chat_answers_by_intent(client):
+    response = client.post('/chat', json={'message': 'hello'})
+    assert response.status_code == 200
+    assert response.get_json()['response'] in app.RESPONSE_PATTERNS['greetings']
+
+
+def test_chat_rejects_empty_and_malformed_messages(client):
+    assert client.post('/chat', json={'message': '   '}).status_code == 400
+    assert client.post('/chat', json={'message': 42}).status_code == 500
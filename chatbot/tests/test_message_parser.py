@@ -0,0 +1,75 @@
+"""Tests for the chat message parser (message_parser)"""
+
+from college_data import get_catalog_version, register_college
+from message_parser import MessageParser, _find_terms, parse_message
+
+
+def test_parse_extracts_entities():
+    parsed = parse_message("Compare Harvard and MIT for computer science, GPA 3.8 and 1450 SAT")
+    assert parsed['colleges'] == ['harvard', 'mit']
+    assert parsed['programs'][0] == 'computer science'
+    assert parsed['gpa'] == 3.8
+    assert parsed['sat'] == 1450
+    assert parsed['act'] is None
+
+
+def test_parse_ignores_out_of_range_scores():
+    parsed = parse_message("my gpa is 7 and I got 99 on the sat")
+    assert parsed['gpa'] is None
+    assert parsed['sat'] is None
+
+
+def test_find_terms_matches_whole_words_leftmost_longest():
+    terms = {'new': 1, 'new york': 2, 'york': 3, 'ork': 4}
+    assert _find_terms('in new york, ork', terms, 8) == [(3, 'new york'), (13, 'ork')]
+    assert _find_terms('newyork', terms, 8) == []
+
+
+def test_new_college_is_recognized_before_the_rebuild():
+    parser = MessageParser()
+    parser.build()
+    built_version = parser._vocabulary[0]
+    parser._refresh = lambda: None  # keep serving the old vocabulary
+
+    register_college('parsertestpolytechnic', {'name': 'Parser Test Polytechnic', 'location': 'Reno, NV'})
+
+    parsed = parser.parse('is parser test polytechnic better than mit?')
+    assert parsed['colleges'] == ['parsertestpolytechnic', 'mit']
+    assert parser._vocabulary[0] == built_version
+
+
+def test_background_rebuild_publishes_and_clears_the_overlay():
+    parser = MessageParser()
+    parser.build()
+    register_college('parsertestacademy', {'name': 'Parser Test Academy', 'location': 'Ogden, UT'})
+    assert parser._recent
+
+    parser.parse('hello')
+    parser._rebuilder.join(timeout=10)
+
+    assert parser._vocabulary[0] == get_catalog_version()
+    assert not parser._recent
+    parsed = parser.parse('parser test academy in ogden')
+    assert parsed['colleges'] == ['parsertestacademy']
+    assert parsed['locations'] == ['ogden']
+
+
+def test_rebuild_published_during_a_parse_is_used():
+    parser = MessageParser()
+    parser.build()
+    parser._refresh = lambda: None
+    register_college('parsertestconservatory', {'name': 'Parser Test Conservatory', 'location': 'Provo, UT'})
+    stale = parser._vocabulary
+
+    class RebuildWhileMatching:
+        """Pattern of the stale vocabulary; a rebuild covering the overlay is published while it runs"""
+
+        def finditer(self, text):
+            parser._rebuild()
+            return stale[2].finditer(text)
+
+    parser._vocabulary = stale[:2] + (RebuildWhileMatching(),) + stale[3:]
+
+    parsed = parser.parse('tell me about parser test conservatory')
+    assert parsed['colleges'] == ['parsertestconservatory']
+    assert not parser._recent
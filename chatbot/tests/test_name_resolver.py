@@ -0,0 +1,67 @@
+"""Tests for college name resolution (college_index.CollegeNameResolver)"""
+
+import copy
+
+import pytest
+
+import app
+from builtin_colleges import BUILTIN_COLLEGES
+from college_data import COLLEGE_LOCATION_ALIASES, COLLEGE_NAME_ALIASES
+from college_index import CollegeNameResolver
+
+
+@pytest.fixture
+def resolver():
+    return CollegeNameResolver(copy.deepcopy(dict(BUILTIN_COLLEGES)),
+                               {**COLLEGE_NAME_ALIASES, **COLLEGE_LOCATION_ALIASES})
+
+
+@pytest.mark.parametrize('name, key', [
+    ('Harvard University', 'harvard'),
+    ('HARVARD', 'harvard'),
+    ('penn', 'upenn'),
+    ('johns hopkins', 'jhu'),
+    ('stan', 'stanford'),
+    ('institute of technology', 'mit'),
+])
+def test_resolves_names_aliases_and_fragments(resolver, name, key):
+    assert resolver.resolve_key(name) == key
+
+
+def test_misspellings_are_only_candidates(resolver):
+    assert resolver.resolve_key('stanfrod') is None
+    assert resolver.resolve('stanfrod')[0][0] == 'stanford'
+    assert resolver.resolve('stanfrod', fuzzy=False) == []
+
+
+def test_unknown_names_resolve_to_nothing(resolver):
+    assert resolver.resolve_key('qqq') is None
+    assert resolver.resolve_key('') is None
+    assert resolver.resolve('   ') == []
+
+
+def test_ranking_breaks_ties_in_catalog_order(resolver):
+    ranked = resolver.resolve('institute of technology', limit=2)
+    assert [key for key, _ in ranked] == ['mit', 'caltech']
+    assert ranked[0][1] == ranked[1][1]
+
+
+def test_renames_and_removals_update_the_resolver(resolver):
+    resolver.build()
+    old = BUILTIN_COLLEGES['rice']
+    renamed = {**old, 'name': 'Owl Valley Institute'}
+    resolver.update('rice', old, renamed)
+    assert resolver.resolve_key('owl valley') == 'rice'
+    assert resolver.resolve_key('rice university') == 'rice'  # the key still resolves
+
+    resolver.update('rice', renamed, None)
+    assert resolver.resolve_key('owl valley') is None
+
+
+def test_college_endpoint_suggests_on_a_miss():
+    client = app.app.test_client()
+    assert client.get('/colleges/stan').get_json()['name'] == 'Stanford University'
+
+    response = client.get('/colleges/stanfrod')
+    assert response.status_code == 404
+    assert response.get_json()['suggestions'][0]['key'] == 'stanford'
@@ -0,0 +1,125 @@
+"""Tests for the encoded payload cache (payload_cache) and the /colleges endpoints"""
+
+import copy
+import gzip
+import json
+
+import pytest
+
+import app
+from builtin_colleges import BUILTIN_COLLEGES
+from college_data import register_college
+from payload_cache import EncodedPayload, PayloadCache, payload_parts
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+@pytest.fixture
+def app_context():
+    with app.app.app_context():
+        yield
+
+
+def test_payload_is_built_once_per_version(app_context):
+    cache = PayloadCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {'count': len(builds)}
+
+    first = cache.get('data', 1, build)
+    assert cache.get('data', 1, build) is first
+    assert json.loads(first.encodings['identity']) == {'count': 1}
+
+    rebuilt = cache.get('data', 2, build)
+    assert json.loads(rebuilt.encodings['identity']) == {'count': 2}
+    assert rebuilt.etag != first.etag
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_least_recently_used_payload_is_evicted(app_context):
+    cache = PayloadCache(max_entries=2)
+    a = cache.get('a', 1, lambda: 'a')
+    cache.get('b', 1, lambda: 'b')
+    cache.get('a', 1, lambda: 'a')
+    cache.get('c', 1, lambda: 'c')
+
+    assert cache.stats()['entries'] == 2
+    assert cache.get('a', 1, lambda: 'a') is a
+    assert cache.stats()['misses'] == 3
+
+
+def test_small_bodies_are_not_compressed():
+    assert list(EncodedPayload(b'{}', 1).encodings) == ['identity']
+    assert 'gzip' in EncodedPayload(b'[' + b'1,' * 1000 + b'1]', 1).encodings
+
+
+@pytest.mark.parametrize('accept_encoding, encoding', [
+    ('gzip', 'gzip'),
+    ('gzip;q=0.5, deflate', 'gzip'),
+    ('*', 'gzip'),
+    ('gzip;q=0', 'identity'),
+    ('gzip;q=bad', 'identity'),
+    ('', 'identity')
+])
+def test_encoding_negotiation(accept_encoding, encoding):
+    payload = EncodedPayload(b'[' + b'1,' * 1000 + b'1]', 1)
+    payload.encodings.pop('br', None)
+    status, body, headers = payload_parts(payload, accept_encoding, None)
+
+    assert status == 200
+    assert body == payload.encodings[encoding]
+    assert headers.get('Content-Encoding') == (None if encoding == 'identity' else encoding)
+    assert headers['ETag'] == payload.etag_for(encoding)
+
+
+@pytest.mark.parametrize('if_none_match', ['"{etag}"', 'W/"{etag}"', '"other", "{etag}-gzip"', '*'])
+def test_matching_etag_gets_a_bodyless_304(if_none_match):
+    payload = EncodedPayload(b'{"a": 1}', 1)
+    status, body, headers = payload_parts(payload, '', if_none_match.format(etag=payload.etag))
+    assert (status, body) == (304, b'')
+    assert headers['ETag'] == payload.etag_for('identity')
+
+
+def test_stale_etag_gets_the_payload():
+    payload = EncodedPayload(b'{"a": 1}', 1)
+    assert payload_parts(payload, '', '"0123456789abcdef0123"')[0] == 200
+
+
+def test_colleges_endpoint_revalidates_with_etag(client):
+    response = client.get('/colleges')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+    etag = response.headers['ETag']
+
+    cached = client.get('/colleges', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    compressed = client.get('/colleges', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(compressed.data)) == response.get_json()
+
+
+def test_catalog_change_invalidates_the_payload(client):
+    etag = client.get('/colleges').headers['ETag']
+
+    college = copy.deepcopy(BUILTIN_COLLEGES['mit'])
+    college['name'] = 'Payloadcache Test Institute'
+    register_college('payloadcachetestinstitute', college)
+
+    response = client.get('/colleges', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert 'Payloadcache Test Institute' in [c['name'] for c in response.get_json()]
+
+
+def test_single_college_payload(client):
+    response = client.get('/colleges/mit')
+    assert response.status_code == 200
+    assert client.get('/colleges/mit', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get('/colleges/nosuchplaceatall').status_code == 404
@@ -0,0 +1,63 @@
+"""Tests for the program search index (college_index.ProgramIndex)"""
+
+import copy
+
+import pytest
+
+import app
+from builtin_colleges import BUILTIN_COLLEGES
+from college_index import ProgramIndex
+
+
+def linear_search(colleges, program):
+    """The scan the index replaces"""
+    program = program.lower()
+    return [key for key, college in colleges.items()
+            if any(program in name for name in ProgramIndex.program_names(college))]
+
+
+@pytest.fixture
+def colleges():
+    return copy.deepcopy({key: BUILTIN_COLLEGES[key] for key in ('harvard', 'mit', 'stanford', 'caltech', 'yale')})
+
+
+@pytest.mark.parametrize('program', ['computer science', 'Engineering', 'eng', 'law', 'medicine', 'ar', 'physics'])
+def test_search_matches_the_linear_scan(colleges, program):
+    assert ProgramIndex(colleges).search(program) == linear_search(colleges, program)
+
+
+def test_words_in_another_order_match_every_word(colleges):
+    index = ProgramIndex(colleges)
+    assert index.search('science computer') == index.search('computer science')
+
+
+def test_unknown_program_finds_nothing(colleges):
+    index = ProgramIndex(colleges)
+    assert index.search('underwater basket weaving') == []
+    assert index.search('zz') == []
+
+
+def test_updates_follow_catalog_changes(colleges):
+    index = ProgramIndex(colleges)
+    index.build()
+    new = {'name': 'Glass School', 'programs': {'undergraduate': ['Glassblowing'], 'graduate': []}}
+    index.update('glass', None, new)
+    assert index.search('glassblowing') == ['glass']
+    assert 'glassblowing' in index.vocabulary()
+
+    index.update('glass', new, None)
+    assert index.search('glassblowing') == []
+    assert 'glassblowing' not in index.vocabulary()
+
+
+def test_records_without_programs_are_indexed():
+    index = ProgramIndex({'bare': {'name': 'Bare College'}, 'empty': {'name': 'Empty', 'programs': None}})
+    assert index.search('anything') == []
+
+
+def test_program_endpoint():
+    client = app.app.test_client()
+    response = client.get('/colleges/search/program?program=computer science')
+    assert response.status_code == 200
+    assert 'Massachusetts Institute of Technology' in {college['name'] for college in response.get_json()}
+    assert client.get('/colleges/search/program').status_code == 400
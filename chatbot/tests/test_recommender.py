@@ -0,0 +1,103 @@
+"""Tests for the top-K college recommender (recommender) and /colleges/recommend"""
+
+import pytest
+
+import app
+from builtin_colleges import BUILTIN_COLLEGES
+from college_columns import CollegeColumns
+from recommender import MAX_RECOMMENDATIONS, CollegeRecommender
+
+KEYS = ('harvard', 'mit', 'stanford', 'berkeley', 'caltech', 'yale', 'princeton', 'columbia')
+
+
+@pytest.fixture
+def recommender():
+    return CollegeRecommender(CollegeColumns({key: BUILTIN_COLLEGES[key] for key in KEYS}))
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+PROFILES = [
+    {},
+    {'gpa': 3.9, 'sat': 1520},
+    {'gpa': 3.5, 'act': 30, 'budget': 40000},
+    {'budget': 20000, 'locations': ['CA']},
+    {'programs': ['engineering', 'law'], 'locations': ['cambridge', 'new york']}
+]
+
+
+@pytest.mark.parametrize('profile', PROFILES)
+def test_top_k_is_the_head_of_the_full_ranking(recommender, profile):
+    everything = recommender.recommend(**profile, limit=len(KEYS))
+    scores = [entry['match_score'] for entry in everything]
+    assert scores == sorted(scores, reverse=True)
+    assert sorted(entry['key'] for entry in everything) == sorted(KEYS)
+
+    assert [entry['key'] for entry in recommender.recommend(**profile, limit=3)] == [
+        entry['key'] for entry in everything[:3]
+    ]
+
+
+def scores(entries):
+    return {entry['key']: entry['match_score'] for entry in entries}
+
+
+def test_preferences_add_their_weight_to_matching_colleges(recommender):
+    base = scores(recommender.recommend(limit=len(KEYS)))
+    assert max(base, key=base.get) == 'harvard'
+
+    located = scores(recommender.recommend(locations=['Pasadena'], limit=len(KEYS)))
+    assert located['caltech'] == pytest.approx(base['caltech'] + 10)
+    assert located['harvard'] == base['harvard']
+
+    cheap = recommender.recommend(budget=60000, locations=['California'], limit=1)[0]
+    assert cheap['key'] == 'berkeley'
+    assert cheap['cost'] is not None
+
+
+def test_admission_chance_needs_a_gpa(recommender):
+    without_gpa = recommender.recommend(sat=1500, limit=2)
+    assert all(entry['admission_score'] is None and entry['chance'] is None for entry in without_gpa)
+
+    with_gpa = recommender.recommend(gpa=4.0, sat=1580, act=35, limit=2)
+    assert all(entry['admission_score'] is not None and entry['chance'] for entry in with_gpa)
+
+
+def test_nothing_to_recommend(recommender):
+    assert recommender.recommend(limit=0) == []
+    assert CollegeRecommender(CollegeColumns({})).recommend(gpa=3.5) == []
+
+
+def test_recommend_endpoint(client):
+    response = client.post('/colleges/recommend', json={'gpa': 3.9, 'sat': 1500, 'limit': 3})
+    assert response.status_code == 200
+    matches = response.get_json()
+    assert len(matches) == 3
+    assert all(match['chance'] for match in matches)
+
+    assert len(client.post('/colleges/recommend', json={}).get_json()) == 5
+    assert len(client.post('/colleges/recommend', json={'limit': 10 ** 6}).get_json()) <= MAX_RECOMMENDATIONS
+
+
+@pytest.mark.parametrize('body, error', [
+    ({'gpa': -1}, 'gpa must be a positive number'),
+    ({'sat': '1500'}, 'sat must be a positive number'),
+    ({'budget': True}, 'budget must be a positive number'),
+    ({'locations': 'CA'}, 'locations must be a list of strings'),
+    ({'programs': [1]}, 'programs must be a list of strings'),
+    ({'limit': 0}, 'limit must be a positive integer'),
+    ({'limit': 2.5}, 'limit must be a positive integer')
+])
+def test_recommend_endpoint_rejects_invalid_profiles(client, body, error):
+    response = client.post('/colleges/recommend', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': error}
+
+
+def test_chat_recommendation():
+    reply = app.get_bot_response('Can you recommend a college in California for computer science?')
+    assert 'Recommended colleges' in reply
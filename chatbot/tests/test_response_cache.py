@@ -0,0 +1,67 @@
+"""Tests for the AI response cache (response_cache.ResponseCache)"""
+
+import pytest
+
+from response_cache import ResponseCache
+
+
+def test_exact_hit_ignores_case_and_punctuation():
+    cache = ResponseCache()
+    cache.put('Tell me about MIT', {'model': 'm'}, 'MIT answer')
+    assert cache.get('tell me about mit?', {'model': 'm'}) == 'MIT answer'
+    assert cache.get('tell me about mit', {'model': 'other'}) is None
+    assert cache.stats()['exact_hits'] == 1
+
+
+def test_time_questions_are_not_cached():
+    cache = ResponseCache()
+    cache.put('what time is it', None, 'noon')
+    assert cache.get('what time is it') is None
+    assert cache.stats()['skipped'] == 1
+
+
+def test_expired_entries_are_not_served():
+    cache = ResponseCache(ttl_seconds=0)
+    cache.put('tell me about mit', None, 'MIT answer')
+    assert cache.get('tell me about mit') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_similar_prompt_with_same_context_hits():
+    cache = ResponseCache(similarity_threshold=0.5)
+    cache.put('what are the admission requirements for stanford', {'model': 'm'}, 'Stanford requirements')
+    cache.put('how much is tuition at yale', {'model': 'm'}, 'Yale tuition')
+
+    assert cache.get('admission requirements for stanford please', {'model': 'm'}) == 'Stanford requirements'
+    assert cache.get('admission requirements for stanford please', {'model': 'other'}) is None
+    assert cache.get('tell me a joke', {'model': 'm'}) is None
+    assert cache.stats()['similar_hits'] == 1
+
+
+def test_similarity_scan_runs_without_the_lock(monkeypatch):
+    cache = ResponseCache(similarity_threshold=0.5)
+    cache.put('what are the admission requirements for stanford', None, 'Stanford requirements')
+    scan = cache._similar_rows
+
+    def unlocked_scan(*args):
+        assert not cache._lock.locked()
+        return scan(*args)
+
+    monkeypatch.setattr(cache, '_similar_rows', unlocked_scan)
+    assert cache.get('admission requirements for stanford please') == 'Stanford requirements'
+
+
+def test_row_reused_during_the_scan_is_not_served(monkeypatch):
+    cache = ResponseCache(max_entries=1, similarity_threshold=0.5)
+    cache.put('what are the admission requirements for stanford', None, 'Stanford requirements')
+    scan = cache._similar_rows
+
+    def scan_then_replace(*args):
+        result = scan(*args)
+        # A concurrent put evicts the entry and reuses its row
+        cache.put('how much is tuition at yale', None, 'Yale tuition')
+        return result
+
+    monkeypatch.setattr(cache, '_similar_rows', scan_then_replace)
+    assert cache.get('admission requirements for stanford please') is None
+    assert cache.stats()['misses'] == 1
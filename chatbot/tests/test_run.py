@@ -0,0 +1,115 @@
+"""Tests for the startup script (run.py): server selection and the gunicorn setup"""
+
+import pytest
+
+import run
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    """Record which server main() starts instead of starting it"""
+    calls = []
+    for name in ('run_dev_server', 'run_gunicorn', 'run_waitress', 'run_uvicorn'):
+        monkeypatch.setattr(run, name, lambda *args, name=name: calls.append((name, args)) or 0)
+    monkeypatch.setattr(run, 'check_dependencies', lambda: True)
+    # No server package is required, so every server can be selected
+    monkeypatch.setattr(run, 'SERVER_PACKAGES', {})
+    monkeypatch.setenv('USE_AI', 'false')
+    return calls
+
+
+def test_default_workers(monkeypatch):
+    monkeypatch.setenv('WEB_CONCURRENCY', '3')
+    assert run.default_workers() == 3
+    monkeypatch.delenv('WEB_CONCURRENCY')
+    monkeypatch.setattr(run.os, 'cpu_count', lambda: 4)
+    assert run.default_workers() == 9
+
+
+def test_main_starts_the_chosen_server(servers):
+    assert run.main(['--server', 'gunicorn', '--workers', '3', '--threads', '2', '--port', '8000']) == 0
+    assert run.main(['--server', 'gunicorn', '--workers', '2', '--no-preload']) == 0
+    assert run.main(['--server', 'waitress', '--threads', '16']) == 0
+    assert run.main(['--server', 'uvicorn']) == 0
+    assert run.main([]) == 0
+
+    assert servers == [
+        ('run_gunicorn', ('basic', '0.0.0.0', 8000, 3, 2, 30, True)),
+        ('run_gunicorn', ('basic', '0.0.0.0', 5000, 2, 4, 30, False)),
+        ('run_waitress', ('basic', '0.0.0.0', 5000, 16)),
+        ('run_uvicorn', ('basic', '0.0.0.0', 5000, 1, 30)),
+        ('run_dev_server', ('basic',))
+    ]
+
+
+def test_ai_mode_enables_ai(servers, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    assert run.main(['--mode', 'ai', '--server', 'uvicorn', '--workers', '2']) == 0
+    assert servers == [('run_uvicorn', ('ai', '0.0.0.0', 5000, 2, 30))]
+    assert run.os.environ['USE_AI'] == 'true'
+
+
+def test_missing_server_package_stops_startup(servers, monkeypatch, capsys):
+    monkeypatch.setattr(run, 'SERVER_PACKAGES', {'gunicorn': ['no_such_server_package']})
+
+    assert run.main(['--server', 'gunicorn']) == 1
+    assert servers == []
+    assert 'pip install no_such_server_package' in capsys.readouterr().out
+
+
+def test_server_failure_is_reported(servers, monkeypatch, capsys):
+    def fail(*args):
+        raise OSError('Address already in use')
+
+    monkeypatch.setattr(run, 'run_waitress', fail)
+    assert run.main(['--server', 'waitress']) == 1
+    assert 'Server failed: Address already in use' in capsys.readouterr().out
+
+
+def test_interrupt_is_a_clean_exit(servers, monkeypatch):
+    def interrupt(*args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(run, 'run_dev_server', interrupt)
+    assert run.main([]) == 0
+
+
+def test_gunicorn_preloads_the_app_before_forking(monkeypatch):
+    base = pytest.importorskip('gunicorn.app.base')
+    started = {}
+
+    def fake_run(application):
+        started['config'] = {key: application.cfg.settings[key].get()
+                             for key in ('bind', 'workers', 'threads', 'worker_class', 'preload_app')}
+        started['app'] = application.load()
+
+    monkeypatch.setattr(base.BaseApplication, 'run', fake_run)
+    warmed = []
+    monkeypatch.setattr(run, 'load_app', lambda mode: warmed.append(mode) or __import__(run.APP_MODULES[mode]))
+
+    assert run.run_gunicorn('basic', '127.0.0.1', 8000, 3, 4, 30, True) == 0
+    assert warmed == ['basic']
+    assert started['config'] == {'bind': ['127.0.0.1:8000'], 'workers': 3, 'threads': 4,
+                                 'worker_class': 'gthread', 'preload_app': True}
+    import app
+    assert started['app'] is app.app
+
+
+def test_gunicorn_single_thread_uses_sync_workers(monkeypatch):
+    base = pytest.importorskip('gunicorn.app.base')
+    started = {}
+    monkeypatch.setattr(base.BaseApplication, 'run',
+                        lambda application: started.update(worker_class=application.cfg.worker_class_str))
+    monkeypatch.setattr(run, 'load_app', lambda mode: pytest.fail('the app must load in the workers'))
+
+    run.run_gunicorn('basic', '127.0.0.1', 8000, 2, 1, 30, False)
+    assert started['worker_class'] == 'sync'
+
+
+def test_load_app_warms_the_caches(monkeypatch):
+    import app
+    warmed = []
+    monkeypatch.setattr(app, 'warm_caches', lambda: warmed.append(True))
+
+    assert run.load_app('basic') is app
+    assert warmed == [True]
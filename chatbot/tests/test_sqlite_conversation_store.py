@@ -0,0 +1,122 @@
+"""Tests for the SQLite conversation store (conversation_store.SQLiteConversationStore)"""
+
+from conversation_store import SQLiteConversationStore, create_conversation_store
+
+
+def make_store(tmp_path, **kwargs):
+    # A long flush interval keeps operations queued until the test flushes
+    kwargs.setdefault('flush_interval', 60)
+    return SQLiteConversationStore(path=str(tmp_path / 'conversations.db'), **kwargs)
+
+
+def texts(messages):
+    return [m['message'] for m in messages]
+
+
+def test_queued_messages_are_visible_before_commit(tmp_path):
+    store = make_store(tmp_path)
+    store.append('c1', 'user', 'hello')
+    store.append('c1', 'assistant', 'hi there')
+
+    assert store.stats()['pending_operations'] == 2
+    assert [(m['role'], m['message']) for m in store.get('c1')] == [('user', 'hello'), ('assistant', 'hi there')]
+    assert 'c1' in store and len(store) == 1
+
+
+def test_flushed_conversations_persist_across_instances(tmp_path):
+    store = make_store(tmp_path)
+    store.append('c1', 'user', 'hello')
+    store.append('c2', 'user', 'bonjour')
+    store.flush()
+
+    stats = store.stats()
+    assert stats['pending_operations'] == 0
+    assert stats['operations_committed'] == 2
+
+    reopened = make_store(tmp_path)
+    assert texts(reopened.get('c1')) == ['hello']
+    assert reopened.ids() == ['c1', 'c2']
+
+
+def test_unknown_conversation_is_empty(tmp_path):
+    store = make_store(tmp_path)
+    assert store.get('missing') == []
+    assert store.page_messages('missing') == ([], None)
+    assert store.delete('missing') is False
+
+
+def test_delete_committed_and_queued(tmp_path):
+    store = make_store(tmp_path)
+    store.append('c1', 'user', 'hello')
+    store.flush()
+    store.append('c1', 'user', 'again')
+
+    assert store.delete('c1') is True
+    assert store.get('c1') == []
+    assert 'c1' not in store and len(store) == 0
+
+    store.flush()
+    assert make_store(tmp_path).get('c1') == []
+
+
+def test_page_ids_merges_queued_changes(tmp_path):
+    store = make_store(tmp_path)
+    for conversation_id in ['a', 'b', 'c', 'd']:
+        store.append(conversation_id, 'user', 'hello')
+    store.flush()
+    store.delete('b')
+    store.append('e', 'user', 'hello')
+
+    assert list(store.iter_ids(page_size=2)) == ['a', 'c', 'd', 'e']
+    ids, cursor = store.page_ids(limit=2)
+    assert ids == ['a', 'c'] and cursor == 'c'
+
+
+def test_page_messages_covers_committed_then_queued(tmp_path):
+    store = make_store(tmp_path)
+    for number in range(3):
+        store.append('c1', 'user', f"message {number}")
+    store.flush()
+    store.append('c1', 'user', 'message 3')
+
+    messages, cursor = store.page_messages('c1', limit=2)
+    assert texts(messages) == ['message 0', 'message 1']
+    messages, cursor = store.page_messages('c1', cursor, limit=2)
+    assert texts(messages) == ['message 2', 'message 3']
+    assert cursor is None
+    assert texts(store.iter_messages('c1', page_size=2)) == ['message 0', 'message 1', 'message 2', 'message 3']
+
+
+def test_full_queue_drops_messages(tmp_path):
+    store = make_store(tmp_path, max_pending=1)
+    store.append('c1', 'user', 'kept')
+    store.append('c1', 'user', 'dropped')
+
+    assert texts(store.get('c1')) == ['kept']
+    assert store.stats()['operations_dropped'] == 1
+    assert store.stats()['messages_appended'] == 1
+
+
+def test_failing_batch_is_dropped_after_retries(tmp_path):
+    store = make_store(tmp_path)
+    store.MAX_WRITE_ATTEMPTS = 1
+    store.SQL_INSERT_MESSAGE = "INSERT INTO no_such_table VALUES (?, ?, ?, ?)"
+    store.append('c1', 'user', 'hello')
+    store.flush()
+
+    stats = store.stats()
+    assert stats['write_errors'] == 1
+    assert stats['operations_dropped'] == 1
+    assert stats['pending_operations'] == 0
+    assert store.get('c1') == []
+
+
+def test_create_conversation_store_reads_environment(monkeypatch, tmp_path):
+    path = str(tmp_path / 'configured.db')
+    monkeypatch.setenv('CONVERSATION_DB', path)
+    monkeypatch.setenv('CONVERSATION_MAX_PENDING', '5')
+    store = create_conversation_store('sqlite')
+
+    assert isinstance(store, SQLiteConversationStore)
+    assert store.stats()['path'] == path
+    assert store.stats()['max_pending'] == 5
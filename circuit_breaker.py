@@ -0,0 +1,180 @@
+"""
+Circuit Breaker
+
+This module stops calling a failing dependency (the AI backend) for a while
+instead of making every request wait for it to fail. The breaker watches the
+outcome of the most recent calls:
+
+- closed: calls go through. When at least ``min_calls`` of the last
+  ``window_size`` calls were made and the share of failures, or of calls
+  slower than ``slow_call_seconds``, reaches its threshold, the breaker opens.
+- open: calls are rejected immediately (the caller falls back) for
+  ``open_seconds``.
+- half-open: then up to ``half_open_probes`` trial calls are let through;
+  if they succeed quickly the breaker closes, otherwise it opens again.
+
+Configuration (environment variables):
+    AI_BREAKER_FAILURE_RATE: Failure share that opens the breaker (default: 0.5)
+    AI_BREAKER_SLOW_SECONDS: Calls slower than this count as slow (default: 5)
+    AI_BREAKER_SLOW_RATE: Slow-call share that opens the breaker (default: 0.8)
+    AI_BREAKER_WINDOW: Number of recent calls considered (default: 20)
+    AI_BREAKER_OPEN_SECONDS: Time before trial calls are let through (default: 30)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Error-rate and latency based circuit breaker with half-open probing
+    """
+
+    def __init__(self, failure_rate_threshold: float = 0.5, slow_call_seconds: float = 5.0,
+                 slow_call_rate_threshold: float = 0.8, window_size: int = 20, min_calls: int = 5,
+                 open_seconds: float = 30.0, half_open_probes: int = 1):
+        """
+        Initialize the breaker (closed)
+
+        Args:
+            failure_rate_threshold: Share of failed calls that opens the breaker
+            slow_call_seconds: Duration above which a call counts as slow
+            slow_call_rate_threshold: Share of slow calls that opens the breaker
+            window_size: Number of most recent calls considered
+            min_calls: Calls needed in the window before the breaker can open
+            open_seconds: Time the breaker stays open before probing
+            half_open_probes: Trial calls allowed at once while half-open
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._state = CLOSED
+        self._outcomes: deque = deque(maxlen=window_size)  # (failed, slow) per call
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'"""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        """Move from open to half-open once the open period is over (caller holds the lock)"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _open(self) -> None:
+        """Open the breaker (caller holds the lock)"""
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self.times_opened += 1
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go through (and reserve a probe slot when half-open)
+
+        Every allowed call must be followed by record_success, record_failure
+        or release.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        """Record a successful call and how long it took"""
+        self._record(False, duration)
+
+    def record_failure(self, duration: float) -> None:
+        """Record a failed call and how long it took"""
+        self._record(True, duration)
+
+    def release(self) -> None:
+        """Give back an allowed call that never reached the backend (no outcome is recorded)"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _record(self, failed: bool, duration: float) -> None:
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            self.calls += 1
+            self.failures += failed
+
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+            if self._state == OPEN:
+                # A call that started before the breaker opened
+                return
+
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) >= self.min_calls:
+                failure_rate = sum(f for f, _ in self._outcomes) / len(self._outcomes)
+                slow_rate = sum(s for _, s in self._outcomes) / len(self._outcomes)
+                if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                    self._open()
+
+    def stats(self) -> Dict:
+        """Get the state, recent failure/slow rates and counters"""
+        with self._lock:
+            self._refresh()
+            window = len(self._outcomes)
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+            return {
+                'state': self._state,
+                'window_calls': window,
+                'failure_rate': round(sum(f for f, _ in self._outcomes) / window, 3) if window else 0.0,
+                'slow_rate': round(sum(s for _, s in self._outcomes) / window, 3) if window else 0.0,
+                'retry_in_seconds': round(retry_in, 1),
+                'calls': self.calls,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened
+            }
+
+
+def create_circuit_breaker() -> CircuitBreaker:
+    """Create a circuit breaker configured by the AI_BREAKER_* environment variables"""
+    return CircuitBreaker(
+        failure_rate_threshold=float(os.getenv('AI_BREAKER_FAILURE_RATE', '0.5')),
+        slow_call_seconds=float(os.getenv('AI_BREAKER_SLOW_SECONDS', '5')),
+        slow_call_rate_threshold=float(os.getenv('AI_BREAKER_SLOW_RATE', '0.8')),
+        window_size=int(os.getenv('AI_BREAKER_WINDOW', '20')),
+        open_seconds=float(os.getenv('AI_BREAKER_OPEN_SECONDS', '30'))
+    )
@@ -5,10 +5,23 @@ This module provides functionality to add, edit, and manage colleges in the data
 It includes validation, data formatting, and easy-to-use functions for administrators.
 """
 
+import csv
 import json
-import os
-from typing import Dict, List, Optional
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 from datetime import datetime
+from catalog_journal import create_catalog_journal
+from college_columns import get_college_columns
+from college_data import COLLEGES_DATA
+from college_index import normalize_college_name
+
+# Runtime catalog changes are journaled to an append-only log and compacted
+# into colleges_backup.json (see catalog_journal)
+CATALOG_JOURNAL = create_catalog_journal()
+
+# Serializes restores, so concurrent requests do not replay the journal twice
+_restore_lock = threading.Lock()
 
 def add_college_to_database(college_data: Dict) -> bool:
     """
@@ -42,21 +55,21 @@ def add_college_to_database(college_data: Dict) -> bool:
             return False
         
         # Generate college key from name
-        college_key = college_data['name'].lower().replace(' ', '').replace('university', '').replace('college', '')
+        college_key = normalize_college_name(college_data['name'])
         
         # Load existing data
-        from college_data import COLLEGES_DATA
+        from college_data import COLLEGES_DATA, register_college
         
         # Check if college already exists
         if college_key in COLLEGES_DATA:
             print(f"Error: College '{college_data['name']}' already exists")
             return False
         
-        # Add to database
-        COLLEGES_DATA[college_key] = college_data
+        # Add to database and update the search indexes
+        register_college(college_key, college_data)
         
-        # Save to file (optional - for persistence)
-        save_colleges_to_file()
+        # Persist in the background (appended to the change log)
+        CATALOG_JOURNAL.record(college_key, college_data)
         
         print(f"Successfully added {college_data['name']} to the database!")
         return True
@@ -148,44 +161,280 @@ def validate_college_data(college_data: Dict) -> List[str]:
     if 'founded' in college_data and not isinstance(college_data['founded'], int):
         errors.append("Founded year must be an integer")
     
-    # Range validations
-    if 'acceptance_rate' in college_data and (college_data['acceptance_rate'] < 0 or college_data['acceptance_rate'] > 100):
+    # Range validations (only for fields of the right type)
+    if isinstance(college_data.get('acceptance_rate'), (int, float)) and (college_data['acceptance_rate'] < 0 or college_data['acceptance_rate'] > 100):
         errors.append("Acceptance rate must be between 0 and 100")
     
-    if 'ranking' in college_data and college_data['ranking'] < 1:
+    if isinstance(college_data.get('ranking'), int) and college_data['ranking'] < 1:
         errors.append("Ranking must be a positive integer")
     
-    if 'founded' in college_data and (college_data['founded'] < 1000 or college_data['founded'] > datetime.now().year):
+    if isinstance(college_data.get('founded'), int) and (college_data['founded'] < 1000 or college_data['founded'] > datetime.now().year):
         errors.append("Founded year must be between 1000 and current year")
     
     return errors
 
 def save_colleges_to_file():
-    """Save colleges data to a JSON file for persistence"""
-    try:
-        from college_data import COLLEGES_DATA
-        with open('colleges_backup.json', 'w') as f:
-            json.dump(COLLEGES_DATA, f, indent=2)
-        print("Colleges data saved to colleges_backup.json")
-    except Exception as e:
-        print(f"Error saving colleges data: {e}")
+    """Fold the change log into the snapshot of runtime changes (atomically) and truncate the log"""
+    CATALOG_JOURNAL.flush()
+    CATALOG_JOURNAL.compact()
+    print(f"Colleges data saved to {CATALOG_JOURNAL.snapshot_path}")
 
 def load_colleges_from_file():
-    """Load colleges data from JSON file"""
+    """Load colleges data from the last snapshot plus the change log"""
     try:
-        if os.path.exists('colleges_backup.json'):
-            with open('colleges_backup.json', 'r') as f:
-                return json.load(f)
-        return {}
+        return CATALOG_JOURNAL.load()
     except Exception as e:
         print(f"Error loading colleges data: {e}")
         return {}
 
+def restore_colleges_from_file() -> int:
+    """
+    Re-register colleges saved by earlier runs that are missing or outdated in COLLEGES_DATA
+
+    Returns:
+        int: Number of colleges restored
+    """
+    from college_data import register_colleges
+
+    with _restore_lock:
+        restored = {
+            college_key: college
+            for college_key, college in load_colleges_from_file().items()
+            if COLLEGES_DATA.get(college_key) != college
+        }
+        register_colleges(restored)
+    return len(restored)
+
+def colleges_file_changed() -> bool:
+    """Tell whether another process has journaled a change since the last restore (two stat calls)"""
+    return CATALOG_JOURNAL.changed_elsewhere()
+
+def refresh_colleges_from_file() -> int:
+    """
+    Restore colleges journaled by other processes (e.g. gunicorn workers) since the last restore
+
+    Returns:
+        int: Number of colleges restored (0 when nothing changed)
+    """
+    if not colleges_file_changed():
+        return 0
+    return restore_colleges_from_file()
+
+# Bulk import
+
+# CSV cells holding lists use this separator, e.g. "Computer Science;Economics"
+CSV_LIST_SEPARATOR = ';'
+CSV_LIST_FIELDS = {'programs.undergraduate', 'programs.graduate', 'notable_features'}
+
+# Per-row errors returned in an import report (the total is always counted)
+MAX_REPORTED_ERRORS = 1000
+
+def detect_import_format(name: str = '', content_type: str = '') -> Optional[str]:
+    """
+    Guess the import format from a file name or content type
+
+    Returns:
+        Optional[str]: 'ndjson', 'csv' or 'json', or None if unknown
+    """
+    name = name.lower()
+    content_type = content_type.lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonlines' in content_type:
+        return 'ndjson'
+    if name.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    if name.endswith('.json') or 'json' in content_type:
+        return 'json'
+    return None
+
+def _csv_value(column: str, value: str):
+    """Convert a CSV cell to the type used in COLLEGES_DATA"""
+    if column in CSV_LIST_FIELDS:
+        return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+def _csv_record(row: Dict[str, str]) -> Dict:
+    """Turn a CSV row with dotted column names (e.g. tuition.undergraduate) into a nested record"""
+    record: Dict = {}
+    for column, value in row.items():
+        if column is None or value is None or value.strip() == '':
+            continue
+        value = value.strip()
+        target = record
+        *parents, field = column.strip().split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[field] = _csv_value(column.strip(), value)
+    return record
+
+def _iter_json_array(stream: TextIO, chunk_size: int = 65536) -> Iterator[object]:
+    """Decode the elements of a JSON array one at a time without reading the whole stream"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    exhausted = False
+
+    while True:
+        # Skip whitespace and separators between elements
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != '[':
+                raise ValueError("Expected a JSON array of colleges")
+            started = True
+            position += 1
+            continue
+        if started and position < len(buffer) and buffer[position] == ']':
+            return
+
+        if position < len(buffer):
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if exhausted:
+                    raise
+                item = end = None
+            # An element decoded at the very end of the buffer may be a
+            # truncated number, so only accept it once more data is known
+            if end is not None and (end < len(buffer) or exhausted):
+                yield item
+                position = end
+                continue
+
+        if exhausted:
+            raise ValueError("Unexpected end of JSON array")
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            exhausted = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+def iter_college_records(stream: TextIO, file_format: str) -> Iterator[Tuple[int, object]]:
+    """
+    Stream-parse college records from an import file
+
+    Args:
+        stream: Text stream with the file contents
+        file_format: 'ndjson', 'csv' or 'json' (an array of college objects)
+
+    Yields:
+        Tuple[int, object]: Row number (1-based) and the parsed record, or the
+        ValueError raised while parsing that row
+    """
+    if file_format == 'ndjson':
+        for row, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield row, json.loads(line)
+            except ValueError as e:
+                yield row, ValueError(f"Invalid JSON: {e}")
+    elif file_format == 'csv':
+        for row, values in enumerate(csv.DictReader(stream), 1):
+            yield row, _csv_record(values)
+    elif file_format == 'json':
+        for row, item in enumerate(_iter_json_array(stream), 1):
+            yield row, item
+    else:
+        raise ValueError(f"Unsupported import format: {file_format}")
+
+def import_colleges(records: Iterable[Tuple[int, object]], batch_size: int = 1000,
+                    replace_existing: bool = False) -> Dict:
+    """
+    Validate and add colleges in bulk
+
+    Valid rows are committed in batches: each batch updates the indexes and
+    bumps the catalog version once and is journaled as a single write.
+
+    Args:
+        records: (row number, record) pairs, e.g. from iter_college_records
+        batch_size: Number of valid colleges committed together
+        replace_existing: Overwrite colleges that are already in the database
+
+    Returns:
+        Dict: Import report with counts and per-row errors
+    """
+    from college_data import register_colleges
+
+    report = {'imported': 0, 'rejected': 0, 'errors': []}
+    batch: Dict[str, Dict] = {}
+
+    def reject(row: int, errors: List[str], name: Optional[str] = None):
+        report['rejected'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row, 'name': name, 'errors': errors})
+
+    def commit():
+        register_colleges(batch)
+        CATALOG_JOURNAL.record_many(batch.items())
+        report['imported'] += len(batch)
+        batch.clear()
+
+    try:
+        for row, record in records:
+            if isinstance(record, Exception):
+                reject(row, [str(record)])
+                continue
+            if not isinstance(record, dict):
+                reject(row, ["Row must be a college object"])
+                continue
+
+            name = record.get('name')
+            errors = validate_college_data(record)
+            if not isinstance(name, str) or not name.strip():
+                errors.append("Name must be a non-empty string")
+            if errors:
+                reject(row, errors, name if isinstance(name, str) else None)
+                continue
+
+            college_key = normalize_college_name(name)
+            if college_key in batch or (not replace_existing and college_key in COLLEGES_DATA):
+                reject(row, [f"College '{name}' already exists"], name)
+                continue
+
+            batch[college_key] = record
+            if len(batch) >= batch_size:
+                commit()
+    except ValueError as e:
+        # The file itself is malformed; keep what was committed so far
+        report['errors'].append({'row': None, 'name': None, 'errors': [str(e)]})
+        report['rejected'] += 1
+
+    if batch:
+        commit()
+
+    report['truncated_errors'] = report['rejected'] > len(report['errors'])
+    return report
+
+def import_colleges_from_file(path: str, file_format: Optional[str] = None, **options) -> Dict:
+    """
+    Import colleges from an NDJSON, CSV or JSON file
+
+    Args:
+        path: File to import
+        file_format: 'ndjson', 'csv' or 'json' (default: from the file extension)
+        **options: Passed to import_colleges
+
+    Returns:
+        Dict: Import report (see import_colleges)
+    """
+    file_format = file_format or detect_import_format(path)
+    if file_format is None:
+        raise ValueError(f"Cannot tell the format of {path}; use .ndjson, .csv or .json")
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        return import_colleges(iter_college_records(f, file_format), **options)
+
 def list_all_colleges() -> List[Dict]:
     """Get list of all colleges with basic information"""
+    from catalog_store import scan_catalog
     from college_data import COLLEGES_DATA
     colleges = []
-    for key, college in COLLEGES_DATA.items():
+    for key, college in scan_catalog(COLLEGES_DATA):
         colleges.append({
             'key': key,
             'name': college['name'],
@@ -200,77 +449,55 @@ def search_colleges_by_criteria(criteria: Dict) -> List[Dict]:
     Search colleges by various criteria
     
     Args:
-        criteria: Dictionary with search criteria
+        criteria: Dictionary with search criteria (min_ranking, max_ranking,
+                  min/max_acceptance_rate, min/max_tuition, min/max_population,
+                  location, type)
         
     Returns:
-        List[Dict]: Matching colleges
+        List[Dict]: Matching colleges sorted by ranking
     """
-    from college_data import COLLEGES_DATA
-    results = []
-    
-    for key, college in COLLEGES_DATA.items():
-        match = True
-        
-        # Search by ranking range
-        if 'min_ranking' in criteria and college['ranking'] > criteria['min_ranking']:
-            match = False
-        if 'max_ranking' in criteria and college['ranking'] < criteria['max_ranking']:
-            match = False
-        
-        # Search by acceptance rate range
-        if 'min_acceptance_rate' in criteria and college['acceptance_rate'] < criteria['min_acceptance_rate']:
-            match = False
-        if 'max_acceptance_rate' in criteria and college['acceptance_rate'] > criteria['max_acceptance_rate']:
-            match = False
-        
-        # Search by location
-        if 'location' in criteria and criteria['location'].lower() not in college['location'].lower():
-            match = False
-        
-        # Search by type
-        if 'type' in criteria and criteria['type'].lower() not in college['type'].lower():
-            match = False
-        
-        if match:
-            results.append(college)
-    
-    return sorted(results, key=lambda x: x['ranking'])
+    columns = get_college_columns()
+    return [columns.college(row) for row in columns.filter_rows(criteria)]
 
 def get_college_statistics() -> Dict:
-    """Get statistics about the college database"""
-    from college_data import COLLEGES_DATA
-    
-    if not COLLEGES_DATA:
-        return {"error": "No colleges in database"}
-    
-    colleges = list(COLLEGES_DATA.values())
-    
-    stats = {
-        "total_colleges": len(colleges),
-        "average_acceptance_rate": sum(c['acceptance_rate'] for c in colleges) / len(colleges),
-        "average_tuition": sum(c['tuition']['undergraduate'] for c in colleges) / len(colleges),
-        "rankings_range": {
-            "min": min(c['ranking'] for c in colleges),
-            "max": max(c['ranking'] for c in colleges)
-        },
-        "colleges_by_type": {},
-        "colleges_by_state": {}
-    }
-    
-    # Count by type
-    for college in colleges:
-        college_type = college['type']
-        stats['colleges_by_type'][college_type] = stats['colleges_by_type'].get(college_type, 0) + 1
-    
-    # Count by state
-    for college in colleges:
-        state = college['location'].split(',')[-1].strip()
-        stats['colleges_by_state'][state] = stats['colleges_by_state'].get(state, 0) + 1
-    
-    return stats
+    """Get statistics about the college database (maintained incrementally on every change)"""
+    from college_data import CATALOG_STATISTICS
+    return CATALOG_STATISTICS.snapshot()
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: python college_admin.py import <file> [--format F] [--replace]"""
+    if len(argv) < 2 or argv[0] != 'import':
+        print("Usage: python college_admin.py import <colleges.ndjson|.csv|.json> [--format ndjson|csv|json] [--replace]")
+        return 2
+
+    path = argv[1]
+    file_format = None
+    if '--format' in argv:
+        index = argv.index('--format')
+        file_format = argv[index + 1] if index + 1 < len(argv) else None
+
+    # Colleges added at runtime (and by earlier imports) count as existing
+    restore_colleges_from_file()
+
+    try:
+        report = import_colleges_from_file(path, file_format, replace_existing='--replace' in argv)
+    except (OSError, ValueError) as e:
+        print(f"Error importing colleges: {e}")
+        return 1
+
+    # Fold the imported colleges (with everything already journaled) into a fresh snapshot
+    save_colleges_to_file()
+
+    for error in report['errors']:
+        print(f"  Row {error['row']} ({error['name'] or 'unknown'}): {'; '.join(error['errors'])}")
+    print(f"Imported {report['imported']} colleges, rejected {report['rejected']}")
+    return 0 if report['rejected'] == 0 else 1
 
 # Example usage and testing
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main(sys.argv[1:]))
+
     print("College Administration Interface")
     print("=" * 40)
     
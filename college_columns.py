@@ -0,0 +1,179 @@
+"""
+Columnar College Snapshot
+
+This module keeps a column-oriented copy of COLLEGES_DATA: one NumPy array
+per numeric field and a string table (unique values plus integer codes) for
+text fields such as location and type. Range filters, sorts and aggregates
+over the catalog then run as vectorized array operations instead of walking
+every college dict.
+
+The snapshot is rebuilt lazily the first time it is requested after the
+catalog version changes, which suits criteria searches. The admin statistics
+page is read far more often than the catalog changes, so its aggregates are
+maintained incrementally instead (college_index.CatalogStatistics).
+
+Example usage:
+    from college_columns import get_college_columns
+
+    columns = get_college_columns()
+    rows = columns.filter_rows({'max_acceptance_rate': 10})
+    names = [columns.college(i)['name'] for i in rows]
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from catalog_store import scan_catalog
+from college_data import COLLEGES_DATA, get_catalog_version, get_undergraduate_tuition
+
+
+class StringColumn:
+    """
+    Dictionary-encoded string column
+
+    Values are stored once in ``table`` and each row holds an integer code
+    into it, so substring matching only has to look at the distinct values.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        table: Dict[str, int] = {}
+        codes = [table.setdefault(value, len(table)) for value in values]
+        self.table: List[str] = list(table)
+        self.codes = np.array(codes, dtype=np.int32)
+        self._lowered = [value.lower() for value in self.table]
+
+    def contains(self, fragment: str) -> np.ndarray:
+        """Boolean row mask of values containing fragment (case-insensitive)"""
+        fragment = fragment.lower()
+        matching = np.array([fragment in value for value in self._lowered], dtype=bool)
+        if not len(matching):
+            return np.zeros(len(self.codes), dtype=bool)
+        return matching[self.codes]
+
+    def equals_any(self, values: Iterable[str]) -> np.ndarray:
+        """Boolean row mask of values equal to any of values (case-insensitive)"""
+        wanted = {value.lower() for value in values}
+        matching = np.array([value in wanted for value in self._lowered], dtype=bool)
+        if not len(matching):
+            return np.zeros(len(self.codes), dtype=bool)
+        return matching[self.codes]
+
+    def counts(self) -> Dict[str, int]:
+        """Count rows per distinct value"""
+        counts = np.bincount(self.codes, minlength=len(self.table))
+        return {value: int(count) for value, count in zip(self.table, counts) if count}
+
+
+def _number(value) -> float:
+    """Convert a field to float, using NaN for missing or non-numeric values"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return np.nan
+
+
+class CollegeColumns:
+    """
+    Column-oriented snapshot of the college catalog
+    """
+
+    def __init__(self, colleges: Dict[str, Dict], version: int = 0):
+        """
+        Build the snapshot
+
+        Args:
+            colleges: Mapping of college key to college record
+            version: Catalog version the snapshot was built from
+        """
+        self.version = version
+        self.keys: List[str] = []
+        records: List[Dict] = []
+        for key, college in scan_catalog(colleges):
+            self.keys.append(key)
+            records.append(college)
+        self.rows: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+
+        def column(getter) -> np.ndarray:
+            return np.array([_number(getter(c)) for c in records], dtype=np.float64)
+
+        self.ranking = column(lambda c: c.get('ranking'))
+        self.acceptance_rate = column(lambda c: c.get('acceptance_rate'))
+        self.tuition = column(lambda c: get_undergraduate_tuition(c))
+        self.room_board = column(lambda c: (c.get('tuition') or {}).get('room_board'))
+        self.student_population = column(lambda c: (c.get('campus_life') or {}).get('student_population'))
+        self.gpa = column(lambda c: (c.get('admission_requirements') or {}).get('gpa'))
+        self.sat = column(lambda c: (c.get('admission_requirements') or {}).get('sat_score'))
+        self.act = column(lambda c: (c.get('admission_requirements') or {}).get('act_score'))
+
+        self.location = StringColumn(c.get('location', '') for c in records)
+        self.type = StringColumn(c.get('type', '') for c in records)
+        self.state = StringColumn(c.get('location', '').split(',')[-1].strip() for c in records)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def college(self, row: int) -> Dict:
+        """Get the college record of a row"""
+        return COLLEGES_DATA[self.keys[row]]
+
+    def filter_rows(self, criteria: Dict) -> np.ndarray:
+        """
+        Find rows matching search criteria, sorted by ranking
+
+        Args:
+            criteria: Same keys as college_admin.search_colleges_by_criteria
+
+        Returns:
+            np.ndarray: Matching row numbers
+        """
+        mask = np.ones(len(self.keys), dtype=bool)
+
+        # Note: min_ranking/max_ranking bound the ranking number from above
+        # and below respectively, as search_colleges_by_criteria always has
+        if 'min_ranking' in criteria:
+            mask &= self.ranking <= criteria['min_ranking']
+        if 'max_ranking' in criteria:
+            mask &= self.ranking >= criteria['max_ranking']
+
+        if 'min_acceptance_rate' in criteria:
+            mask &= self.acceptance_rate >= criteria['min_acceptance_rate']
+        if 'max_acceptance_rate' in criteria:
+            mask &= self.acceptance_rate <= criteria['max_acceptance_rate']
+
+        if 'min_tuition' in criteria:
+            mask &= self.tuition >= criteria['min_tuition']
+        if 'max_tuition' in criteria:
+            mask &= self.tuition <= criteria['max_tuition']
+
+        if 'min_population' in criteria:
+            mask &= self.student_population >= criteria['min_population']
+        if 'max_population' in criteria:
+            mask &= self.student_population <= criteria['max_population']
+
+        if 'location' in criteria:
+            mask &= self.location.contains(criteria['location'])
+        if 'type' in criteria:
+            mask &= self.type.contains(criteria['type'])
+
+        rows = np.flatnonzero(mask)
+        return rows[np.argsort(self.ranking[rows], kind='stable')]
+
+
+_snapshot: Optional[CollegeColumns] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_college_columns() -> CollegeColumns:
+    """Get the columnar snapshot of COLLEGES_DATA, rebuilding it if the catalog changed"""
+    global _snapshot
+
+    snapshot = _snapshot
+    version = get_catalog_version()
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != get_catalog_version():
+            _snapshot = CollegeColumns(COLLEGES_DATA, get_catalog_version())
+        return _snapshot
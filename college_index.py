@@ -0,0 +1,588 @@
+"""
+College Search Indexes
+
+This module contains in-memory indexes and running aggregates built over
+COLLEGES_DATA so that lookups do not have to walk every college record.
+Indexes are built once when the catalog is loaded and are kept in sync
+through ``update`` whenever a college is added or replaced (see
+``college_data.register_college``).
+
+Example usage:
+    from college_index import ProgramIndex
+
+    index = ProgramIndex(COLLEGES_DATA)
+    keys = index.search("computer science")
+"""
+
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from catalog_store import scan_catalog
+
+
+def get_undergraduate_tuition(college: Dict) -> Optional[int]:
+    """
+    Get a college's undergraduate sticker price
+
+    Public universities list in-state and out-of-state tuition instead of a
+    single figure; the out-of-state price is used for them.
+    """
+    tuition = college.get('tuition') or {}
+    if 'undergraduate' in tuition:
+        return tuition['undergraduate']
+    return tuition.get('undergraduate_out_state')
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Return the set of 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CatalogIndex:
+    """
+    Base class of the indexes below: built from the catalog on first use
+
+    Building reads (and, for a compiled catalog file, decodes) every record,
+    so it waits until the index is first queried or ``build`` is called.
+    Changes passed to ``update`` before then are ignored, as the build reads
+    the catalog as it is at that point. Code that changes the catalog holds
+    ``lock`` while it does, so a build never sees half a change.
+    """
+
+    def __init__(self, colleges: Optional[Dict[str, Dict]] = None, lock: Optional[threading.RLock] = None):
+        """
+        Args:
+            colleges: Mapping of college key to college record (optional)
+            lock: Lock held by the code changing the catalog (optional)
+        """
+        self._source = colleges if colleges is not None else {}
+        self._build_lock = lock or threading.RLock()
+        self._built = False
+
+    def build(self) -> None:
+        """Index every college of the catalog now (no-op once built)"""
+        if self._built:
+            return
+        with self._build_lock:
+            if not self._built:
+                for key, college in scan_catalog(self._source):
+                    self._apply(key, None, college)
+                self._built = True
+
+    def update(self, college_key: str, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """
+        Apply a catalog change to the index (ignored until it is built)
+
+        Args:
+            college_key: Key of the changed college
+            old: Previous college record, or None when the college is new
+            new: New college record, or None when the college was removed
+        """
+        with self._build_lock:
+            if self._built:
+                self._apply(college_key, old, new)
+
+    def _apply(self, college_key: str, old: Optional[Dict], new: Optional[Dict]) -> None:
+        raise NotImplementedError
+
+
+class ProgramIndex(CatalogIndex):
+    """
+    Inverted index from program name to college keys
+
+    Matching follows ``search_colleges_by_program``: a college matches when
+    the query is a substring of any of its undergraduate or graduate program
+    names. Substring lookups go through a trigram index over the (small)
+    program vocabulary; queries whose words appear in a different order or
+    spacing fall back to matching every word.
+    """
+
+    def __init__(self, colleges: Optional[Dict[str, Dict]] = None, lock: Optional[threading.RLock] = None):
+        """
+        Create the index (built on first use)
+
+        Args:
+            colleges: Mapping of college key to college record (optional)
+            lock: Lock held by the code changing the catalog (optional)
+        """
+        super().__init__(colleges, lock)
+        self._ordinals: Dict[str, int] = {}
+        self._programs: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._next_ordinal = 0
+
+    @staticmethod
+    def program_names(college: Dict) -> Set[str]:
+        """Return the lowercased undergraduate and graduate program names of a college"""
+        programs = college.get('programs') or {}
+        names = list(programs.get('undergraduate', [])) + list(programs.get('graduate', []))
+        return {name.lower() for name in names if name}
+
+    def _apply(self, college_key: str, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """Apply a catalog change to the index"""
+        old_names = self.program_names(old) if old else set()
+        new_names = self.program_names(new) if new else set()
+
+        for name in old_names - new_names:
+            keys = self._programs.get(name)
+            if keys is None:
+                continue
+            keys.discard(college_key)
+            if not keys:
+                self._forget_program(name)
+
+        for name in new_names - old_names:
+            if name not in self._programs:
+                self._programs[name] = set()
+                for gram in _trigrams(name):
+                    self._trigrams.setdefault(gram, set()).add(name)
+                for token in name.split():
+                    self._tokens.setdefault(token, set()).add(name)
+            self._programs[name].add(college_key)
+
+        if new is None:
+            self._ordinals.pop(college_key, None)
+        elif college_key not in self._ordinals:
+            self._ordinals[college_key] = self._next_ordinal
+            self._next_ordinal += 1
+
+    def _forget_program(self, name: str) -> None:
+        """Drop a program name that no college offers any more"""
+        del self._programs[name]
+        for gram in _trigrams(name):
+            names = self._trigrams.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._trigrams[gram]
+        for token in name.split():
+            names = self._tokens.get(token)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._tokens[token]
+
+    def matching_programs(self, program: str) -> List[str]:
+        """
+        Find indexed program names matching a query
+
+        Args:
+            program: Program name or fragment
+
+        Returns:
+            List[str]: Lowercased program names containing the query
+        """
+        self.build()
+        query = program.lower()
+        if not query:
+            return list(self._programs)
+
+        grams = _trigrams(query)
+        if grams:
+            candidates = None
+            for gram in sorted(grams, key=lambda g: len(self._trigrams.get(g, ()))):
+                names = self._trigrams.get(gram)
+                if not names:
+                    return self._match_tokens(query)
+                candidates = set(names) if candidates is None else candidates & names
+                if not candidates:
+                    return self._match_tokens(query)
+        else:
+            candidates = self._programs.keys()
+
+        matches = [name for name in candidates if query in name]
+        return matches or self._match_tokens(query)
+
+    def _match_tokens(self, query: str) -> List[str]:
+        """Match program names containing every word of a multi-word query"""
+        tokens = query.split()
+        if len(tokens) < 2:
+            return []
+
+        candidates = None
+        for token in tokens:
+            names = set()
+            for indexed in self._tokens_containing(token):
+                names |= self._tokens[indexed]
+            candidates = names if candidates is None else candidates & names
+            if not candidates:
+                return []
+        return list(candidates)
+
+    def _tokens_containing(self, fragment: str) -> Iterable[str]:
+        """Yield indexed tokens that contain fragment"""
+        if fragment in self._tokens:
+            yield fragment
+        for token in self._tokens:
+            if token != fragment and fragment in token:
+                yield token
+
+    def search(self, program: str) -> List[str]:
+        """
+        Search college keys by program
+
+        Args:
+            program: Program name or fragment
+
+        Returns:
+            List[str]: Matching college keys in catalog order
+        """
+        keys = set()
+        for name in self.matching_programs(program):
+            keys |= self._programs[name]
+        return sorted(keys, key=self._ordinals.__getitem__)
+
+    def vocabulary(self) -> List[str]:
+        """Return every indexed program name"""
+        self.build()
+        return list(self._programs)
+
+
+def normalize_college_name(name: str) -> str:
+    """Normalize a college name the way college keys are generated"""
+    return name.lower().replace(' ', '').replace('university', '').replace('college', '')
+
+
+class _TrieNode:
+    """Node of the normalized-name trie"""
+
+    __slots__ = ('children', 'keys', 'best')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.keys: Set[str] = set()
+        # (ordinal, key) of the first keys in the subtree, in catalog order
+        self.best: List[Tuple[int, str]] = []
+
+
+class CollegeNameResolver(CatalogIndex):
+    """
+    Resolve free-form college names to college keys
+
+    Lookups are answered from, in order of preference:
+    1. An exact alias map (explicit aliases, college keys and full names)
+    2. A trie of normalized names, matched from the start of any word
+    3. A trigram index, used for substring matches anywhere in a name and
+       for ranking fuzzy (misspelled) matches
+
+    Example usage:
+        resolver = CollegeNameResolver(COLLEGES_DATA, {"penn": "upenn"})
+        resolver.resolve("Johns Hopkins")  # -> [("jhu", 0.9)]
+    """
+
+    ALIAS_SCORE = 1.0
+    PREFIX_SCORE = 0.9
+    SUBSTRING_SCORE = 0.8
+    FUZZY_WEIGHT = 0.7
+
+    # Minimum Dice coefficient between trigram sets for a fuzzy candidate
+    FUZZY_THRESHOLD = 0.4
+
+    # Keys kept per trie node for prefix matches: the first ones in catalog
+    # order, which is how resolve breaks ties between prefix matches
+    MAX_PREFIX_KEYS = 64
+
+    def __init__(self, colleges: Optional[Dict[str, Dict]] = None, aliases: Optional[Dict[str, str]] = None,
+                 lock: Optional[threading.RLock] = None):
+        """
+        Create the resolver (built on first use)
+
+        Args:
+            colleges: Mapping of college key to college record (optional)
+            aliases: Extra alias -> college key mappings (optional)
+            lock: Lock held by the code changing the catalog (optional)
+        """
+        super().__init__(colleges, lock)
+        self._explicit_aliases: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._gram_counts: Dict[str, int] = {}
+        self._ordinals: Dict[str, int] = {}
+        self._trie = _TrieNode()
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._next_ordinal = 0
+
+        for alias, key in (aliases or {}).items():
+            self.add_alias(alias, key)
+
+    def add_alias(self, alias: str, college_key: str) -> None:
+        """Map an alias (any spelling, normalized on insert) to a college key"""
+        normalized = normalize_college_name(alias)
+        self._explicit_aliases[normalized] = college_key
+        self._aliases[normalized] = college_key
+
+    @staticmethod
+    def _word_suffixes(name: str) -> Set[str]:
+        """Return the normalized name starting at each of its words"""
+        words = name.lower().split()
+        suffixes = {normalize_college_name(' '.join(words[i:])) for i in range(len(words))}
+        suffixes.discard('')
+        return suffixes
+
+    def _apply(self, college_key: str, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """Apply a catalog change to the resolver"""
+        old_name = old.get('name', '') if old else ''
+        new_name = new.get('name', '') if new else ''
+
+        if old and old_name != new_name:
+            self._unindex(college_key, old_name)
+        if new is None:
+            self._aliases.pop(college_key, None)
+            self._ordinals.pop(college_key, None)
+            self._names.pop(college_key, None)
+            self._gram_counts.pop(college_key, None)
+            return
+
+        if college_key not in self._ordinals:
+            self._ordinals[college_key] = self._next_ordinal
+            self._next_ordinal += 1
+        self._aliases.setdefault(college_key, college_key)
+
+        if not old or old_name != new_name:
+            self._index(college_key, new_name)
+
+    def _index(self, college_key: str, name: str) -> None:
+        """Add a college name to the alias map, trie and trigram index"""
+        normalized = normalize_college_name(name)
+        self._names[college_key] = normalized
+        self._gram_counts[college_key] = len(_trigrams(normalized))
+        if normalized:
+            self._aliases.setdefault(normalized, college_key)
+
+        entry = (self._ordinals[college_key], college_key)
+        for suffix in self._word_suffixes(name):
+            node = self._trie
+            for char in suffix:
+                node = node.children.setdefault(char, _TrieNode())
+                self._add_best(node, entry)
+            node.keys.add(college_key)
+
+        for gram in _trigrams(normalized):
+            self._trigrams.setdefault(gram, set()).add(college_key)
+
+    def _unindex(self, college_key: str, name: str) -> None:
+        """Remove a college name from the alias map, trie and trigram index"""
+        normalized = normalize_college_name(name)
+        if normalized not in self._explicit_aliases and self._aliases.get(normalized) == college_key:
+            del self._aliases[normalized]
+
+        for suffix in self._word_suffixes(name):
+            path = [self._trie]
+            for char in suffix:
+                node = path[-1].children.get(char)
+                if node is None:
+                    break
+                path.append(node)
+            else:
+                path[-1].keys.discard(college_key)
+                for depth in range(len(suffix), 0, -1):
+                    node = path[depth]
+                    if node.keys or node.children:
+                        self._refill_best(node)
+                    else:
+                        del path[depth - 1].children[suffix[depth - 1]]
+
+        for gram in _trigrams(normalized):
+            keys = self._trigrams.get(gram)
+            if keys is not None:
+                keys.discard(college_key)
+                if not keys:
+                    del self._trigrams[gram]
+
+    def _add_best(self, node: _TrieNode, entry: Tuple[int, str]) -> None:
+        """Offer a key to a node's list of first keys"""
+        best = node.best
+        if entry in best or (len(best) >= self.MAX_PREFIX_KEYS and entry > best[-1]):
+            return
+        best.append(entry)
+        best.sort()
+        del best[self.MAX_PREFIX_KEYS:]
+
+    def _refill_best(self, node: _TrieNode) -> None:
+        """Recompute a node's first keys from its own keys and its children's lists"""
+        entries = {(self._ordinals[key], key) for key in node.keys}
+        for child in node.children.values():
+            entries.update(child.best)
+        node.best = heapq.nsmallest(self.MAX_PREFIX_KEYS, entries)
+
+    def _prefix_keys(self, query: str) -> List[str]:
+        """Keys of names with a word starting with query (the first MAX_PREFIX_KEYS in catalog order)"""
+        node = self._trie
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [key for _, key in node.best]
+
+    def resolve(self, name: str, limit: int = 5, fuzzy: bool = True) -> List[Tuple[str, float]]:
+        """
+        Rank college keys matching a name
+
+        Args:
+            name: College name, alias or fragment
+            limit: Maximum number of candidates to return
+            fuzzy: Whether to include misspelled (trigram similarity) matches
+
+        Returns:
+            List[Tuple[str, float]]: (college key, score) pairs, best first
+        """
+        self.build()
+        query = normalize_college_name(name)
+        if not query:
+            return []
+
+        scores: Dict[str, float] = {}
+
+        alias_key = self._aliases.get(query)
+        if alias_key in self._ordinals:
+            scores[alias_key] = self.ALIAS_SCORE
+
+        for key in self._prefix_keys(query):
+            scores.setdefault(key, self.PREFIX_SCORE)
+
+        grams = _trigrams(query)
+        if grams:
+            counts: Dict[str, int] = {}
+            for gram in grams:
+                for key in self._trigrams.get(gram, ()):
+                    counts[key] = counts.get(key, 0) + 1
+            for key, shared in counts.items():
+                if key in scores:
+                    continue
+                if shared == len(grams) and query in self._names[key]:
+                    scores[key] = self.SUBSTRING_SCORE
+                elif fuzzy:
+                    similarity = 2.0 * shared / (len(grams) + self._gram_counts[key])
+                    if similarity >= self.FUZZY_THRESHOLD:
+                        scores[key] = self.FUZZY_WEIGHT * similarity
+        else:
+            for key, normalized in self._names.items():
+                if key not in scores and query in normalized:
+                    scores[key] = self.SUBSTRING_SCORE
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._ordinals[item[0]]))
+        return ranked[:limit]
+
+    def resolve_key(self, name: str) -> Optional[str]:
+        """Return the best exact, prefix or substring match for a name, or None"""
+        ranked = self.resolve(name, limit=1, fuzzy=False)
+        return ranked[0][0] if ranked else None
+
+
+class CatalogStatistics(CatalogIndex):
+    """
+    Running aggregates over the catalog for the admin statistics page
+
+    Every catalog change adjusts the totals, sums and histograms in O(1), so
+    reading the statistics never walks the catalog. Ranking extremes are
+    tracked with a histogram of ranking values and only rescanned (over the
+    distinct rankings) when the current minimum or maximum is removed.
+
+    Sums are kept as integers (values in millionths), so adding and removing
+    the same records any number of times leaves no floating-point drift.
+    Updates and snapshots are serialized by a lock, as admin changes arrive
+    on request threads.
+    """
+
+    # Fixed-point scale of the acceptance rate and tuition sums
+    SCALE = 1000000
+
+    def __init__(self, colleges: Optional[Dict[str, Dict]] = None, lock: Optional[threading.RLock] = None):
+        """
+        Create the aggregates (computed on first use)
+
+        Args:
+            colleges: Mapping of college key to college record (optional)
+            lock: Lock held by the code changing the catalog (optional)
+        """
+        super().__init__(colleges, lock)
+        self.total = 0
+        self._acceptance_sum = 0
+        self._acceptance_count = 0
+        self._tuition_sum = 0
+        self._tuition_count = 0
+        self._rankings: Counter = Counter()
+        self._min_ranking: Optional[int] = None
+        self._max_ranking: Optional[int] = None
+        self.by_type: Counter = Counter()
+        self.by_state: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _state(college: Dict) -> str:
+        """Get the state part of a college's 'City, State' location"""
+        return college.get('location', '').split(',')[-1].strip()
+
+    @staticmethod
+    def _is_number(value) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def _add(self, college: Dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a college's contribution (caller holds the lock)"""
+        self.total += sign
+
+        acceptance_rate = college.get('acceptance_rate')
+        if self._is_number(acceptance_rate):
+            self._acceptance_sum += sign * round(acceptance_rate * self.SCALE)
+            self._acceptance_count += sign
+
+        tuition = get_undergraduate_tuition(college)
+        if self._is_number(tuition):
+            self._tuition_sum += sign * round(tuition * self.SCALE)
+            self._tuition_count += sign
+
+        ranking = college.get('ranking')
+        if self._is_number(ranking):
+            self._rankings[ranking] += sign
+            if sign > 0:
+                if self._min_ranking is None or ranking < self._min_ranking:
+                    self._min_ranking = ranking
+                if self._max_ranking is None or ranking > self._max_ranking:
+                    self._max_ranking = ranking
+            elif self._rankings[ranking] <= 0:
+                del self._rankings[ranking]
+                if ranking in (self._min_ranking, self._max_ranking):
+                    self._min_ranking = min(self._rankings) if self._rankings else None
+                    self._max_ranking = max(self._rankings) if self._rankings else None
+
+        for histogram, value in ((self.by_type, college.get('type', '')), (self.by_state, self._state(college))):
+            histogram[value] += sign
+            if histogram[value] <= 0:
+                del histogram[value]
+
+    def _apply(self, college_key: str, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """Apply a catalog change to the aggregates"""
+        with self._lock:
+            if old:
+                self._add(old, -1)
+            if new:
+                self._add(new, 1)
+
+    def snapshot(self) -> Dict:
+        """
+        Get the current statistics
+
+        Returns:
+            Dict: Same shape as college_admin.get_college_statistics
+        """
+        self.build()
+        with self._lock:
+            if not self.total:
+                return {"error": "No colleges in database"}
+
+            acceptance_count = self._acceptance_count * self.SCALE
+            tuition_count = self._tuition_count * self.SCALE
+            return {
+                "total_colleges": self.total,
+                "average_acceptance_rate": self._acceptance_sum / acceptance_count if acceptance_count else None,
+                "average_tuition": self._tuition_sum / tuition_count if tuition_count else None,
+                "rankings_range": {
+                    "min": self._min_ranking,
+                    "max": self._max_ranking
+                },
+                "colleges_by_type": dict(self.by_type),
+                "colleges_by_state": dict(self.by_state)
+            }
@@ -0,0 +1,305 @@
+"""
+Chat Message Parser
+
+This module extracts the entities the chatbot cares about from a user message
+in a single stage: colleges, programs, locations and numeric scores (GPA, SAT,
+ACT). The query handlers in app.py consume the parsed result instead of each
+re-scanning the message.
+
+College, program and location vocabularies are derived from COLLEGES_DATA and
+rebuilt on a background thread when the catalog changes. Colleges added or
+renamed since the last rebuild are recognized right away through a small
+overlay, so newly added colleges are recognized without code edits.
+
+Example usage:
+    from message_parser import parse_message
+
+    parsed = parse_message("Compare Harvard and MIT for computer science")
+    parsed['colleges']  # -> ['harvard', 'mit']
+    parsed['programs']  # -> ['computer science']
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from catalog_store import scan_catalog
+from college_data import (
+    CATALOG_LOCK, COLLEGES_DATA, COLLEGE_NAME_ALIASES, PROGRAM_INDEX, add_catalog_listener, get_catalog_version
+)
+
+# Program keywords recognized first, in priority order; the indexed program
+# vocabulary is recognized after these
+PROGRAM_KEYWORDS = [
+    'computer science', 'engineering', 'business', 'medicine', 'law', 'art', 'music',
+    'biology', 'chemistry', 'physics', 'mathematics', 'economics', 'psychology',
+    'history', 'english'
+]
+
+# Location keywords recognized first, in priority order; cities and states from
+# the catalog are recognized after these
+LOCATION_KEYWORDS = [
+    'california', 'massachusetts', 'connecticut', 'new jersey', 'pasadena', 'cambridge',
+    'stanford', 'berkeley', 'new haven', 'princeton'
+]
+
+GPA_PATTERNS = [
+    re.compile(r'\bgpa\b\D{0,12}?(\d(?:\.\d{1,2})?)\b'),
+    re.compile(r'\b(\d\.\d{1,2})\s*(?:gpa|unweighted|weighted)\b')
+]
+SAT_PATTERNS = [
+    re.compile(r'\bsat\b\D{0,12}?(\d{3,4})\b'),
+    re.compile(r'\b(\d{3,4})\s*(?:on (?:the|my) )?sat\b')
+]
+ACT_PATTERNS = [
+    re.compile(r'\bact\b\D{0,12}?(\d{1,2})\b'),
+    re.compile(r'\b(\d{1,2})\s*(?:on (?:the|my) )?act\b')
+]
+
+BUDGET_PATTERNS = [
+    re.compile(r'\b(?:budget|afford|spend)\b\D{0,20}?(\d[\d,]*(?:\.\d+)?)\s*(k)?\b'),
+    re.compile(r'\b(?:under|below|less than|up to|max(?:imum)?)\s*\$(\d[\d,]*(?:\.\d+)?)\s*(k)?\b'),
+    re.compile(r'\$(\d[\d,]*(?:\.\d+)?)\s*(k)?\s*(?:a|per) year\b')
+]
+
+
+def _compile_terms(terms: Iterable[str]) -> Optional['re.Pattern']:
+    """Compile terms into one whole-word alternation, longest first"""
+    terms = sorted({t for t in terms if t}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in terms) + r')\b')
+
+
+def _is_word_char(text: str, position: int) -> bool:
+    """Tell whether text has a word character (as matched by \\w) at position"""
+    return 0 <= position < len(text) and (text[position].isalnum() or text[position] == '_')
+
+
+def _find_terms(text: str, terms: Dict, max_length: int) -> List[Tuple[int, str]]:
+    """
+    Find whole-word occurrences of terms in text by dictionary lookups
+
+    Matches like the pattern of _compile_terms (leftmost, then longest, not
+    overlapping) without compiling anything.
+
+    Returns:
+        List[Tuple[int, str]]: (position, term) pairs in text order
+    """
+    boundaries = [i for i in range(len(text) + 1) if _is_word_char(text, i - 1) != _is_word_char(text, i)]
+    found = []
+    resume = 0
+    for index, start in enumerate(boundaries):
+        if start < resume:
+            continue
+        end = None
+        for candidate in boundaries[index + 1:]:
+            if candidate - start > max_length:
+                break
+            if text[start:candidate] in terms:
+                end = candidate
+        if end is not None:
+            found.append((start, text[start:end]))
+            resume = end
+    return found
+
+
+def _first_number(patterns: List['re.Pattern'], text: str, low: float, high: float) -> Optional[float]:
+    """Return the first number captured by patterns that lies within [low, high]"""
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            value = float(match.group(1))
+            if low <= value <= high:
+                return value
+    return None
+
+
+def _first_amount(patterns: List['re.Pattern'], text: str, low: float, high: float) -> Optional[float]:
+    """Return the first dollar amount (e.g. "40,000" or "40k") captured by patterns within [low, high]"""
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            try:
+                value = float(match.group(1).replace(',', ''))
+            except ValueError:
+                continue
+            if match.group(2):
+                value *= 1000
+            if low <= value <= high:
+                return value
+    return None
+
+
+class MessageParser:
+    """
+    Single-stage entity extractor for chat messages
+
+    Vocabularies are compiled into one regular expression per entity type.
+    The first parse builds them; after a catalog change the current ones keep
+    being served while a background thread recompiles them, so no request
+    waits for a compilation over the whole catalog. The compiled vocabularies
+    are published as one tuple with a single assignment, so a parse running
+    on another thread never sees a pattern from one rebuild with the terms of
+    another.
+
+    Colleges added or renamed after the served vocabulary was scanned are
+    kept in an overlay (filled by a catalog listener) and matched by
+    dictionary lookups until a rebuild covers them.
+    """
+
+    def __init__(self):
+        # (catalog version, college terms, college pattern, program priority,
+        #  program pattern, location priority, location pattern)
+        self._vocabulary: Optional[Tuple] = None
+        self._rebuilder: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Overlay of changed colleges: term -> (college key, change number)
+        self._recent: Dict[str, Tuple[str, int]] = {}
+        self._recent_length = 0
+        self._changes = 0
+        self._scanned = False
+        add_catalog_listener(self._record_change)
+
+    def _record_change(self, college_key: str, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """Add a new or renamed college to the overlay (a college_data catalog listener)"""
+        if new is None or not self._scanned:
+            return
+        with self._lock:
+            self._changes += 1
+            for term in (college_key, (new.get('name') or '').lower()):
+                if term:
+                    self._recent[term] = (college_key, self._changes)
+                    self._recent_length = max(self._recent_length, len(term))
+
+    def build(self) -> None:
+        """Build the vocabularies now instead of on the first parse (no-op once built)"""
+        if self._vocabulary is None:
+            self._rebuild()
+
+    def _refresh(self) -> None:
+        """Rebuild the vocabularies on a background thread unless a rebuild is running"""
+        with self._lock:
+            if self._rebuilder is not None and self._rebuilder.is_alive():
+                return
+            self._rebuilder = threading.Thread(target=self._rebuild_until_current, name='message-parser',
+                                               daemon=True)
+            self._rebuilder.start()
+
+    def _rebuild_until_current(self) -> None:
+        """Rebuild until the vocabularies match the catalog version (background thread)"""
+        while self._rebuild()[0] != get_catalog_version():
+            pass
+
+    def _rebuild(self) -> Tuple:
+        """Recompile the vocabularies from the current catalog and publish them"""
+        with CATALOG_LOCK:
+            version = get_catalog_version()
+            with self._lock:
+                covered = self._changes
+                self._scanned = True
+            terms: Dict[str, str] = {}
+            locations = list(LOCATION_KEYWORDS)
+            for key, college in scan_catalog(COLLEGES_DATA):
+                terms[key] = key
+                if college.get('name'):
+                    terms.setdefault(college['name'].lower(), key)
+                locations.extend(part.strip().lower() for part in college.get('location', '').split(','))
+            for alias, key in COLLEGE_NAME_ALIASES.items():
+                if key in COLLEGES_DATA:
+                    terms.setdefault(alias, key)
+
+        programs = list(PROGRAM_KEYWORDS) + sorted(PROGRAM_INDEX.vocabulary())
+        program_priority: Dict[str, int] = {}
+        for program in programs:
+            program_priority.setdefault(program, len(program_priority))
+
+        location_priority: Dict[str, int] = {}
+        for location in locations:
+            if location:
+                location_priority.setdefault(location, len(location_priority))
+
+        vocabulary = (version, terms, _compile_terms(terms), program_priority, _compile_terms(program_priority),
+                      location_priority, _compile_terms(location_priority))
+        with self._lock:
+            if self._vocabulary is None or self._vocabulary[0] <= version:
+                self._vocabulary = vocabulary
+                # Changes made before the scan are in the new vocabulary
+                self._recent = {term: entry for term, entry in self._recent.items() if entry[1] > covered}
+                self._recent_length = max(map(len, self._recent), default=0)
+        return vocabulary
+
+    def parse(self, message: str) -> Dict:
+        """
+        Extract entities from a message
+
+        Args:
+            message: The user's message
+
+        Returns:
+            Dict: Parsed message with keys 'text', 'lower', 'colleges' (college
+                  keys in order of mention), 'programs' and 'locations' (in
+                  priority order), 'gpa', 'sat', 'act' and 'budget' (numbers or None)
+        """
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            vocabulary = self._rebuild()
+        elif vocabulary[0] != get_catalog_version():
+            self._refresh()
+
+        lower = message.lower().strip()
+
+        while True:
+            _, college_terms, college_pattern = vocabulary[:3]
+            mentions: List[Tuple[int, str]] = []
+            if college_pattern is not None:
+                mentions.extend((match.start(), college_terms[match.group(0)])
+                                for match in college_pattern.finditer(lower))
+            with self._lock:
+                # A rebuild published meanwhile has dropped the overlay
+                # entries it covers, so match against its vocabulary instead
+                if self._vocabulary is vocabulary:
+                    if self._recent:
+                        mentions.extend((position, self._recent[term][0]) for position, term
+                                        in _find_terms(lower, self._recent, self._recent_length))
+                    break
+                vocabulary = self._vocabulary
+        (_, _, _, program_priority, program_pattern, location_priority, location_pattern) = vocabulary
+
+        colleges: List[str] = []
+        for _, key in sorted(mentions):
+            if key not in colleges:
+                colleges.append(key)
+
+        programs = self._match_ranked(program_pattern, program_priority, lower)
+        locations = self._match_ranked(location_pattern, location_priority, lower)
+
+        sat = _first_number(SAT_PATTERNS, lower, 400, 1600)
+        act = _first_number(ACT_PATTERNS, lower, 1, 36)
+
+        return {
+            'text': message,
+            'lower': lower,
+            'colleges': colleges,
+            'programs': programs,
+            'locations': locations,
+            'gpa': _first_number(GPA_PATTERNS, lower, 0.0, 5.0),
+            'sat': int(sat) if sat is not None else None,
+            'act': int(act) if act is not None else None,
+            'budget': _first_amount(BUDGET_PATTERNS, lower, 1000, 1000000)
+        }
+
+    @staticmethod
+    def _match_ranked(pattern, priority: Dict[str, int], text: str) -> List[str]:
+        """Return distinct vocabulary terms found in text, ordered by priority"""
+        if pattern is None:
+            return []
+        found = {match.group(0) for match in pattern.finditer(text)}
+        return sorted(found, key=priority.__getitem__)
+
+
+# Shared parser used by the chat handlers
+MESSAGE_PARSER = MessageParser()
+
+
+def parse_message(message: str) -> Dict:
+    """Parse a chat message with the shared parser (see MessageParser.parse)"""
+    return MESSAGE_PARSER.parse(message)
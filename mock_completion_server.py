@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Mock Chat Completions Server
+
+A small stand-in for the OpenAI chat completions API, for trying the AI mode
+and load-testing the AI client without an API key or network access. It
+answers POST /v1/chat/completions with a canned reply that echoes the last
+user message, either as one JSON body or, for "stream": true requests, as
+Server-Sent Events with one word per chunk.
+
+Usage:
+    python mock_completion_server.py --port 8001 --delay 0.2 --chunk-delay 0.05
+
+Then start the AI chatbot against it:
+    export OPENAI_API_KEY=test
+    export OPENAI_BASE_URL=http://127.0.0.1:8001/v1
+    USE_AI=true python app_with_ai.py
+
+Or load-test the AI client's request queue (batching, de-duplication and
+back-pressure, see ai_client.CompletionBatcher) against an in-process server:
+    python mock_completion_server.py --delay 0.2 --bench 2000 --concurrency 200 --distinct 100
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the chat completions endpoint"""
+
+    # Set from the command line (see main)
+    delay = 0.0
+    chunk_delay = 0.0
+    failure_rate = 0.0
+    requests_served = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+            self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            messages = request['messages']
+        except (ValueError, KeyError):
+            self._send_json(400, {'error': {'message': 'Invalid request body'}})
+            return
+
+        if self.delay:
+            time.sleep(self.delay)
+        if self.failure_rate and random.random() < self.failure_rate:
+            self._send_json(500, {'error': {'message': 'Simulated upstream failure'}})
+            return
+
+        with CompletionHandler.lock:
+            CompletionHandler.requests_served += 1
+            request_number = CompletionHandler.requests_served
+
+        question = next((m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'), '')
+        reply = f"(mock) You said: {question}"
+        if request.get('stream'):
+            self._send_stream(request_number, request.get('model', 'mock'), reply)
+            return
+
+        self._send_json(200, {
+            'id': f'chatcmpl-mock-{request_number}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': reply},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': sum(len(str(m.get('content', '')).split()) for m in messages),
+                'completion_tokens': len(reply.split()),
+                'total_tokens': 0
+            }
+        })
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (e.g. its deadline passed) and hung up
+            pass
+
+    def _send_stream(self, request_number, model, reply):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        words = reply.split(' ')
+        try:
+            for i, word in enumerate(words):
+                chunk = {
+                    'id': f'chatcmpl-mock-{request_number}',
+                    'object': 'chat.completion.chunk',
+                    'model': model,
+                    'choices': [{
+                        'index': 0,
+                        'delta': {'content': word if i == 0 else ' ' + word},
+                        'finish_reason': None
+                    }]
+                }
+                self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+                self.wfile.flush()
+                if self.chunk_delay:
+                    time.sleep(self.chunk_delay)
+            self.wfile.write(b'data: [DONE]\n\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        # Without a Content-Length the end of the stream is the end of the connection
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        # Keep load tests quiet
+        pass
+
+
+def create_server(host: str = '127.0.0.1', port: int = 8001, delay: float = 0.0,
+                  failure_rate: float = 0.0, chunk_delay: float = 0.0) -> ThreadingHTTPServer:
+    """Create (but do not start) a mock server; port 0 picks a free port"""
+    CompletionHandler.delay = delay
+    CompletionHandler.chunk_delay = chunk_delay
+    CompletionHandler.failure_rate = failure_rate
+    server = ThreadingHTTPServer((host, port), CompletionHandler)
+    server.daemon_threads = True
+    return server
+
+
+def run_benchmark(server: ThreadingHTTPServer, requests: int, concurrency: int, distinct: int,
+                  max_queue: int = 256) -> dict:
+    """
+    Send requests through an AsyncChatClient to a running mock server
+
+    Args:
+        server: Mock server (serving in another thread)
+        requests: Total completions to request
+        concurrency: Callers requesting at the same time
+        distinct: Number of different prompts (repeats can be de-duplicated)
+        max_queue: The client's queue-depth limit
+
+    Returns:
+        dict: Latency percentiles, outcome counts and the client's queue counters
+    """
+    from ai_client import AIBackendError, AIOverloadedError, AsyncChatClient
+
+    base_url = f'http://{server.server_address[0]}:{server.server_port}/v1'
+    client = AsyncChatClient('test', base_url=base_url, max_queue=max_queue)
+    served_before = CompletionHandler.requests_served
+    latencies, outcomes = [], {'ok': 0, 'rejected': 0, 'failed': 0}
+    remaining = iter(range(requests))
+
+    async def caller():
+        for _ in remaining:
+            prompt = f"question {random.randrange(distinct)}"
+            started = time.perf_counter()
+            try:
+                await client.complete_async([{'role': 'user', 'content': prompt}], 'mock')
+                outcomes['ok'] += 1
+            except AIOverloadedError:
+                outcomes['rejected'] += 1
+            except AIBackendError:
+                outcomes['failed'] += 1
+            latencies.append(time.perf_counter() - started)
+
+    async def run():
+        await asyncio.gather(*(caller() for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'seconds': round(elapsed, 2),
+        'requests_per_second': round(requests / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 1),
+        'upstream_calls': CompletionHandler.requests_served - served_before,
+        **outcomes,
+        'queue': client.stats()['queue']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock OpenAI chat completions server')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind to')
+    parser.add_argument('--port', type=int, default=8001, help='Port to listen on')
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds to wait before answering')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 500')
+    parser.add_argument('--chunk-delay', type=float, default=0.0, help='Seconds between streamed chunks')
+    parser.add_argument('--bench', type=int, metavar='N', help='Load-test the AI client with N requests and exit')
+    parser.add_argument('--concurrency', type=int, default=50, help='Benchmark: concurrent callers')
+    parser.add_argument('--distinct', type=int, default=1000, help='Benchmark: number of different prompts')
+    parser.add_argument('--max-queue', type=int, default=256, help="Benchmark: the client's queue-depth limit")
+    args = parser.parse_args()
+
+    server = create_server(args.host, 0 if args.bench else args.port, args.delay, args.failure_rate,
+                           args.chunk_delay)
+    if args.bench:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(json.dumps(run_benchmark(server, args.bench, args.concurrency, args.distinct, args.max_queue),
+                         indent=2))
+        server.shutdown()
+        return
+    print(f"Mock completions API on http://{args.host}:{server.server_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Encoded JSON Payload Cache
+
+This module keeps pre-serialized (and pre-compressed) JSON response bodies for
+read-heavy endpoints such as /colleges, so the catalog is not re-encoded on
+every request. Each payload carries a strong ETag; clients that send a
+matching If-None-Match get a bodyless 304.
+
+Payloads are tied to a data version (the catalog version); when the version
+changes the payload is rebuilt on the next request.
+
+Example usage:
+    from payload_cache import PayloadCache, payload_response
+
+    PAYLOADS = PayloadCache()
+
+    @app.route('/colleges')
+    def get_colleges():
+        payload = PAYLOADS.get('colleges', get_catalog_version(), get_all_colleges)
+        return payload_response(payload)
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Response, current_app, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+class EncodedPayload:
+    """
+    A JSON body with its precomputed encodings and ETag
+    """
+
+    __slots__ = ('version', 'etag', 'encodings')
+
+    # Bodies smaller than this are not worth compressing
+    MIN_COMPRESS_SIZE = 1024
+
+    def __init__(self, body: bytes, version: Hashable):
+        self.version = version
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self.encodings: Dict[str, bytes] = {'identity': body}
+
+        if len(body) >= self.MIN_COMPRESS_SIZE:
+            self.encodings['gzip'] = gzip.compress(body, compresslevel=6)
+            if BROTLI_AVAILABLE:
+                self.encodings['br'] = brotli.compress(body, quality=5)
+
+    def etag_for(self, encoding: str) -> str:
+        """Get the strong ETag of one encoding of the payload"""
+        return f'"{self.etag}"' if encoding == 'identity' else f'"{self.etag}-{encoding}"'
+
+
+class PayloadCache:
+    """
+    LRU cache of encoded JSON payloads keyed by name and data version
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached payloads
+        """
+        self.max_entries = max_entries
+        self._payloads: 'OrderedDict[Hashable, EncodedPayload]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: Hashable, version: Hashable, build: Callable[[], object]) -> EncodedPayload:
+        """
+        Get an encoded payload, building it if missing or stale
+
+        Args:
+            name: Cache key of the payload (e.g. 'colleges' or ('college', key))
+            version: Data version the payload must match
+            build: Function returning the data to serialize
+
+        Returns:
+            EncodedPayload: The cached payload
+        """
+        with self._lock:
+            payload = self._payloads.get(name)
+            if payload is not None and payload.version == version:
+                self._payloads.move_to_end(name)
+                self.hits += 1
+                return payload
+            self.misses += 1
+
+        # Serialize exactly like jsonify so cached and uncached bodies match
+        body = current_app.json.response(build()).get_data()
+        payload = EncodedPayload(body, version)
+
+        with self._lock:
+            self._payloads[name] = payload
+            self._payloads.move_to_end(name)
+            while len(self._payloads) > self.max_entries:
+                self._payloads.popitem(last=False)
+        return payload
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        return {
+            'entries': len(self._payloads),
+            'hits': self.hits,
+            'misses': self.misses,
+            'brotli': BROTLI_AVAILABLE
+        }
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {encoding: quality}"""
+    accepted = {}
+    for part in header.split(','):
+        fields = part.strip().split(';')
+        encoding = fields[0].strip().lower()
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[encoding] = quality
+    return accepted
+
+
+def _choose_encoding(payload: EncodedPayload, accept_encoding: str) -> str:
+    """Pick the best encoding of the payload the client accepts"""
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding in ('br', 'gzip'):
+        if encoding in payload.encodings and accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return 'identity'
+
+
+def _etag_matches(payload: EncodedPayload, header: Optional[str]) -> bool:
+    """Check an If-None-Match header against any encoding of the payload"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag == payload.etag or tag.split('-', 1)[0] == payload.etag:
+            return True
+    return False
+
+
+def payload_response(payload: EncodedPayload, status: int = 200) -> Response:
+    """
+    Build a response for a cached payload, honouring If-None-Match and Accept-Encoding
+
+    Args:
+        payload: The encoded payload
+        status: HTTP status for a full response
+
+    Returns:
+        Response: A 304 if the client's copy is current, otherwise the payload
+    """
+    status, body, headers = payload_parts(payload, request.headers.get('Accept-Encoding', ''),
+                                          request.headers.get('If-None-Match'), status)
+    response = Response(body, status=status, mimetype='application/json' if body else None)
+    response.headers.update(headers)
+    return response
+
+
+def payload_parts(payload: EncodedPayload, accept_encoding: str, if_none_match: Optional[str],
+                  status: int = 200) -> Tuple[int, bytes, Dict[str, str]]:
+    """
+    Work out the status, body and headers of a payload response (framework independent)
+
+    Args:
+        payload: The encoded payload
+        accept_encoding: The request's Accept-Encoding header
+        if_none_match: The request's If-None-Match header (or None)
+        status: HTTP status for a full response
+
+    Returns:
+        Tuple[int, bytes, Dict[str, str]]: 304 with an empty body if the
+        client's copy is current, otherwise the status and encoded payload
+    """
+    encoding = _choose_encoding(payload, accept_encoding)
+    headers = {}
+    if _etag_matches(payload, if_none_match):
+        status, body = 304, b''
+    else:
+        body = payload.encodings[encoding]
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+
+    headers['ETag'] = payload.etag_for(encoding)
+    headers['Vary'] = 'Accept-Encoding'
+    # Let clients keep the payload but revalidate it on every use
+    headers['Cache-Control'] = 'no-cache'
+    return status, body, headers
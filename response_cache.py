@@ -0,0 +1,297 @@
+"""
+AI Response Cache
+
+This module caches AI completions so repeated questions ("tell me about MIT
+admissions") are answered without another upstream call. Two tiers:
+
+- Exact: a hash of the normalized prompt (lowercased, whitespace and
+  trailing punctuation collapsed) plus the stable part of the context.
+- Similar (optional): prompts are turned into TF-IDF vectors over hashed
+  word unigrams and bigrams; a new prompt whose cosine similarity to a cached
+  prompt with the same context reaches the threshold reuses its answer. The
+  vectors live in one NumPy matrix, so the nearest-neighbour search is a
+  single matrix-vector product. The product runs outside the cache lock;
+  the rows it picks are checked again under the lock before they are used.
+
+Entries expire after a TTL and the least recently used entries are evicted
+when the cache is full. Volatile context (the current time) is left out of
+the key, and prompts asking for the time or date are never cached.
+
+Configuration (environment variables):
+    AI_CACHE_MAX_ENTRIES: Maximum cached responses (default: 1024, 0 disables the cache)
+    AI_CACHE_TTL_SECONDS: Time to live of a cached response (default: 3600)
+    AI_CACHE_SIMILARITY: Minimum cosine similarity for the similar tier,
+                         e.g. 0.9 (default: unset, exact matches only)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Context fields that change on every request and must not split the cache
+VOLATILE_CONTEXT_FIELDS = {'current_time'}
+
+# Answers to these depend on the moment they are asked
+UNCACHEABLE_PATTERN = re.compile(r'\b(?:time|clock|today|tonight|tomorrow|yesterday|date|now|weather)\b')
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase a prompt and collapse whitespace and trailing punctuation"""
+    return ' '.join(prompt.lower().split()).rstrip(' ?!.')
+
+
+class _Entry:
+    __slots__ = ('response', 'context_key', 'expires', 'row')
+
+    def __init__(self, response: str, context_key: str, expires: float, row: int):
+        self.response = response
+        self.context_key = context_key
+        self.expires = expires
+        self.row = row
+
+
+class ResponseCache:
+    """
+    TTL/LRU cache of AI responses with an optional similarity tier
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 similarity_threshold: Optional[float] = None, dimensions: int = 2048):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl_seconds: Time to live of a cached response
+            similarity_threshold: Minimum cosine similarity for a similar-prompt
+                hit (None disables the similar tier)
+            dimensions: Size of the hashed TF-IDF vectors
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.dimensions = dimensions
+
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Similar tier: one term-frequency row per entry, plus document
+        # frequencies of every hashed term for the IDF weights
+        if similarity_threshold is not None:
+            self._vectors = np.zeros((max_entries, dimensions), dtype=np.float32)
+            self._row_context: List[Optional[str]] = [None] * max_entries
+            self._row_keys: List[Optional[str]] = [None] * max_entries
+            self._free_rows = list(range(max_entries - 1, -1, -1))
+            self._document_frequency = np.zeros(dimensions, dtype=np.float32)
+
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _context_key(context: Optional[Dict]) -> str:
+        """Hash the stable part of the context"""
+        stable = {k: v for k, v in (context or {}).items() if k not in VOLATILE_CONTEXT_FIELDS}
+        return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _key(normalized: str, context_key: str) -> str:
+        return hashlib.sha1(f'{context_key}\0{normalized}'.encode('utf-8')).hexdigest()
+
+    def _term_vector(self, normalized: str) -> np.ndarray:
+        """Hashed term frequencies of the prompt's words and word pairs"""
+        words = _WORD_PATTERN.findall(normalized)
+        terms = words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for term in terms:
+            vector[zlib.crc32(term.encode('utf-8')) % self.dimensions] += 1.0
+        return vector
+
+    def _idf(self) -> np.ndarray:
+        count = len(self._entries)
+        return np.log((1.0 + count) / (1.0 + self._document_frequency)) + 1.0
+
+    def cacheable(self, prompt: str) -> bool:
+        """Check whether a prompt's answer can be reused later"""
+        return not UNCACHEABLE_PATTERN.search(prompt.lower())
+
+    def get(self, prompt: str, context: Optional[Dict] = None) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            prompt: The user's message
+            context: Context the response was generated with
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        if not self.cacheable(prompt):
+            with self._lock:
+                self.skipped += 1
+            return None
+
+        normalized = normalize_prompt(prompt)
+        context_key = self._context_key(context)
+        key = self._key(normalized, context_key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires > now:
+                    self._entries.move_to_end(key)
+                    self.exact_hits += 1
+                    return entry.response
+                self._remove(key)
+                self.expirations += 1
+
+            if self.similarity_threshold is None or not self._entries:
+                self.misses += 1
+                return None
+            idf = self._idf()
+
+        # Score every cached prompt without holding the lock; rows that a
+        # concurrent put or eviction changed meanwhile are rescored below
+        query, rows = self._similar_rows(normalized, idf)
+
+        with self._lock:
+            response = self._confirm_similar(rows, query, idf, context_key, now)
+            if response is not None:
+                self.similar_hits += 1
+                return response
+            self.misses += 1
+            return None
+
+    def _similarity(self, vectors: np.ndarray, query: np.ndarray, idf: np.ndarray) -> np.ndarray:
+        """Cosine similarity of IDF-weighted term vectors to a weighted query"""
+        weighted = vectors * idf
+        norms = np.linalg.norm(weighted, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = (weighted @ query) / (norms * np.linalg.norm(query))
+        return np.nan_to_num(similarity, nan=-1.0)
+
+    def _similar_rows(self, normalized: str, idf: np.ndarray) -> Tuple[np.ndarray, List[int]]:
+        """
+        Score the cached prompts against a prompt (without the lock)
+
+        Returns:
+            Tuple[np.ndarray, List[int]]: The weighted query vector and the rows
+                reaching the threshold, most similar first
+        """
+        query = self._term_vector(normalized) * idf
+        if not query.any():
+            return query, []
+        similarity = self._similarity(self._vectors, query, idf)
+        rows = np.flatnonzero(similarity >= self.similarity_threshold)
+        return query, rows[np.argsort(-similarity[rows])].tolist()
+
+    def _confirm_similar(self, rows: List[int], query: np.ndarray, idf: np.ndarray, context_key: str,
+                         now: float) -> Optional[str]:
+        """First row still holding a live, similar entry with the same context (caller holds the lock)"""
+        for row in rows:
+            key = self._row_keys[row]
+            if key is None or self._row_context[row] != context_key:
+                continue
+            entry = self._entries[key]
+            if entry.expires <= now:
+                continue
+            # The row may have been reused since it was scored
+            if self._similarity(self._vectors[row], query, idf) < self.similarity_threshold:
+                continue
+            self._entries.move_to_end(key)
+            return entry.response
+        return None
+
+    def put(self, prompt: str, context: Optional[Dict], response: str) -> None:
+        """
+        Cache a response
+
+        Args:
+            prompt: The user's message
+            context: Context the response was generated with
+            response: The AI response
+        """
+        if self.max_entries <= 0 or not self.cacheable(prompt):
+            return
+
+        normalized = normalize_prompt(prompt)
+        context_key = self._context_key(context)
+        key = self._key(normalized, context_key)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            row = -1
+            if self.similarity_threshold is not None:
+                row = self._free_rows.pop()
+                vector = self._term_vector(normalized)
+                self._vectors[row] = vector
+                self._row_keys[row] = key
+                self._row_context[row] = context_key
+                self._document_frequency += vector > 0
+
+            self._entries[key] = _Entry(response, context_key, time.monotonic() + self.ttl_seconds, row)
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and free its vector row (caller holds the lock)"""
+        entry = self._entries.pop(key)
+        if entry.row >= 0:
+            self._document_frequency -= self._vectors[entry.row] > 0
+            self._vectors[entry.row] = 0
+            self._row_keys[entry.row] = None
+            self._row_context[entry.row] = None
+            self._free_rows.append(entry.row)
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self) -> Dict:
+        """Get cache size, hit/miss counters and hit rate"""
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'similarity_threshold': self.similarity_threshold,
+            'exact_hits': self.exact_hits,
+            'similar_hits': self.similar_hits,
+            'misses': self.misses,
+            'skipped': self.skipped,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': round((self.exact_hits + self.similar_hits) / lookups, 3) if lookups else 0.0
+        }
+
+
+def create_response_cache() -> Optional[ResponseCache]:
+    """Create the response cache configured by environment variables (None if disabled)"""
+    max_entries = int(os.getenv('AI_CACHE_MAX_ENTRIES', '1024'))
+    if max_entries <= 0:
+        return None
+    similarity = os.getenv('AI_CACHE_SIMILARITY')
+    return ResponseCache(
+        max_entries=max_entries,
+        ttl_seconds=float(os.getenv('AI_CACHE_TTL_SECONDS', '3600')),
+        similarity_threshold=float(similarity) if similarity else None
+    )
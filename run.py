@@ -3,12 +3,38 @@
 Chatbot Startup Script
 
 This script provides an easy way to start the chatbot with different configurations.
+
+Servers (--server):
+    dev       Flask development server (debugger and auto-reload; not for production)
+    gunicorn  Pre-fork server with several worker processes, each with a thread pool.
+              The app, COLLEGES_DATA and the search indexes are loaded once in the
+              master before the workers are forked, so their memory is shared
+              copy-on-write. Send SIGHUP to the master to replace the workers
+              gracefully (in-flight requests finish first), SIGTERM to stop.
+    waitress  Multi-threaded single-process server (also runs on Windows)
+    uvicorn   ASGI server running asgi_app: async handlers on an event loop, so
+              requests waiting on the AI backend do not hold a thread and one
+              worker can keep thousands of chats in flight
+
+Examples:
+    python run.py --mode basic --server gunicorn --workers 4 --threads 8
+    python run.py --mode ai --server waitress --threads 16
+    python run.py --mode ai --server uvicorn --workers 2
 """
 
 import os
 import sys
 import subprocess
 import argparse
+import gc
+
+# The apps import their modules from this directory
+CHATBOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+APP_MODULES = {'basic': 'app', 'ai': 'app_with_ai'}
+
+# Packages each production server needs
+SERVER_PACKAGES = {'gunicorn': ['gunicorn'], 'waitress': ['waitress'], 'uvicorn': ['uvicorn', 'starlette']}
 
 def check_dependencies():
     """Check if required dependencies are installed"""
@@ -24,6 +50,12 @@ def check_dependencies():
 
 def check_ai_dependencies():
     """Check if AI dependencies are available"""
+    try:
+        import aiohttp
+        print("✅ AI dependencies are available")
+        return True
+    except ImportError:
+        pass
     try:
         import openai
         print("✅ AI dependencies are available")
@@ -32,76 +64,202 @@ def check_ai_dependencies():
         print("ℹ️  AI dependencies not installed (optional)")
         return False
 
-def run_basic_chatbot():
-    """Run the basic chatbot without AI"""
-    print("🚀 Starting basic chatbot...")
-    os.system("python app.py")
+def check_server_dependencies(server):
+    """Check that the chosen production server is installed"""
+    packages = SERVER_PACKAGES.get(server, [])
+    missing = []
+    for package in packages:
+        try:
+            __import__(package)
+        except ImportError:
+            missing.append(package)
+    if missing:
+        print(f"❌ {', '.join(missing)} not installed")
+        print(f"Please run: pip install {' '.join(packages)}")
+        return False
+    return True
+
+def default_workers():
+    """Worker processes: WEB_CONCURRENCY, or two per CPU plus one"""
+    return int(os.getenv('WEB_CONCURRENCY', str(2 * (os.cpu_count() or 1) + 1)))
 
-def run_ai_chatbot():
-    """Run the chatbot with AI integration"""
-    print("🤖 Starting AI-powered chatbot...")
-    
+def prepare_ai_mode():
+    """Enable AI responses for the app about to be loaded"""
     # Check if OpenAI API key is set
     if not os.getenv('OPENAI_API_KEY'):
         print("⚠️  Warning: OPENAI_API_KEY environment variable not set")
         print("   AI features will not be available")
         print("   Set your API key: export OPENAI_API_KEY=your-api-key")
-    
+
     os.environ['USE_AI'] = 'true'
-    os.system("python app_with_ai.py")
+
+def load_app(mode):
+    """Import the app module (loading COLLEGES_DATA) and build its caches"""
+    if CHATBOT_DIR not in sys.path:
+        sys.path.insert(0, CHATBOT_DIR)
+    module = __import__(APP_MODULES[mode])
+    warm_caches = getattr(module, 'warm_caches', None)
+    if warm_caches is not None:
+        warm_caches()
+    return module
+
+def run_dev_server(mode):
+    """Run the app with the Flask development server"""
+    print("🚀 Starting development server...")
+    result = subprocess.run([sys.executable, f"{APP_MODULES[mode]}.py"], cwd=CHATBOT_DIR)
+    return result.returncode
+
+def run_gunicorn(mode, host, port, workers, threads, timeout, preload):
+    """Run the app under gunicorn with pre-forked workers"""
+    from gunicorn.app.base import BaseApplication
+
+    module = load_app(mode) if preload else None
+
+    def when_ready(server):
+        # Objects loaded so far are never freed; keeping the collector off
+        # them stops workers from touching (and copying) the shared pages
+        gc.freeze()
+        server.log.info(f"Serving {APP_MODULES[mode]} with {workers} workers x {threads} threads")
+
+    def post_fork(server, worker):
+        on_worker_start = getattr(module, 'on_worker_start', None)
+        if on_worker_start is not None:
+            on_worker_start()
+
+    class ChatbotApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f'{host}:{port}',
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread' if threads > 1 else 'sync',
+                'timeout': timeout,
+                'graceful_timeout': timeout,
+                'preload_app': preload,
+                'chdir': CHATBOT_DIR,
+                'when_ready': when_ready,
+                'post_fork': post_fork
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return (module or load_app(mode)).app
+
+    print(f"🚀 Starting gunicorn on http://{host}:{port} ({workers} workers x {threads} threads)...")
+    # Returns when the master stops; exits with an error status if it fails to boot
+    ChatbotApplication().run()
+    return 0
+
+def run_waitress(mode, host, port, threads):
+    """Run the app under waitress (one process, a pool of threads)"""
+    from waitress import serve
+
+    module = load_app(mode)
+    print(f"🚀 Starting waitress on http://{host}:{port} ({threads} threads)...")
+    serve(module.app, host=host, port=port, threads=threads)
+    return 0
+
+def run_uvicorn(mode, host, port, workers, timeout):
+    """Run the ASGI app (asgi_app.py) under uvicorn"""
+    import uvicorn
+
+    if workers > 1:
+        # Every worker process imports the app itself
+        print(f"🚀 Starting uvicorn on http://{host}:{port} ({workers} workers)...")
+        uvicorn.run('asgi_app:app', host=host, port=port, workers=workers, app_dir=CHATBOT_DIR,
+                    timeout_graceful_shutdown=timeout)
+        return 0
+
+    load_app(mode)
+    import asgi_app
+    print(f"🚀 Starting uvicorn on http://{host}:{port}...")
+    uvicorn.run(asgi_app.app, host=host, port=port, timeout_graceful_shutdown=timeout)
+    return 0
 
 def install_dependencies():
     """Install required dependencies"""
     print("📦 Installing dependencies...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+    return subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], cwd=CHATBOT_DIR).returncode
 
 def install_ai_dependencies():
     """Install AI dependencies"""
     print("🤖 Installing AI dependencies...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "openai"])
+    return subprocess.run([sys.executable, "-m", "pip", "install", "aiohttp"]).returncode
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Chatbot Startup Script")
     parser.add_argument("--mode", choices=["basic", "ai"], default="basic",
                        help="Choose chatbot mode: basic or ai")
+    parser.add_argument("--server", choices=["dev", "gunicorn", "waitress", "uvicorn"], default="dev",
+                       help="Server to run the app with (default: dev)")
+    parser.add_argument("--host", default=os.getenv('CHATBOT_HOST', '0.0.0.0'),
+                       help="Address to listen on (gunicorn/waitress/uvicorn)")
+    parser.add_argument("--port", type=int, default=int(os.getenv('CHATBOT_PORT', '5000')),
+                       help="Port to listen on (gunicorn/waitress/uvicorn)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Worker processes (gunicorn; default: WEB_CONCURRENCY or 2 x CPUs + 1; "
+                            "uvicorn: default 1)")
+    parser.add_argument("--threads", type=int, default=int(os.getenv('CHATBOT_THREADS', '4')),
+                       help="Threads per worker (gunicorn/waitress; default: 4)")
+    parser.add_argument("--timeout", type=int, default=30,
+                       help="Seconds before a stuck gunicorn worker is restarted "
+                            "(and the graceful shutdown timeout)")
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                       help="Load the app in every gunicorn worker instead of once before forking "
+                            "(SIGHUP then also reloads the code)")
     parser.add_argument("--install", action="store_true",
                        help="Install dependencies before starting")
     parser.add_argument("--install-ai", action="store_true",
                        help="Install AI dependencies")
     parser.add_argument("--check", action="store_true",
                        help="Check dependencies and exit")
-    
-    args = parser.parse_args()
-    
+
+    args = parser.parse_args(argv)
+
     print("=" * 50)
     print("🤖 AI Chatbot Startup Script")
     print("=" * 50)
-    
+
     if args.install:
-        install_dependencies()
-        return
-    
+        return install_dependencies()
+
     if args.install_ai:
-        install_ai_dependencies()
-        return
-    
+        return install_ai_dependencies()
+
     if args.check:
-        check_dependencies()
+        ok = check_dependencies()
         check_ai_dependencies()
-        return
-    
+        return 0 if ok else 1
+
     # Check dependencies
-    if not check_dependencies():
+    if not check_dependencies() or not check_server_dependencies(args.server):
         print("\n💡 To install dependencies, run:")
         print("   python run.py --install")
-        return
-    
-    # Run appropriate mode
+        return 1
+
     if args.mode == "ai":
+        print("🤖 Starting AI-powered chatbot...")
         check_ai_dependencies()
-        run_ai_chatbot()
+        prepare_ai_mode()
     else:
-        run_basic_chatbot()
+        print("🚀 Starting basic chatbot...")
+
+    # Run with the chosen server
+    try:
+        if args.server == "gunicorn":
+            return run_gunicorn(args.mode, args.host, args.port, args.workers or default_workers(),
+                                args.threads, args.timeout, args.preload)
+        if args.server == "waitress":
+            return run_waitress(args.mode, args.host, args.port, args.threads)
+        if args.server == "uvicorn":
+            return run_uvicorn(args.mode, args.host, args.port, args.workers or 1, args.timeout)
+        return run_dev_server(args.mode)
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        print(f"❌ Server failed: {e}")
+        return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Server-Sent Events Helpers
+
+Helpers shared by the Flask apps for streaming a chat reply as it is
+produced. A /chat request that sends "stream": true in its body (or an
+Accept: text/event-stream header) gets a text/event-stream response:
+
+    event: start
+    data: {"conversation_id": "..."}
+
+    data: {"delta": "partial text"}          (repeated)
+
+    event: done
+    data: {"conversation_id": "...", ...}
+
+The browser reads it with fetch() and a ReadableStream reader (EventSource
+only supports GET).
+"""
+
+import json
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from flask import Response, request, stream_with_context
+
+
+def wants_event_stream(data: Optional[Dict] = None) -> bool:
+    """Check whether the client asked for a streamed reply"""
+    if data and data.get('stream'):
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+
+def sse_event(data: Dict, event: Optional[str] = None) -> str:
+    """Format one Server-Sent Event"""
+    lines = [f'event: {event}'] if event else []
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def sse_response(events: Iterable[str]) -> Response:
+    """Stream preformatted events, with buffering disabled along the way"""
+    response = Response(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies such as nginx from holding the stream back
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def split_chunks(text: str, lines_per_chunk: int = 3) -> Iterator[str]:
+    """
+    Split a long reply (e.g. a college card) into chunks of a few lines
+
+    Joining the chunks gives back the original text.
+    """
+    lines = text.splitlines(keepends=True)
+    for start in range(0, len(lines), lines_per_chunk):
+        yield ''.join(lines[start:start + lines_per_chunk])
+
+
+def stream_chat_reply(conversation_id: str, pieces: Iterable[str], on_complete: Callable[[str], None],
+                      done: Optional[Dict] = None) -> Iterator[str]:
+    """
+    Produce the events of a streamed chat reply
+
+    Args:
+        conversation_id: Conversation the reply belongs to
+        pieces: The reply, piece by piece (only consumed once the stream has started)
+        on_complete: Called with the full reply once every piece was sent
+        done: Extra fields for the final 'done' event
+    """
+    yield sse_event({'conversation_id': conversation_id}, 'start')
+
+    reply = []
+    try:
+        for piece in pieces:
+            reply.append(piece)
+            yield sse_event({'delta': piece})
+    except Exception as e:
+        print(f"Error streaming reply: {e}")
+        yield sse_event({'error': 'An error occurred processing your message'}, 'error')
+        return
+
+    on_complete(''.join(reply))
+    yield sse_event({'conversation_id': conversation_id, **(done or {})}, 'done')